@@ -0,0 +1,353 @@
+"""
+Small micro-benchmark framework for the modules in this package.
+
+Any module level function whose name starts with "bench_" is a
+benchmark; it takes no arguments and runs the code being measured once.
+Iteration counts are calibrated automatically, each benchmark is warmed
+up, and the cost of an empty call is subtracted from every sample.
+
+Results are stored as JSON keyed by git commit, so any run can be
+compared against a saved baseline to flag regressions.
+
+Run with `python -m misc_tools.Benchmark`.
+"""
+
+
+from typing import *
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import pkgutil
+import statistics
+import subprocess
+import sys
+import time
+
+
+__all__ = (
+    'BenchmarkResult',
+    'discover',
+    'calibrate',
+    'measure',
+    'run',
+    'current_commit',
+    'load_results',
+    'save_results',
+    'find_regressions',
+)
+
+
+# Directory of this package, whose git commit results are stored under.
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Default file results are stored in, relative to the working directory.
+DEFAULT_RESULTS_PATH = 'benchmarks.json'
+
+PREFIX = 'bench_'
+
+_MODULE_NAME = __name__.rpartition('.')[2]
+
+
+class BenchmarkResult(NamedTuple):
+    """
+    Timing statistics for a single benchmark, per call.
+    """
+
+    name: str
+    number: int
+    repeat: int
+    median: float
+    iqr: float
+    ops_per_second: float
+
+
+def _empty():
+    pass
+
+
+def discover(
+        pattern: str = '*',
+        package: str = __package__,
+) -> Tuple[Dict[str, Callable[[], Any]], Dict[str, str]]:
+    """
+    Imports every module in a package and collects its benchmarks.
+
+    Modules that fail to import (e.g. because of a missing optional
+    dependency) are skipped, as are private modules such as
+    `__main__`.
+    :param pattern:
+        Glob pattern benchmark names ("module.bench_name") must match.
+    :param package:
+        Name of the package to search for modules.
+    :return:
+        Mapping of benchmark names to functions, and mapping of skipped
+        module names to the error raised importing them.
+    """
+    path = importlib.import_module(package).__path__
+
+    benchmarks = {}
+    skipped = {}
+    for module_name in sorted(
+            info.name for info in pkgutil.iter_modules(path)
+            if not info.ispkg
+    ):
+        if module_name.startswith('_') or module_name == _MODULE_NAME:
+            continue
+        try:
+            module = importlib.import_module(f'{package}.{module_name}')
+        except Exception as e:
+            skipped[module_name] = f'{e.__class__.__name__}: {e}'
+            continue
+        for attribute, value in vars(module).items():
+            name = f'{module_name}.{attribute}'
+            if (
+                    attribute.startswith(PREFIX)
+                    and callable(value)
+                    and fnmatch.fnmatchcase(name, pattern)
+            ):
+                benchmarks[name] = value
+    return benchmarks, skipped
+
+
+def _time_loop(function: Callable[[], Any], number: int) -> float:
+    """
+    Times `number` calls of the given function.
+    """
+    loop = range(number)
+    timer = time.perf_counter
+    start = timer()
+    for _ in loop:
+        function()
+    return timer() - start
+
+
+def calibrate(function: Callable[[], Any], min_time: float = 0.05) -> int:
+    """
+    Finds a number of calls that takes at least `min_time` seconds.
+
+    Tries 1, 2, 5, 10, 20, 50, ... calls, as `timeit.Timer.autorange`.
+    """
+    number = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            count = number * multiplier
+            if _time_loop(function, count) >= min_time:
+                return count
+        number *= 10
+
+
+def measure(
+        name: str,
+        function: Callable[[], Any],
+        repeat: int = 7,
+        min_time: float = 0.05,
+        warmup: int = 1,
+) -> BenchmarkResult:
+    """
+    Times a benchmark.
+    :param name:
+        Name the result is reported under.
+    :param function:
+        Benchmark to time.
+    :param repeat:
+        Number of samples taken.
+    :param min_time:
+        Minimum duration of each sample, in seconds.
+    :param warmup:
+        Number of untimed samples taken first.
+    :return:
+        Per call statistics, with the cost of an empty call subtracted.
+    """
+    number = calibrate(function, min_time)
+    for _ in range(warmup):
+        _time_loop(function, number)
+
+    samples = []
+    for _ in range(repeat):
+        elapsed = _time_loop(function, number)
+        overhead = _time_loop(_empty, number)
+        samples.append(max(elapsed - overhead, 0.0) / number)
+
+    median = statistics.median(samples)
+    if len(samples) > 1:
+        q1, _, q3 = statistics.quantiles(samples, n=4)
+        iqr = q3 - q1
+    else:
+        iqr = 0.0
+    return BenchmarkResult(
+        name, number, repeat, median, iqr,
+        1.0 / median if median else float('inf'),
+    )
+
+
+def run(
+        pattern: str = '*',
+        repeat: int = 7,
+        min_time: float = 0.05,
+) -> List[BenchmarkResult]:
+    """
+    Discovers and times every benchmark matching a pattern.
+    :param pattern:
+        Glob pattern benchmark names must match.
+    :param repeat:
+        Number of samples per benchmark.
+    :param min_time:
+        Minimum duration of each sample, in seconds.
+    :return:
+        Results, ordered by name.
+    """
+    benchmarks, _ = discover(pattern)
+    return [
+        measure(name, function, repeat, min_time)
+        for name, function in sorted(benchmarks.items())
+    ]
+
+
+def current_commit(directory: AnyStr = DIRECTORY) -> str:
+    """
+    Gets the git commit the given directory is checked out at.
+
+    A "+dirty" suffix is added if there are uncommitted changes.
+    Returns "unknown" if git isn't available.
+    """
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=directory,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            cwd=directory, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + '+dirty' if status else commit
+
+
+def load_results(
+        path: AnyStr = DEFAULT_RESULTS_PATH,
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Loads stored results, keyed by commit and then benchmark name.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_results(
+        results: Iterable[BenchmarkResult],
+        commit: Optional[str] = None,
+        path: AnyStr = DEFAULT_RESULTS_PATH,
+):
+    """
+    Stores results under a commit, replacing any stored for it before.
+    :param results:
+        Results to store.
+    :param commit:
+        Commit to store the results under. Defaults to the current one.
+    :param path:
+        JSON file results are kept in.
+    """
+    stored = load_results(path)
+    stored[commit or current_commit()] = {
+        result.name: result._asdict() for result in results
+    }
+    with open(path, 'w') as f:
+        json.dump(stored, f, indent=4, sort_keys=True)
+
+
+def find_regressions(
+        results: Iterable[BenchmarkResult],
+        baseline: Dict[str, Dict[str, Any]],
+        threshold: float = 0.1,
+) -> List[Tuple[BenchmarkResult, float]]:
+    """
+    Finds benchmarks that got slower than a baseline.
+
+    A benchmark regresses when its median is more than `threshold`
+    slower than the baseline's, and the gap is larger than the combined
+    IQR of both runs (so noise alone isn't flagged).
+    :param results:
+        Results of the current run.
+    :param baseline:
+        Stored results of the baseline run, keyed by benchmark name.
+    :param threshold:
+        Relative slowdown allowed, e.g. 0.1 for 10%.
+    :return:
+        (result, relative slowdown) pairs for each regression.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if not previous or not previous['median']:
+            continue
+        gap = result.median - previous['median']
+        slowdown = gap / previous['median']
+        if slowdown > threshold and gap > result.iqr + previous['iqr']:
+            regressions.append((result, slowdown))
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f}{unit}'
+    return f'{seconds / 1e-9:.1f}ns'
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None) -> int:
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    :return:
+        Exit code; 1 if any regressions were found.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        'pattern', nargs='?', default='*',
+        help='Glob pattern of benchmarks to run, e.g. "Network2.*".',
+    )
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05)
+    parser.add_argument('--results', default=DEFAULT_RESULTS_PATH)
+    parser.add_argument(
+        '--save', action='store_true',
+        help='Store the results under the current commit.',
+    )
+    parser.add_argument(
+        '--baseline',
+        help='Commit whose stored results are compared against.',
+    )
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.repeat, args.min_time)
+    for result in results:
+        print(
+            f'{result.name:<50}'
+            f'{_format_time(result.median):>12} '
+            f'±{_format_time(result.iqr):>10} '
+            f'{result.ops_per_second:>14,.0f} ops/s'
+        )
+
+    if args.save:
+        save_results(results, path=args.results)
+
+    if args.baseline:
+        baseline = load_results(args.results).get(args.baseline)
+        if baseline is None:
+            parser.error(f'No stored results for {args.baseline!r}.')
+        regressions = find_regressions(results, baseline, args.threshold)
+        for result, slowdown in regressions:
+            print(f'REGRESSION {result.name}: {slowdown:+.1%}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Converts text to Discord emoji shortcodes, one emoji per letter, and
+back again.
+
+Conversion maps characters through the table in C (`map` of
+`dict.get`), reversal splits text on a precompiled, trie factored regex
+of every shortcode, and both stream text in chunks so that large chat
+exports use bounded memory.
+"""
+
+
+from typing import *
+import re
+import sys
+import time
+
+
+__all__ = (
+    'table',
+    'reverse_table',
+    'to_emojis',
+    'from_emojis',
+    'iter_to_emojis',
+    'iter_from_emojis',
+    'convert_stream',
+)
+
+
+table = {
+    'q': ':black_circle:',
+    'w': ':blue_circle:',
+    'e': ':brown_circle:',
+    'r': ':green_circle:',
+    't': ':orange_circle:',
+    'y': ':purple_circle:',
+    'u': ':red_circle:',
+    'i': ':white_circle:',
+    'o': ':yellow_circle:',
+    'p': ':black_large_square:',
+    'a': ':blue_square:',
+    's': ':brown_square:',
+    'd': ':green_square:',
+    'f': ':orange_square:',
+    'g': ':purple_square:',
+    'h': ':red_square:',
+    'j': ':white_large_square:',
+    'k': ':yellow_square:',
+    'l': ':black_heart:',
+    'z': ':blue_heart:',
+    'x': ':brown_heart:',
+    'c': ':green_heart:',
+    'v': ':orange_heart:',
+    'b': ':purple_heart:',
+    'n': ':heart:',
+    'm': ':white_heart:',
+}
+
+reverse_table = {emoji: letter for letter, emoji in table.items()}
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Builds a regex matching any of the given words, factored into a trie
+    so that shared prefixes are only tested once.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if '' in node:
+            # Greedy, so the longest word wins.
+            return '(?:' + '|'.join(branches) + ')?' if branches else ''
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+# Captures, so that splitting on it keeps the shortcodes.
+_REVERSE_PATTERN = re.compile('(' + _trie_pattern(reverse_table) + ')')
+_MAX_EMOJI_LENGTH = max(map(len, reverse_table))
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def to_emojis(text: str) -> str:
+    """
+    Converts the letters of some text to emojis.
+    """
+    text = text.lower()
+    return ''.join(map(table.get, text, text))
+
+
+def from_emojis(text: str) -> str:
+    """
+    Converts emojis back to the letters they stand for.
+    """
+    parts = _REVERSE_PATTERN.split(text)
+    parts[1::2] = map(reverse_table.__getitem__, parts[1::2])
+    return ''.join(parts)
+
+
+def iter_to_emojis(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Converts a stream of text chunks to emojis.
+    """
+    for chunk in chunks:
+        yield to_emojis(chunk)
+
+
+def iter_from_emojis(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Converts a stream of text chunks from emojis back to letters.
+
+    The tail of each chunk that could hold the start of a shortcode is
+    carried over to the next, so shortcodes split across chunks are
+    still found.
+    """
+    split = _REVERSE_PATTERN.split
+    pending = ''
+    for chunk in chunks:
+        parts = split(pending + chunk)
+        # Only the end of the text after the last shortcode can hold the
+        # start of one that continues into the next chunk.
+        tail = parts[-1]
+        keep = max(len(tail) - _MAX_EMOJI_LENGTH + 1, 0)
+        pending = tail[keep:]
+        parts[-1] = tail[:keep]
+        parts[1::2] = map(reverse_table.__getitem__, parts[1::2])
+        yield ''.join(parts)
+    yield from_emojis(pending)
+
+
+def _iter_chunks(f: TextIO, chunk_size: int) -> Iterator[str]:
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_stream(
+        source: TextIO,
+        destination: TextIO,
+        reverse: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Converts text from one file object into another, a chunk at a time.
+    :param source:
+        Text file object to read, e.g. `sys.stdin`.
+    :param destination:
+        Text file object to write, e.g. `sys.stdout`.
+    :param reverse:
+        If True, converts emojis back to letters.
+    :param chunk_size:
+        Number of characters read at a time.
+    :return:
+        Number of characters written.
+    """
+    convert = iter_from_emojis if reverse else iter_to_emojis
+    count = 0
+    for piece in convert(_iter_chunks(source, chunk_size)):
+        destination.write(piece)
+        count += len(piece)
+    return count
+
+
+def benchmark(size: int = 1024 * 1024) -> Dict[str, float]:
+    """
+    Times converting `size` characters of text with each method.
+    :param size:
+        Number of characters converted.
+    :return:
+        Seconds taken by each method.
+    """
+    text = ('The quick brown fox jumps over the lazy dog. ' * (
+        size // 45 + 1
+    ))[:size]
+    emojis = to_emojis(text)
+
+    results = {}
+
+    start = time.perf_counter()
+    ''.join(table.get(c, c) for c in text.lower())
+    results['table.get per char'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    to_emojis(text)
+    results['to_emojis'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ''.join(iter_to_emojis(
+        text[i:i + DEFAULT_CHUNK_SIZE]
+        for i in range(0, size, DEFAULT_CHUNK_SIZE)
+    ))
+    results['iter_to_emojis'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    from_emojis(emojis)
+    results['from_emojis'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ''.join(iter_from_emojis(
+        emojis[i:i + DEFAULT_CHUNK_SIZE]
+        for i in range(0, len(emojis), DEFAULT_CHUNK_SIZE)
+    ))
+    results['iter_from_emojis'] = time.perf_counter() - start
+
+    return results
+
+
+_BENCH_TEXT = 'The quick brown fox jumps over the lazy dog. ' * 100
+_BENCH_EMOJIS = to_emojis(_BENCH_TEXT)
+
+
+def bench_to_emojis():
+    to_emojis(_BENCH_TEXT)
+
+
+def bench_from_emojis():
+    from_emojis(_BENCH_EMOJIS)
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point; converts files, or stdin, to stdout.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        'paths', nargs='*',
+        help='Text files to convert; reads stdin if none are given.',
+    )
+    parser.add_argument(
+        '-r', '--reverse', action='store_true',
+        help='Converts emojis back to letters.',
+    )
+    parser.add_argument(
+        '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+    )
+    args = parser.parse_args(argv)
+
+    if not args.paths:
+        if sys.stdin.isatty():
+            sentence = input('convert to discord emojis:')
+            print(from_emojis(sentence) if args.reverse else to_emojis(
+                sentence
+            ))
+        else:
+            convert_stream(
+                sys.stdin, sys.stdout, args.reverse, args.chunk_size
+            )
+        return
+
+    for path in args.paths:
+        with open(path, encoding='utf-8') as f:
+            convert_stream(f, sys.stdout, args.reverse, args.chunk_size)
+
+
+if __name__ == '__main__':
+    main()
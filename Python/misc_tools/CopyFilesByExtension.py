@@ -0,0 +1,102 @@
+
+from typing import AnyStr, Iterable, Iterator, List, Optional, Sequence, Tuple
+import os
+import shutil
+
+from .FilePath import PathMapper
+
+
+def iter_copy_plan(
+        source: AnyStr,
+        destination: AnyStr,
+        extensions: Iterable[AnyStr],
+) -> Iterator[Tuple[AnyStr, List[Tuple[AnyStr, AnyStr]]]]:
+    """
+    Plans copying a directory tree whilst masking files by extension,
+    without touching any files.
+    :param source:
+        Source directory.
+    :param destination:
+        Destination for the copied directory tree.
+    :param extensions:
+        Whitelisted file extensions.
+    :return:
+        Iterator of (destination directory, [(source file, destination
+        file), ...]) pairs, one for each directory holding matching
+        files.
+    """
+    extensions = frozenset(extensions)
+    mapper = PathMapper(source, destination)
+
+    for dirpath, dirname, filenames in os.walk(source):
+        filenames = [
+            filename for filename in filenames
+            if os.path.splitext(filename)[1] in extensions
+        ]
+        if not filenames:
+            continue
+
+        newdir = mapper.map_directory(dirpath)
+        yield newdir, [
+            (os.path.join(dirpath, filename), new_filepath)
+            for filename, new_filepath in zip(
+                filenames, mapper.map_files(dirpath, filenames)
+            )
+        ]
+
+
+def copy_files_by_extension(
+        source: AnyStr,
+        destination: AnyStr,
+        extensions: Iterable[AnyStr],
+) -> List[AnyStr]:
+    """
+    Copies a directory tree whilst masking files by extension.
+    :param source:
+        Source directory.
+    :param destination:
+        Destination for the copied directory tree.
+    :param extensions:
+        Whitelisted file extensions.
+    :return:
+        All copied files.
+    """
+
+    result = []
+    for newdir, files in iter_copy_plan(source, destination, extensions):
+
+        os.makedirs(newdir, exist_ok=True)
+
+        for filepath, new_filepath in files:
+            shutil.copyfile(filepath, new_filepath)
+            result.append(new_filepath)
+
+    return result
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Copies a directory tree whilst masking files by '
+                    'extension.'
+    )
+    parser.add_argument('source', help='Source directory.')
+    parser.add_argument(
+        'destination', help='Destination for the copied directory tree.'
+    )
+    parser.add_argument(
+        'extensions', nargs='+',
+        help='Whitelisted file extensions, e.g. ".mp3".',
+    )
+    args = parser.parse_args(argv)
+    copy_files_by_extension(args.source, args.destination, args.extensions)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+
+"""
+Plots universal destabilization as `r` increases.
+
+The logistic map x -> r * x * (1 - x) is iterated for a whole sweep of
+`r` values at once; with NumPy when it's installed, falling back to
+pure Python arrays otherwise. Transient iterations are discarded and
+the remaining samples of each attractor are streamed to a file, giving
+the data for a bifurcation diagram.
+
+Each `r` can also be analysed for its Lyapunov exponent and attractor
+period, with chunks of a fine `r` grid spread across a process pool.
+"""
+
+
+from array import array
+from collections import deque
+from functools import lru_cache
+from typing import *
+import math
+import sys
+
+
+__all__ = (
+    'r_grid',
+    'logistic_sweep',
+    'iter_logistic_sweep',
+    'write_bifurcation',
+    'ChaosResult',
+    'analyse_chaos',
+    'iter_chaos_analysis',
+)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """
+    Imports NumPy on first use.
+    :return:
+        The numpy module, or None if it isn't installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def r_grid(start: float, stop: float, count: int) -> Sequence[float]:
+    """
+    Evenly spaced `r` values from start to stop, inclusive.
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.linspace(start, stop, count)
+    if count == 1:
+        return array('d', [start])
+    step = (stop - start) / (count - 1)
+    return array('d', (start + i * step for i in range(count)))
+
+
+def logistic_sweep(
+        r_values: Sequence[float],
+        x0: float = 0.4,
+        transient: int = 1000,
+        samples: int = 200,
+) -> List[Sequence[float]]:
+    """
+    Iterates the logistic map for every `r` value at once.
+    :param r_values:
+        Growth rates to iterate.
+    :param x0:
+        Starting population for every `r`.
+    :param transient:
+        Number of leading iterations discarded, so that each `r` settles
+        onto its attractor.
+    :param samples:
+        Number of iterations collected after the transient.
+    :return:
+        One row per sample, each holding a value for every `r`.
+        Rows are NumPy arrays if NumPy is installed, else `array('d')`.
+    """
+    numpy = _numpy()
+    if numpy is not None:
+        r = numpy.asarray(r_values, dtype=float)
+        x = numpy.full(r.shape, x0)
+        result = []
+        with numpy.errstate(over='ignore', invalid='ignore'):
+            for _ in range(transient):
+                x = r * x * (1.0 - x)
+            for _ in range(samples):
+                x = r * x * (1.0 - x)
+                result.append(x)
+        return result
+
+    r = array('d', r_values)
+    x = [x0] * len(r)
+    result = []
+    for _ in range(transient):
+        x = [ri * xi * (1.0 - xi) for ri, xi in zip(r, x)]
+    for _ in range(samples):
+        x = [ri * xi * (1.0 - xi) for ri, xi in zip(r, x)]
+        result.append(array('d', x))
+    return result
+
+
+def iter_logistic_sweep(
+        r_values: Sequence[float],
+        x0: float = 0.4,
+        transient: int = 1000,
+        samples: int = 200,
+        chunk_size: int = 4096,
+) -> Iterator[Tuple[Sequence[float], List[Sequence[float]]]]:
+    """
+    Sweeps `r` values a chunk at a time, so memory stays bounded by the
+    chunk size no matter how fine the sweep.
+
+    Arguments follow `logistic_sweep`.
+    :param chunk_size:
+        Number of `r` values iterated together.
+    :return:
+        Iterator of (r chunk, sample rows) pairs.
+    """
+    for start in range(0, len(r_values), chunk_size):
+        r_chunk = r_values[start:start + chunk_size]
+        yield r_chunk, logistic_sweep(r_chunk, x0, transient, samples)
+
+
+def write_bifurcation(
+        path: AnyStr,
+        r_values: Sequence[float],
+        x0: float = 0.4,
+        transient: int = 1000,
+        samples: int = 200,
+        binary: bool = True,
+        chunk_size: int = 4096,
+) -> int:
+    """
+    Streams bifurcation diagram points to a file.
+
+    Binary files hold consecutive little endian float32 (r, x) pairs.
+    CSV files hold an "r,x" header followed by one point per line.
+    Other arguments follow `logistic_sweep`.
+    :param path:
+        File to write.
+    :param binary:
+        Whether to write the binary format rather than CSV.
+    :param chunk_size:
+        Number of `r` values iterated, and written, together.
+    :return:
+        Number of points written.
+    """
+    numpy = _numpy()
+    count = 0
+    with open(path, 'wb' if binary else 'w') as f:
+        if not binary:
+            f.write('r,x\n')
+
+        for r_chunk, rows in iter_logistic_sweep(
+                r_values, x0, transient, samples, chunk_size
+        ):
+            if numpy is not None:
+                # CSV is formatted from full precision values, as in the
+                # pure Python path.
+                points = numpy.empty(
+                    (len(rows), len(r_chunk), 2), '<f4' if binary else float
+                )
+                points[:, :, 0] = r_chunk
+                points[:, :, 1] = rows
+                if binary:
+                    points.tofile(f)
+                else:
+                    numpy.savetxt(f, points.reshape(-1, 2), '%.7g', ',')
+            elif binary:
+                points = array('f')
+                for row in rows:
+                    for r, x in zip(r_chunk, row):
+                        points.append(r)
+                        points.append(x)
+                if sys.byteorder == 'big':
+                    points.byteswap()
+                points.tofile(f)
+            else:
+                f.writelines(
+                    f'{r:.7g},{x:.7g}\n'
+                    for row in rows
+                    for r, x in zip(r_chunk, row)
+                )
+            count += len(rows) * len(r_chunk)
+
+    return count
+
+
+class ChaosResult(NamedTuple):
+    """
+    Analysis of a chunk of `r` values.
+    """
+
+    # Index of the chunk's first `r` value within the whole grid.
+    start: int
+    r: Sequence[float]
+    # Lyapunov exponent of each `r`; negative for stable orbits,
+    # positive for chaos.
+    lyapunov: Sequence[float]
+    # Attractor period of each `r`, or 0 if none was found within the
+    # maximum period (e.g. chaos).
+    period: Sequence[int]
+
+
+def analyse_chaos(
+        r_values: Sequence[float],
+        x0: float = 0.4,
+        transient: int = 1000,
+        iterations: int = 1000,
+        max_period: int = 64,
+        tolerance: float = 1e-6,
+        start: int = 0,
+) -> ChaosResult:
+    """
+    Finds the Lyapunov exponent and attractor period for every `r` value
+    at once.
+
+    The exponent is the mean of ln|r * (1 - 2x)| over `iterations` steps
+    after the transient. The period is the smallest p for which the
+    final two values each recur p steps earlier, within `tolerance`.
+    :param r_values:
+        Growth rates to analyse.
+    :param x0:
+        Starting population for every `r`.
+    :param transient:
+        Number of leading iterations discarded.
+    :param iterations:
+        Number of iterations the exponent is averaged over; at least
+        `max_period + 2`.
+    :param max_period:
+        Longest period searched for.
+    :param tolerance:
+        Largest difference for two values to count as the same.
+    :param start:
+        Index of the first `r` value within a larger grid; passed
+        through to the result.
+    :return:
+        Exponents and periods for each `r`.
+    """
+    if iterations < max_period + 2:
+        raise ValueError('`iterations` must be at least `max_period + 2`.')
+
+    numpy = _numpy()
+    if numpy is not None:
+        r = numpy.asarray(r_values, dtype=float)
+        x = numpy.full(r.shape, x0)
+        total = numpy.zeros(r.shape)
+        recent = deque(maxlen=max_period + 2)
+        with numpy.errstate(all='ignore'):
+            for _ in range(transient):
+                x = r * x * (1.0 - x)
+            for _ in range(iterations):
+                x = r * x * (1.0 - x)
+                total += numpy.log(numpy.abs(r * (1.0 - 2.0 * x)))
+                recent.append(x)
+            lyapunov = total / iterations
+
+            period = numpy.zeros(r.shape, dtype=int)
+            last, second = recent[-1], recent[-2]
+            for p in range(1, max_period + 1):
+                found = (
+                    (period == 0)
+                    & (numpy.abs(last - recent[-1 - p]) < tolerance)
+                    & (numpy.abs(second - recent[-2 - p]) < tolerance)
+                )
+                period[found] = p
+        return ChaosResult(start, r, lyapunov, period)
+
+    r = array('d', r_values)
+    x = [x0] * len(r)
+    total = [0.0] * len(r)
+    recent = deque(maxlen=max_period + 2)
+    log = math.log
+    for _ in range(transient):
+        x = [ri * xi * (1.0 - xi) for ri, xi in zip(r, x)]
+    for _ in range(iterations):
+        x = [ri * xi * (1.0 - xi) for ri, xi in zip(r, x)]
+        total = [
+            t + (log(d) if d else -math.inf)
+            for t, d in zip(total, (
+                abs(ri * (1.0 - 2.0 * xi)) for ri, xi in zip(r, x)
+            ))
+        ]
+        recent.append(x)
+    lyapunov = array('d', (t / iterations for t in total))
+
+    period = array('l', [0] * len(r))
+    last, second = recent[-1], recent[-2]
+    for p in range(1, max_period + 1):
+        earlier, earlier_second = recent[-1 - p], recent[-2 - p]
+        for i, found in enumerate(period):
+            if (
+                    not found
+                    and abs(last[i] - earlier[i]) < tolerance
+                    and abs(second[i] - earlier_second[i]) < tolerance
+            ):
+                period[i] = p
+    return ChaosResult(start, r, lyapunov, period)
+
+
+def iter_chaos_analysis(
+        r_values: Sequence[float],
+        x0: float = 0.4,
+        transient: int = 1000,
+        iterations: int = 1000,
+        max_period: int = 64,
+        tolerance: float = 1e-6,
+        chunk_size: int = 8192,
+        max_workers: Optional[int] = None,
+) -> Iterator[ChaosResult]:
+    """
+    Analyses a grid of `r` values in chunks spread across a process pool.
+
+    Results are yielded as each chunk finishes, so they can be reported
+    (or written out) incrementally; use `ChaosResult.start` to place a
+    chunk within the grid. Other arguments follow `analyse_chaos`.
+    :param chunk_size:
+        Number of `r` values analysed together by a worker.
+    :param max_workers:
+        Number of worker processes. Defaults to the number of CPUs.
+    :return:
+        Iterator of chunk results, in the order they finish.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(
+                analyse_chaos, r_values[start:start + chunk_size], x0,
+                transient, iterations, max_period, tolerance, start,
+            )
+            for start in range(0, len(r_values), chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+if __name__ == '__main__':
+
+    r = 3.6
+    x = 0.4
+
+    for _ in range(100):
+        print(x)
+        x = r * x * (1.0 - x)
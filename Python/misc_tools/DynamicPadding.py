@@ -0,0 +1,240 @@
+
+from typing import *
+import re
+import time
+
+
+def dynamic_padding(item, index, trigger_pattern=r'#+'):
+    searches = re.finditer(trigger_pattern, item)
+    string_array = list(item)
+    for search in searches:
+        insert = '{:0{}}'.format(index, search.end() - search.start())
+        string_array[search.start():search.end()] = list(insert)
+    return ''.join(string_array)
+
+
+def dynamic_padding2(item, index, trigger_pattern=r'#+'):
+    re_trigger = re.compile(trigger_pattern)
+    searches = re_trigger.finditer(item)
+    subbed = re_trigger.sub('{:0{}}', item)
+    return subbed.format(*sum(
+        ((index, search.end() - search.start()) for search in searches),
+        tuple()
+    ))
+
+
+def dynamic_padding3(name, index, trigger_pattern=r'#+'):
+    re_compile = re.compile(trigger_pattern)
+    format_args = (
+        x
+        for m in re_compile.finditer(name)
+        for x in (index, m.end() - m.start())
+    )
+    pre_format = re_compile.sub('{:0{}}', name)
+    return pre_format.format(*format_args)
+
+
+class PaddingTemplate:
+    """
+    Padding template that is parsed once and can then be rendered for
+    any number of indices.
+
+    Renders the same result as `dynamic_padding3` for the same template
+    and index.
+    """
+
+    __slots__ = 'template', 'widths', '_format', '_match'
+
+    def __init__(self, template: str, trigger_pattern: str = r'#+'):
+        """
+        :param template:
+            Template string; every match of `trigger_pattern` is replaced
+            with the index, padded to the length of the match.
+        :param trigger_pattern:
+            Regex pattern marking the padding fields.
+        """
+        self.template = template
+
+        # Splits the template into literal and padding segments, then
+        # joins them into a single format string, and a regex that
+        # matches rendered strings.
+        widths = []
+        parts = []
+        patterns = []
+        end = 0
+        for search in re.finditer(trigger_pattern, template):
+            literal = template[end:search.start()]
+            parts.append(literal.replace('{', '{{').replace('}', '}}'))
+            patterns.append(re.escape(literal))
+            width = search.end() - search.start()
+            parts.append('{0:0%d}' % width)
+            patterns.append(r'(-?\d+)')
+            widths.append(width)
+            end = search.end()
+        literal = template[end:]
+        parts.append(literal.replace('{', '{{').replace('}', '}}'))
+        patterns.append(re.escape(literal))
+
+        self.widths = tuple(widths)
+        self._format = ''.join(parts).format
+        self._match = re.compile(''.join(patterns)).fullmatch
+
+    def __repr__(self) -> str:
+        return f'PaddingTemplate({self.template!r})'
+
+    def __call__(self, index: int) -> str:
+        return self._format(index)
+
+    def render(self, index: int) -> str:
+        """
+        Renders the template for a single index.
+        :param index:
+            Index to insert into each padding field.
+        :return:
+            Rendered string.
+        """
+        return self._format(index)
+
+    def match(self, string: str) -> Optional[int]:
+        """
+        Gets the index a string was rendered from.
+        :param string:
+            String to match against the template.
+        :return:
+            Index that renders exactly `string`, or None if there is no
+            such index (including templates without padding fields).
+        """
+        if not self.widths:
+            return None
+        m = self._match(string)
+        if m is None:
+            return None
+        index = int(m.group(1))
+        return index if self._format(index) == string else None
+
+    def render_range(
+            self,
+            start: int,
+            stop: Optional[int] = None,
+            step: int = 1,
+    ) -> Iterator[str]:
+        """
+        Streams the template rendered for a range of indices.
+
+        Arguments follow the same meaning as `range`.
+        :return:
+            Iterator of rendered strings.
+        """
+        if stop is None:
+            start, stop = 0, start
+        return map(self._format, range(start, stop, step))
+
+
+def benchmark(
+        template: str = 'render/shot_010/beauty.####.exr',
+        count: int = 100000,
+) -> Dict[str, float]:
+    """
+    Times rendering `count` names with each padding implementation.
+    :param template:
+        Template to render.
+    :param count:
+        Number of indices rendered per implementation.
+    :return:
+        Seconds taken by each implementation.
+    """
+    results = {}
+    for function in (dynamic_padding, dynamic_padding2, dynamic_padding3):
+        start = time.perf_counter()
+        for index in range(count):
+            function(template, index)
+        results[function.__name__] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = PaddingTemplate(template)
+    for index in range(count):
+        compiled.render(index)
+    results['PaddingTemplate.render'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in PaddingTemplate(template).render_range(count):
+        pass
+    results['PaddingTemplate.render_range'] = time.perf_counter() - start
+
+    return results
+
+
+_BENCH_TEMPLATE = 'render/shot_010/beauty.####.exr'
+
+
+def bench_dynamic_padding3():
+    for index in range(100):
+        dynamic_padding3(_BENCH_TEMPLATE, index)
+
+
+def bench_padding_template_render():
+    render = PaddingTemplate(_BENCH_TEMPLATE).render
+    for index in range(100):
+        render(index)
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None) -> int:
+    """
+    Command line entry point; prints a template rendered for a range of
+    indices, or the indices that names were rendered from.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    :return:
+        Exit status; 1 if any name given to --match does not match.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Renders padded sequence names from a template, e.g. '
+                    '"beauty.####.exr".'
+    )
+    parser.add_argument('template', nargs='?', help='Padding template.')
+    parser.add_argument(
+        'range', nargs='*', type=int, metavar='START [STOP [STEP]]',
+        help='Indices to render, with the same meaning as `range`.',
+    )
+    parser.add_argument(
+        '-p', '--trigger-pattern', default=r'#+',
+        help='Regex pattern marking the padding fields.',
+    )
+    parser.add_argument(
+        '-m', '--match', nargs='+', metavar='NAME',
+        help='Prints the index each name was rendered from instead.',
+    )
+    parser.add_argument(
+        '--benchmark', action='store_true',
+        help='Times each padding implementation instead.',
+    )
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        for name, seconds in benchmark().items():
+            print(f'{name:<30}{seconds:.3f}s')
+        return 0
+    if args.template is None:
+        parser.error('a template is required.')
+
+    template = PaddingTemplate(args.template, args.trigger_pattern)
+    if args.match:
+        status = 0
+        for name in args.match:
+            index = template.match(name)
+            if index is None:
+                status = 1
+            print(f'{name}: {index}')
+        return status
+
+    if not 1 <= len(args.range) <= 3:
+        parser.error('expected START [STOP [STEP]].')
+    for name in template.render_range(*args.range):
+        print(name)
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
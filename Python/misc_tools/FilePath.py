@@ -0,0 +1,471 @@
+
+from typing import *
+import os
+import time
+
+
+__all__ = 'FilePath', 'PathMapper'
+
+
+_SEP = os.sep
+_ALTSEP = os.altsep
+_SEPS = _SEP + (_ALTSEP or '')
+_CASE_INSENSITIVE = os.path.normcase('A') == 'a'
+
+
+def _parse(path: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Splits a path into its anchor (drive and root, e.g. "C:\\" or "/";
+    empty for relative paths) and a tuple of the names that follow.
+    """
+    drive, rest = os.path.splitdrive(path)
+    stripped = rest.lstrip(_SEPS)
+    anchor = drive + rest[:len(rest) - len(stripped)]
+    if _ALTSEP:
+        stripped = stripped.replace(_ALTSEP, _SEP)
+    return anchor, tuple(name for name in stripped.split(_SEP) if name)
+
+
+def _fold(parts: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Normalises the case of parts for case insensitive comparisons.
+    """
+    return tuple(os.path.normcase(part) for part in parts)
+
+
+class FilePath(str):
+    """
+    String path that is parsed, once, into its components.
+
+    The parsed anchor and names are cached on the instance, and every
+    derived path (`/`, `parent`, `relative_to`, `with_root`) is built
+    from them directly, so it is never parsed again.
+    """
+
+    __slots__ = '_anchor', '_parts'
+
+    @classmethod
+    def _from_parts(
+            cls,
+            anchor: str,
+            parts: Tuple[str, ...],
+            string: Optional[str] = None,
+    ) -> 'FilePath':
+        """
+        Builds a path from already parsed components.
+        :param string:
+            String form of the path, if already known; joined from the
+            components otherwise.
+        """
+        if string is None:
+            string = anchor + _SEP.join(parts)
+        self = str.__new__(cls, string)
+        self._anchor = anchor
+        self._parts = parts
+        return self
+
+    def _join(self, parts: Tuple[str, ...], string: str) -> 'FilePath':
+        """
+        Appends already parsed relative components to this path.
+        """
+        if not self._parts:
+            string = self._anchor + string
+        elif self[-1] in _SEPS:
+            string = self + string
+        else:
+            string = self + _SEP + string
+        path = str.__new__(self.__class__, string)
+        path._anchor = self._anchor
+        path._parts = self._parts + parts
+        return path
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached while the slots are still unset, so that reading
+        # them is a plain slot lookup once parsed.
+        if name in ('_anchor', '_parts'):
+            self._anchor, self._parts = _parse(self)
+            return getattr(self, name)
+        raise AttributeError(
+            f'{self.__class__.__name__!r} object has no attribute {name!r}'
+        )
+
+    @property
+    def anchor(self) -> str:
+        """
+        Drive and root of the path; empty for relative paths.
+        """
+        return self._anchor
+
+    @property
+    def parts(self) -> Tuple[str, ...]:
+        """
+        Names following the anchor, e.g. ("dir", "file.txt").
+        """
+        return self._parts
+
+    def __repr__(self) -> str:
+        return f'FilePath({str.__repr__(self)})'
+
+    def __reduce__(self):
+        # Pickled as the plain string, and parsed again when next used.
+        return self.__class__, (str(self),)
+
+    def __truediv__(self, other: AnyStr) -> 'FilePath':
+        if not isinstance(other, FilePath):
+            # Single names (the common case) skip parsing entirely.
+            if other and _SEP not in other and not (
+                    _ALTSEP and (_ALTSEP in other or ':' in other)
+            ):
+                if not (self._parts or self._anchor):
+                    return FilePath(other)
+                return self._join((other,), other)
+            other = FilePath(other)
+        if other._anchor or not (self._parts or self._anchor):
+            return other
+        if not other._parts:
+            return self
+        return self._join(other._parts, other)
+
+    def __rtruediv__(self, other: AnyStr) -> 'FilePath':
+        return FilePath(other) / self
+
+    def components(self: AnyStr) -> List[AnyStr]:
+        """
+        Splits the given path into a list of it's components
+        (drive, directories, file name).
+        """
+        if not isinstance(self, FilePath):
+            self = FilePath(self)
+        if self._anchor:
+            return [self._anchor, *self._parts]
+        return list(self._parts)
+
+    @property
+    def name(self) -> str:
+        """
+        Final component of the path, or an empty string if there is none.
+        """
+        parts = self._parts
+        return parts[-1] if parts else ''
+
+    @property
+    def suffix(self) -> str:
+        """
+        File extension of the final component, including the leading
+        ".", or an empty string if there is none.
+        """
+        name = self.name
+        index = name.rfind('.')
+        if 0 < index < len(name) - 1:
+            return name[index:]
+        return ''
+
+    @property
+    def stem(self) -> str:
+        """
+        Final component of the path, without its suffix.
+        """
+        name = self.name
+        suffix = self.suffix
+        return name[:-len(suffix)] if suffix else name
+
+    @property
+    def parent(self) -> 'FilePath':
+        """
+        Path of the directory containing this one. The anchor, and empty
+        paths, are their own parent.
+        """
+        parts = self._parts
+        if not parts:
+            return self
+        if len(parts) == 1:
+            return self._from_parts(self._anchor, (), self._anchor)
+        # Slices the name off the string, rather than rejoining.
+        string = self[:self.rindex(parts[-1])].rstrip(_SEPS)
+        return self._from_parts(self._anchor, parts[:-1], string)
+
+    def _prefix_length(self, other: 'FilePath') -> int:
+        """
+        Number of parts `other` covers at the start of this path.
+        :raises ValueError:
+            If this path isn't within `other`.
+        """
+        count = len(other._parts)
+        prefix = self._parts[:count]
+        if self._anchor != other._anchor or prefix != other._parts:
+            # Falls back to comparing case insensitively where the
+            # platform is (e.g. Windows).
+            if not _CASE_INSENSITIVE or (
+                    _fold((self._anchor, *prefix))
+                    != _fold((other._anchor, *other._parts))
+            ):
+                raise ValueError(f'{self!r} is not within {other!r}.')
+        return count
+
+    def relative_to(self, other: AnyStr) -> 'FilePath':
+        """
+        Gets this path relative to one of its ancestors.
+        :param other:
+            Ancestor path.
+        :raises ValueError:
+            If this path isn't within `other`.
+        """
+        if not isinstance(other, FilePath):
+            other = FilePath(other)
+        count = self._prefix_length(other)
+        return self._from_parts('', self._parts[count:])
+
+    def with_root(self, source: AnyStr, destination: AnyStr) -> 'FilePath':
+        """
+        Re-roots this path from one directory to another, e.g.
+        "src/a/b.txt" from "src" to "dst" becomes "dst/a/b.txt".
+        :param source:
+            Directory this path is within.
+        :param destination:
+            Directory to move this path under.
+        :raises ValueError:
+            If this path isn't within `source`.
+        """
+        if not isinstance(source, FilePath):
+            source = FilePath(source)
+        if not isinstance(destination, FilePath):
+            destination = FilePath(destination)
+        count = self._prefix_length(source)
+        return self._from_parts(
+            destination._anchor, destination._parts + self._parts[count:]
+        )
+
+
+class PathMapper:
+    """
+    Re-roots batches of paths from a source directory to a destination.
+
+    Paths are re-rooted by slicing off the source prefix by length, never
+    by searching and replacing, so a source name that appears again
+    deeper in a path is left alone. Each directory is mapped once and
+    the result interned, so every file within it shares the same mapped
+    directory and costs a single join.
+    """
+
+    __slots__ = 'source', 'destination', '_directories'
+
+    def __init__(self, source: AnyStr, destination: AnyStr):
+        """
+        :param source:
+            Directory the mapped paths are within.
+        :param destination:
+            Directory the mapped paths are moved under.
+        """
+        self.source = FilePath(source)
+        self.destination = FilePath(destination)
+        # Interned mapping of source directories to destinations.
+        self._directories = {}
+
+    def __repr__(self) -> str:
+        return f'PathMapper({self.source!r}, {self.destination!r})'
+
+    def _relative(self, path: str) -> str:
+        """
+        Gets the part of a path that follows the source directory.
+        :raises ValueError:
+            If the path isn't within the source directory.
+        """
+        source = self.source
+        # An empty source only holds relative paths, which the slow path
+        # checks for.
+        if source and path.startswith(source):
+            rest = path[len(source):]
+            if not rest or rest[0] in _SEPS or source[-1] in _SEPS:
+                return rest.lstrip(_SEPS)
+        # Differing case, separators or redundant separators.
+        return _SEP.join(FilePath(path).relative_to(source).parts)
+
+    def map_directory(self, directory: AnyStr) -> FilePath:
+        """
+        Re-roots a directory, reusing the result for repeated calls.
+        :raises ValueError:
+            If the directory isn't within the source directory.
+        """
+        try:
+            return self._directories[directory]
+        except KeyError:
+            pass
+        rest = self._relative(directory)
+        mapped = self.destination / rest if rest else self.destination
+        self._directories[directory] = mapped
+        return mapped
+
+    def map(self, path: AnyStr) -> FilePath:
+        """
+        Re-roots a single path.
+        :raises ValueError:
+            If the path isn't within the source directory.
+        """
+        directory, name = os.path.split(path)
+        if not name:
+            return self.map_directory(directory)
+        try:
+            mapped = self.map_directory(directory)
+        except ValueError:
+            # The source directory itself.
+            return self.map_directory(path)
+        return mapped._join((name,), name)
+
+    def map_many(self, paths: Iterable[AnyStr]) -> Iterator[FilePath]:
+        """
+        Re-roots a batch of paths, lazily.
+        """
+        return map(self.map, paths)
+
+    def map_files(
+            self,
+            directory: AnyStr,
+            names: Iterable[str],
+    ) -> List[FilePath]:
+        """
+        Re-roots files that all share the same directory, e.g. the
+        results of `os.walk`; the directory is only mapped once.
+        """
+        mapped = self.map_directory(directory)
+        join = mapped._join
+        return [join((name,), name) for name in names]
+
+    def clear(self):
+        """
+        Forgets every interned directory.
+        """
+        self._directories.clear()
+
+
+def benchmark(count: int = 100000) -> Dict[str, float]:
+    """
+    Times parsing and re-rooting `count` paths with `FilePath` and with
+    `pathlib`.
+    :param count:
+        Number of paths.
+    :return:
+        Seconds taken by each method.
+    """
+    import pathlib
+
+    strings = [
+        os.path.join(_SEP, 'projects', 'show', f'shot_{i % 100:03}',
+                     'render', f'beauty.{i:06}.exr')
+        for i in range(count)
+    ]
+    source = os.path.join(_SEP, 'projects', 'show')
+    destination = os.path.join(_SEP, 'backup', 'show')
+
+    results = {}
+
+    start = time.perf_counter()
+    for string in strings:
+        FilePath(string).parts
+    results['FilePath.parts'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for string in strings:
+        pathlib.PurePath(string).parts
+    results['PurePath.parts'] = time.perf_counter() - start
+
+    paths = [FilePath(string) for string in strings]
+    source_path = FilePath(source)
+    destination_path = FilePath(destination)
+    start = time.perf_counter()
+    for path in paths:
+        path.with_root(source_path, destination_path)
+    results['FilePath.with_root'] = time.perf_counter() - start
+
+    paths = [pathlib.PurePath(string) for string in strings]
+    source_path = pathlib.PurePath(source)
+    destination_path = pathlib.PurePath(destination)
+    start = time.perf_counter()
+    for path in paths:
+        destination_path / path.relative_to(source_path)
+    results['PurePath relative_to /'] = time.perf_counter() - start
+
+    paths = [FilePath(string) for string in strings]
+    start = time.perf_counter()
+    for path in paths:
+        path.parent / 'thumbnail.jpg'
+    results['FilePath parent /'] = time.perf_counter() - start
+
+    paths = [pathlib.PurePath(string) for string in strings]
+    start = time.perf_counter()
+    for path in paths:
+        path.parent / 'thumbnail.jpg'
+    results['PurePath parent /'] = time.perf_counter() - start
+
+    # Copy planning; one directory per 100 files, as `os.walk` gives.
+    walk = [
+        (os.path.join(source, f'shot_{i:03}', 'render'),
+         [f'beauty.{j:06}.exr' for j in range(100)])
+        for i in range(count // 100)
+    ]
+
+    start = time.perf_counter()
+    for directory, names in walk:
+        directory.replace(source, destination)
+        for name in names:
+            os.path.join(directory, name).replace(source, destination)
+    results['str.replace'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mapper = PathMapper(source, destination)
+    for directory, names in walk:
+        mapper.map_files(directory, names)
+    results['PathMapper.map_files'] = time.perf_counter() - start
+
+    return results
+
+
+_BENCH_PATH = FilePath(os.path.join(_SEP, 'projects', 'show', 'shot_010',
+                                    'render', 'beauty.000001.exr'))
+_BENCH_SOURCE = FilePath(os.path.join(_SEP, 'projects', 'show'))
+_BENCH_DESTINATION = FilePath(os.path.join(_SEP, 'backup', 'show'))
+
+
+def bench_file_path_with_root():
+    _BENCH_PATH.with_root(_BENCH_SOURCE, _BENCH_DESTINATION)
+
+
+def bench_file_path_parse():
+    FilePath(_BENCH_PATH).parts
+
+
+def bench_path_mapper():
+    list(PathMapper(_BENCH_SOURCE, _BENCH_DESTINATION).map_many(
+        [_BENCH_PATH] * 100
+    ))
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point; prints the components of each path.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Splits paths into their components.'
+    )
+    parser.add_argument('paths', nargs='*', help='Paths to split.')
+    parser.add_argument(
+        '--benchmark', action='store_true',
+        help='Times FilePath against pathlib instead.',
+    )
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        for name, seconds in benchmark().items():
+            print(f'{name:<25}{seconds:.3f}s')
+        return
+    if not args.paths:
+        parser.error('at least one path is required.')
+    for path in args.paths:
+        print(FilePath(path).components())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,331 @@
+
+from functools import lru_cache
+from typing import *
+import os
+import threading
+import time
+
+# asyncio and concurrent.futures are only imported by the async copy, as
+# they account for most of this module's import time.
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+
+__all__ = (
+    'copy_file',
+    'copy_directory',
+    'CopyProgress',
+    'copy_directory_async',
+)
+
+
+def copy_file(source, destination):
+
+    if not os.path.isfile(source):
+        raise IOError('Given `source` file path is invalid.')
+
+    dst_dir, _ = os.path.split(destination)
+    if not os.path.isdir(dst_dir):
+        os.mkdir(dst_dir)
+
+    with open(source, 'rb') as f1, open(destination, 'wb') as f2:
+        f2.write(f1.read())
+
+
+def copy_directory(source, destination, recursive=True):
+
+    if not os.path.isdir(source):
+        raise IOError('Given `source` directory is invalid.')
+
+    if not os.path.isdir(destination):
+        os.mkdir(destination)
+
+    for item_name in os.listdir(source):
+
+        src_path = os.path.join(source, item_name)
+        dst_path = os.path.join(destination, item_name)
+
+        if os.path.isfile(src_path):
+            with open(src_path, 'rb') as f1, open(dst_path, 'wb') as f2:
+                f2.write(f1.read())
+
+        elif recursive and os.path.isdir(src_path):
+            copy_directory(src_path, dst_path)
+
+
+class CopyProgress(NamedTuple):
+    """
+    Progress event emitted by `copy_directory_async`.
+
+    Every event carries the state of the file it was emitted for, along
+    with the aggregate state of the whole copy job.
+    """
+
+    source: AnyStr
+    destination: AnyStr
+    file_bytes_copied: int
+    file_size: int
+    file_done: bool
+    bytes_copied: int
+    total_bytes: int
+    files_copied: int
+    total_files: int
+    elapsed: float
+    bytes_per_second: float
+    files_per_second: float
+    eta: Optional[float]
+
+
+def _plan_directory_copy(
+        source: AnyStr,
+        destination: AnyStr,
+        recursive: bool,
+) -> Tuple[List[AnyStr], List[Tuple[AnyStr, AnyStr, int]]]:
+    """
+    Gathers the directories and files that make up a directory copy.
+    :return:
+        Destination directories to create (parents first), and a list of
+        (source, destination, size) tuples for each file to copy.
+    """
+    directories = [destination]
+    files = []
+    pending = [(source, destination)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                dst_path = os.path.join(dst_dir, entry.name)
+                if entry.is_file():
+                    files.append((entry.path, dst_path, entry.stat().st_size))
+                elif recursive and entry.is_dir():
+                    directories.append(dst_path)
+                    pending.append((entry.path, dst_path))
+    return directories, files
+
+
+def _copy_file_chunked(
+        source: AnyStr,
+        destination: AnyStr,
+        chunk_size: int,
+        cancelled: threading.Event,
+        report: Callable[[int], None],
+) -> int:
+    """
+    Blocking chunked file copy run inside of an executor.
+
+    Stops early if `cancelled` is set, leaving no partial file behind.
+    :param report:
+        Called with the number of bytes written after each chunk.
+    :return:
+        Number of bytes copied.
+    """
+    import asyncio
+
+    copied = 0
+    with open(source, 'rb') as f1, open(destination, 'wb') as f2:
+        while True:
+            if cancelled.is_set():
+                break
+            chunk = f1.read(chunk_size)
+            if not chunk:
+                return copied
+            f2.write(chunk)
+            copied += len(chunk)
+            report(len(chunk))
+    os.remove(destination)
+    raise asyncio.CancelledError()
+
+
+async def copy_directory_async(
+        source: AnyStr,
+        destination: AnyStr,
+        recursive: bool = True,
+        max_concurrency: int = 4,
+        chunk_size: int = 1024 * 1024,
+        executor: Optional['Executor'] = None,
+) -> AsyncIterator[CopyProgress]:
+    """
+    Copies a directory from within an asyncio event loop.
+
+    Blocking I/O is offloaded to `executor`, with at most
+    `max_concurrency` files being copied at once. Progress is streamed
+    back as `CopyProgress` events; one after each written chunk, and one
+    when each file completes.
+
+    Cancelling the consuming task (or closing the generator) stops all
+    in-flight copies between chunks.
+
+    Sharing a single executor between many calls lets multiple copy jobs
+    be multiplexed from one process.
+    :param source:
+        Source directory.
+    :param destination:
+        Destination for the copied directory tree.
+    :param recursive:
+        Whether sub directories should be copied as well.
+    :param max_concurrency:
+        Maximum number of files copied at the same time.
+    :param chunk_size:
+        Number of bytes read and written per chunk.
+    :param executor:
+        Executor used for blocking I/O. Uses the loop's default executor
+        if not given.
+    :return:
+        Async iterator of progress events.
+    """
+
+    import asyncio
+
+    if not os.path.isdir(source):
+        raise IOError('Given `source` directory is invalid.')
+
+    loop = asyncio.get_running_loop()
+    directories, files = await loop.run_in_executor(
+        executor, _plan_directory_copy, source, destination, recursive
+    )
+    for directory in directories:
+        await loop.run_in_executor(executor, os.makedirs, directory, 0o777,
+                                   True)
+
+    total_bytes = sum(size for _, _, size in files)
+    total_files = len(files)
+    bytes_copied = 0
+    files_copied = 0
+    start = time.monotonic()
+
+    events = asyncio.Queue()
+    cancelled = threading.Event()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Builds an event from the given file state and the current
+    # aggregate state.
+    def make_event(src, dst, file_copied, file_size, file_done):
+        elapsed = time.monotonic() - start
+        bytes_per_second = bytes_copied / elapsed if elapsed else 0.0
+        files_per_second = files_copied / elapsed if elapsed else 0.0
+        remaining = total_bytes - bytes_copied
+        eta = (
+            remaining / bytes_per_second
+            if bytes_per_second else
+            0.0 if not remaining else None
+        )
+        return CopyProgress(
+            src, dst, file_copied, file_size, file_done,
+            bytes_copied, total_bytes, files_copied, total_files,
+            elapsed, bytes_per_second, files_per_second, eta,
+        )
+
+    async def copy_one(src, dst, size):
+        nonlocal files_copied
+        file_copied = 0
+
+        # Runs on the loop thread; scheduled by the executor thread.
+        def on_chunk(n):
+            nonlocal bytes_copied, file_copied
+            bytes_copied += n
+            file_copied += n
+            events.put_nowait(make_event(src, dst, file_copied, size, False))
+
+        def report(n):
+            loop.call_soon_threadsafe(on_chunk, n)
+
+        async with semaphore:
+            copying = loop.run_in_executor(
+                executor, _copy_file_chunked,
+                src, dst, chunk_size, cancelled, report,
+            )
+            try:
+                await asyncio.shield(copying)
+            except asyncio.CancelledError:
+                # Cancelling can't stop the executor thread, but the
+                # copy stops at its next chunk once `cancelled` is set;
+                # waits for it, so nothing is written after returning.
+                try:
+                    await copying
+                except (asyncio.CancelledError, Exception):
+                    pass
+                raise
+
+        files_copied += 1
+        events.put_nowait(make_event(src, dst, file_copied, size, True))
+
+    tasks = [asyncio.ensure_future(copy_one(*file)) for file in files]
+    runner = asyncio.ensure_future(asyncio.gather(*tasks))
+    runner.add_done_callback(lambda _: events.put_nowait(None))
+
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        # Surfaces any exception raised while copying.
+        await runner
+    finally:
+        # Stops every copy still running or waiting on the semaphore,
+        # whether a copy failed or the consumer stopped early. When a
+        # copy fails `runner` is already done, but the others aren't.
+        cancelled.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(runner, *tasks, return_exceptions=True)
+
+
+@lru_cache(maxsize=None)
+def _bench_directory() -> 'tempfile.TemporaryDirectory':
+    """
+    Creates a temporary directory holding a 1MiB source file, once.
+    """
+    import tempfile
+
+    directory = tempfile.TemporaryDirectory()
+    with open(os.path.join(directory.name, 'source.bin'), 'wb') as f:
+        f.write(os.urandom(1024 * 1024))
+    return directory
+
+
+def bench_copy_file():
+    directory = _bench_directory().name
+    copy_file(
+        os.path.join(directory, 'source.bin'),
+        os.path.join(directory, 'destination.bin'),
+    )
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    """
+    import argparse
+    from .CopyFilesByExtension import copy_files_by_extension
+
+    parser = argparse.ArgumentParser(description='Copies a directory tree.')
+    parser.add_argument('source', help='Source directory.')
+    parser.add_argument(
+        'destination', help='Destination for the copied directory tree.'
+    )
+    parser.add_argument(
+        '-e', '--extension', action='append', dest='extensions',
+        help='Only copy files with this extension, e.g. ".mp3". May be '
+             'given more than once.',
+    )
+    parser.add_argument(
+        '--no-recursive', action='store_false', dest='recursive',
+        help='Skip sub directories.',
+    )
+    args = parser.parse_args(argv)
+
+    if args.extensions:
+        if not args.recursive:
+            parser.error('--extension always copies sub directories.')
+        copy_files_by_extension(
+            args.source, args.destination, args.extensions
+        )
+    else:
+        copy_directory(args.source, args.destination, args.recursive)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+
+from collections import OrderedDict, deque
+from itertools import islice
+from typing import *
+import heapq
+
+
+__all__ = (
+    'first_non_recurring',
+    'iter_file_chars',
+    'NonRecurringTracker',
+    'WindowedNonRecurring',
+)
+
+
+def first_non_recurring(item):
+    """
+    Gets every item that occurs exactly once, in the order they first
+    appear, in a single O(n) pass.
+    :param item:
+        Any iterable, e.g. a string or `iter_file_chars(f)`.
+    :return:
+        List of non recurring items.
+    """
+
+    too_many = set()
+    found = {}
+    for char in item:
+
+        if char in too_many:
+            continue
+
+        if char in found:
+            too_many.add(char)
+            del found[char]
+        else:
+            found[char] = None
+
+    return list(found)
+
+
+def iter_file_chars(f: TextIO, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """
+    Streams the characters of a text file, reading it in chunks.
+    """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        yield from chunk
+
+
+class NonRecurringTracker:
+    """
+    Incrementally tracks which items seen so far are non recurring.
+
+    Each update is O(1), and so is asking for the first non recurring
+    item; non recurring items are kept in a linked, insertion ordered
+    mapping.
+    """
+
+    def __init__(self, items: Iterable[Hashable] = ()):
+        self._too_many = set()
+        self._found = OrderedDict()
+        self.update(items)
+
+    def add(self, item: Hashable):
+        """
+        Records a single occurrence of the given item.
+        """
+        if item in self._too_many:
+            return
+        if item in self._found:
+            self._too_many.add(item)
+            del self._found[item]
+        else:
+            self._found[item] = None
+
+    def update(self, items: Iterable[Hashable]):
+        """
+        Records an occurrence of each of the given items.
+        """
+        too_many = self._too_many
+        found = self._found
+        for item in items:
+            if item in too_many:
+                continue
+            if item in found:
+                too_many.add(item)
+                del found[item]
+            else:
+                found[item] = None
+
+    def first(self, default: Any = None) -> Any:
+        """
+        Gets the first non recurring item seen so far.
+        :param default:
+            Returned if every item seen so far recurs.
+        """
+        return next(iter(self._found), default)
+
+    def first_k(self, k: int) -> List[Hashable]:
+        """
+        Gets the first `k` non recurring items seen so far, in the order
+        they first appeared; fewer if there aren't as many.
+        """
+        return list(islice(self._found, k))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._found)
+
+    def __len__(self) -> int:
+        return len(self._found)
+
+
+class WindowedNonRecurring:
+    """
+    Tracks non recurring items within a sliding window over a stream.
+
+    Only the last `size` items are considered, so memory stays bounded
+    on unbounded streams. Updates, and asking for the first non recurring
+    item in the window, are both O(log size) amortised.
+    """
+
+    def __init__(self, size: int):
+        """
+        :param size:
+            Number of most recent items the window covers.
+        """
+        if size < 1:
+            raise ValueError('Window `size` must be at least 1.')
+        self.size = size
+        self._window = deque()
+        self._counts = {}
+        # Position of each item's latest occurrence.
+        self._last = {}
+        # Heap of (position, item) candidates; stale entries are
+        # discarded lazily.
+        self._candidates = []
+        self._position = 0
+
+    def add(self, item: Hashable):
+        """
+        Pushes an item into the window, evicting the oldest if full.
+        """
+        position = self._position
+        self._position += 1
+
+        self._window.append(item)
+        self._last[item] = position
+        count = self._counts.get(item, 0) + 1
+        self._counts[item] = count
+        if count == 1:
+            heapq.heappush(self._candidates, (position, item))
+
+        if len(self._window) > self.size:
+            evicted = self._window.popleft()
+            count = self._counts[evicted] - 1
+            if count:
+                self._counts[evicted] = count
+                # Its remaining occurrence is now its only one.
+                if count == 1:
+                    heapq.heappush(
+                        self._candidates, (self._last[evicted], evicted)
+                    )
+            else:
+                del self._counts[evicted]
+                del self._last[evicted]
+
+            # Drops candidates that have left the window, keeping the
+            # heap bounded even if `first` is never called.
+            start = position + 1 - self.size
+            while self._candidates and self._candidates[0][0] < start:
+                heapq.heappop(self._candidates)
+
+    def update(self, items: Iterable[Hashable]):
+        """
+        Pushes each of the given items into the window.
+        """
+        for item in items:
+            self.add(item)
+
+    def first(self, default: Any = None) -> Any:
+        """
+        Gets the first non recurring item in the current window.
+        :param default:
+            Returned if every item in the window recurs.
+        """
+        start = self._position - len(self._window)
+        candidates = self._candidates
+        while candidates:
+            position, item = candidates[0]
+            if (
+                    position >= start
+                    and self._counts.get(item) == 1
+                    and self._last[item] == position
+            ):
+                return item
+            heapq.heappop(candidates)
+        return default
+
+    def first_k(self, k: int) -> List[Hashable]:
+        """
+        Gets the first `k` non recurring items in the current window, in
+        the order they appear; fewer if there aren't as many.
+
+        O(n log k) in the number of candidates held.
+        """
+        start = self._position - len(self._window)
+        counts = self._counts
+        last = self._last
+        return [
+            item for _, item in heapq.nsmallest(k, (
+                (position, item) for position, item in self._candidates
+                if position >= start
+                and counts.get(item) == 1
+                and last[item] == position
+            ))
+        ]
+
+
+if __name__ == '__main__':
+
+    ITEM = 'aadeefgg'
+
+    for x in first_non_recurring(ITEM):
+        print(x)
@@ -0,0 +1,229 @@
+"""
+Rebuilds custom map entries for the KFGame.ini file.
+"""
+
+
+from itertools import chain
+from typing import *
+import os
+import re
+
+
+__all__ = (
+    'remove_custom_maps',
+    'get_custom_maps',
+    'iter_entry_blocks',
+    'iter_vanilla_lines',
+    'iter_custom_map_names',
+    'iter_custom_maps',
+    'get_entry_map_names',
+    'rewrite_custom_maps',
+    'rewrite_custom_map_names',
+)
+
+
+# Regex used to search for custom map entry blocks.
+_RE_LINE_1 = re.compile(r"\[.+KFMapSummary\]")
+_RE_LINE_2 = re.compile(r"MapName=(.+)")
+
+# Template for custom map entries.
+_ENTRY_TEMPLATE = (
+    '[%(name)s KFMapSummary]\n',
+    'MapName=%(name)s\n',
+)
+
+
+def iter_entry_blocks(lines: Iterable[AnyStr]) -> Iterator[List[AnyStr]]:
+    """
+    Groups lines of .ini file data into entry blocks.
+
+    Blocks are .ini code separated by blank lines; each block includes
+    its trailing blank line. Only one block is held in memory at a time.
+    :param lines:
+        Iterable of .ini file lines.
+    :return:
+        Iterator of entry blocks.
+    """
+    block = []
+    for line in lines:
+        block.append(line)
+        if line == '\n':
+            yield block
+            block = []
+    yield block
+
+
+def _is_custom_entry(entry: List[AnyStr]) -> bool:
+    """
+    Returns True if the given entry meets all criteria to be considered
+    a custom map entry.
+    """
+    return (
+        len(entry) in (2, 3)
+        and _RE_LINE_1.search(entry[0]) is not None
+        and _RE_LINE_2.search(entry[1]) is not None
+    )
+
+
+def iter_vanilla_lines(lines: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    """
+    Streams the given lines of .ini file data with custom maps removed.
+    :param lines:
+        Iterable of .ini file lines.
+    :return:
+        Iterator of lines with all custom map data removed.
+    """
+    for entry in iter_entry_blocks(lines):
+        if not _is_custom_entry(entry):
+            yield from entry
+
+
+def get_entry_map_names(lines: Iterable[AnyStr]) -> List[AnyStr]:
+    """
+    Gets the names of the custom maps that have entries in the given
+    lines of .ini file data.
+    :param lines:
+        Iterable of .ini file lines.
+    :return:
+        Custom map names, in the order they appear.
+    """
+    return [
+        _RE_LINE_2.search(entry[1]).group(1)
+        for entry in iter_entry_blocks(lines)
+        if _is_custom_entry(entry)
+    ]
+
+
+def remove_custom_maps(lines: Iterable[AnyStr]) -> List[AnyStr]:
+    """
+    Removes custom maps from given lines of .ini file data.
+    :param lines:
+        Iterable of .ini file lines.
+    :return:
+        Lines with all custom map data removed.
+    """
+    return list(iter_vanilla_lines(lines))
+
+
+def iter_custom_map_names(path: AnyStr) -> Iterator[AnyStr]:
+    """
+    Scans the given directory for the names of .kfm files.
+    :param path:
+        Path to the custom map directory to gather map names from.
+    :return:
+        Iterator of map names.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+
+            # Continues if the path is not actually a file.
+            if not entry.is_file():
+                continue
+
+            # Gets the name and extension.
+            # Continues if the extension is not ".kfm".
+            name, extension = os.path.splitext(entry.name)
+            if extension.casefold() != '.kfm':
+                continue
+
+            yield name
+
+
+def _iter_map_entries(names: Iterable[AnyStr]) -> Iterator[AnyStr]:
+    """
+    Creates custom entry lines for each of the given map names.
+    """
+    for name in names:
+        for line in _ENTRY_TEMPLATE:
+            yield line % {'name': name}
+        yield '\n'
+
+
+def iter_custom_maps(path: AnyStr) -> Iterator[AnyStr]:
+    """
+    Streams custom map entries by scanning the given directory
+    for .kfm files and using the names of any found.
+    :param path:
+        Path to the custom map directory to gather map names from.
+    :return:
+        Iterator of entries for custom maps, as lines of .ini code.
+    """
+    return _iter_map_entries(iter_custom_map_names(path))
+
+
+def get_custom_maps(path: AnyStr) -> List[AnyStr]:
+    """
+    Creates custom map entries by scanning the given directory
+    for .kfm files and using the names of any found.
+    :param path:
+        Path to the custom map directory to gather map names from.
+    :return:
+        Entries for custom maps, returned as lines of .ini code.
+    """
+    return list(iter_custom_maps(path))
+
+
+def rewrite_custom_map_names(ini_path: AnyStr, names: Iterable[AnyStr]):
+    """
+    Replaces the custom map entries of an .ini file in a single pass.
+
+    Lines are streamed from the .ini file, through the custom map
+    filter, into a temp file that then replaces the .ini file; so the
+    file is never left half written.
+    :param ini_path:
+        Path to the .ini file to rewrite.
+    :param names:
+        Names of the custom maps to create entries for.
+    """
+    import shutil
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(ini_path))
+    fd, temp_path = tempfile.mkstemp('.tmp', '', directory)
+    try:
+        # The temp file is opened first, so that it owns, and closes,
+        # `fd` even if the .ini file can't be read.
+        with os.fdopen(fd, 'w') as f2, open(ini_path) as f1:
+            f2.writelines(chain(
+                iter_vanilla_lines(f1),
+                _iter_map_entries(names),
+            ))
+        shutil.copymode(ini_path, temp_path)
+        os.replace(temp_path, ini_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def rewrite_custom_maps(ini_path: AnyStr, custom_directory: AnyStr):
+    """
+    Rebuilds the custom map entries of an .ini file in a single pass.
+    :param ini_path:
+        Path to the .ini file to rewrite.
+    :param custom_directory:
+        Path to the custom map directory to gather map names from.
+    """
+    rewrite_custom_map_names(
+        ini_path, iter_custom_map_names(custom_directory)
+    )
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('ini_path', help='KFGame .ini file to rewrite.')
+    parser.add_argument(
+        'custom_directory', help='Directory containing custom .kfm maps.',
+    )
+    args = parser.parse_args(argv)
+    rewrite_custom_maps(args.ini_path, args.custom_directory)
+
+
+if __name__ == '__main__':
+    main()
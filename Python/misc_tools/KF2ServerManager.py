@@ -0,0 +1,238 @@
+"""
+Keeps the custom map entries of many KF2 servers' KFGame.ini files up
+to date.
+
+Map directory listings are cached against the directory's mtime, and an
+.ini file is only rewritten when its custom maps actually differ from
+the maps on disk.
+"""
+
+
+from typing import *
+import json
+import os
+import threading
+
+from .KF2CustomEntries import (
+    get_entry_map_names,
+    iter_custom_map_names,
+    rewrite_custom_map_names,
+)
+
+
+__all__ = (
+    'ServerConfig',
+    'SyncResult',
+    'MapListingCache',
+    'sync_server',
+    'sync_servers',
+)
+
+
+class ServerConfig(NamedTuple):
+    """
+    Paths for a single server instance.
+    """
+
+    ini_path: AnyStr
+    custom_directory: AnyStr
+
+
+class SyncResult(NamedTuple):
+    """
+    Outcome of syncing a single server's .ini file.
+    """
+
+    ini_path: AnyStr
+    added: Tuple[AnyStr, ...]
+    removed: Tuple[AnyStr, ...]
+    rewritten: bool
+    error: Optional[str] = None
+
+
+class MapListingCache:
+    """
+    Cache of custom map names for each map directory.
+
+    Listings are keyed by the directory's mtime, which changes whenever
+    a file is added, removed or renamed; so a directory is only scanned
+    again once its contents change. The cache can optionally be kept in
+    a JSON file between runs.
+
+    Each directory is scanned under its own lock, so that a slow scan
+    only holds up lookups of the same directory.
+    """
+
+    cache_path: Optional[AnyStr] = None
+    _listings: Dict[AnyStr, Tuple[int, List[AnyStr]]] = None
+    _directory_locks: Dict[AnyStr, threading.Lock] = None
+
+    def __init__(self, cache_path: Optional[AnyStr] = None):
+        """
+        :param cache_path:
+            JSON file the cache is loaded from, and saved to.
+        """
+        self.cache_path = cache_path
+        self._listings = {}
+        self._directory_locks = {}
+        # Guards `_listings` and `_directory_locks`; never held while
+        # scanning.
+        self._lock = threading.Lock()
+        if cache_path is not None and os.path.isfile(cache_path):
+            with open(cache_path) as f:
+                self._listings = {
+                    directory: (mtime, names)
+                    for directory, (mtime, names) in json.load(f).items()
+                }
+
+    def get(self, directory: AnyStr) -> List[AnyStr]:
+        """
+        Gets the custom map names in the given directory.
+        :param directory:
+            Custom map directory.
+        :return:
+            Map names, scanned only if the directory has changed.
+        """
+        key = os.path.abspath(directory)
+        mtime = os.stat(directory).st_mtime_ns
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            directory_lock = self._directory_locks.setdefault(
+                key, threading.Lock()
+            )
+
+        with directory_lock:
+            # Another thread may have scanned the directory whilst this
+            # one waited for it.
+            with self._lock:
+                cached = self._listings.get(key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            names = list(iter_custom_map_names(directory))
+            with self._lock:
+                self._listings[key] = mtime, names
+            return names
+
+    def save(self):
+        """
+        Writes the cache out to `cache_path`, if one was given.
+        """
+        if self.cache_path is None:
+            return
+        with self._lock, open(self.cache_path, 'w') as f:
+            json.dump(self._listings, f)
+
+
+def sync_server(
+        config: ServerConfig,
+        cache: Optional[MapListingCache] = None,
+) -> SyncResult:
+    """
+    Brings a server's custom map entries in line with its map directory.
+    :param config:
+        Paths for the server.
+    :param cache:
+        Map listing cache to use. A throwaway cache is used if not given.
+    :return:
+        Maps added and removed, and whether the .ini file was rewritten.
+    """
+    if cache is None:
+        cache = MapListingCache()
+
+    desired = cache.get(config.custom_directory)
+    with open(config.ini_path) as f:
+        current = get_entry_map_names(f)
+
+    current_set = set(current)
+    desired_set = set(desired)
+    added = tuple(name for name in desired if name not in current_set)
+    removed = tuple(name for name in current if name not in desired_set)
+
+    # Duplicate entries are cleaned up even if no maps changed.
+    changed = bool(added or removed) or len(current) != len(current_set)
+    if changed:
+        rewrite_custom_map_names(config.ini_path, desired)
+
+    return SyncResult(config.ini_path, added, removed, changed)
+
+
+def _sync_server_safe(
+        config: ServerConfig,
+        cache: MapListingCache,
+) -> SyncResult:
+    """
+    Syncs a server, capturing any error in the result.
+    """
+    try:
+        return sync_server(config, cache)
+    except OSError as e:
+        error = f'{e.__class__.__name__}: {e}'
+        return SyncResult(config.ini_path, (), (), False, error)
+
+
+def sync_servers(
+        configs: Iterable[ServerConfig],
+        cache_path: Optional[AnyStr] = None,
+        max_workers: Optional[int] = None,
+) -> List[SyncResult]:
+    """
+    Syncs many servers concurrently, sharing one map listing cache.
+
+    A failure on one server is reported in its result rather than
+    stopping the others.
+    :param configs:
+        Paths for each server.
+    :param cache_path:
+        JSON file to persist the map listing cache in.
+    :param max_workers:
+        Number of servers synced at once.
+    :return:
+        One result per server, in the given order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    cache = MapListingCache(cache_path)
+    with ThreadPoolExecutor(max_workers) as executor:
+        results = list(executor.map(
+            lambda config: _sync_server_safe(config, cache),
+            (ServerConfig(*config) for config in configs),
+        ))
+    cache.save()
+    return results
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None):
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        '--server', nargs=2, action='append', required=True,
+        metavar=('INI_PATH', 'CUSTOM_DIRECTORY'),
+        help='Server .ini file and its custom map directory.',
+    )
+    parser.add_argument(
+        '--cache', help='JSON file to keep map listings in between runs.',
+    )
+    args = parser.parse_args(argv)
+
+    for result in sync_servers(args.server, args.cache):
+        if result.error:
+            print(f'{result.ini_path}: {result.error}')
+        elif result.rewritten:
+            print(
+                f'{result.ini_path}: '
+                f'+{len(result.added)} -{len(result.removed)}'
+            )
+        else:
+            print(f'{result.ini_path}: unchanged')
+
+
+if __name__ == '__main__':
+    main()
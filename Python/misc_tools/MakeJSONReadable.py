@@ -0,0 +1,766 @@
+"""
+Reformats JSON files so they are readable, or compacts them for shipping.
+
+Files are tokenized incrementally and written back out as they are
+read, so memory use is bounded by the nesting depth of the document
+rather than the size of the file. Sorting keys is the exception; each
+map is held in memory until it ends, so a document whose top level is
+a map is held whole. Output is identical to what `json.dumps` produces
+for the same document and options.
+
+Files ending in ".gz", ".xz" or ".lzma" are transparently read and
+written with the matching compression. Compressed output only depends
+on the text written, so identical runs produce identical files.
+"""
+
+
+from json import JSONDecodeError
+from json.decoder import scanstring
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import *
+import io
+import os
+import re
+import time
+
+
+__all__ = (
+    'make_json_readable',
+    'make_json_readable_batch',
+    'stream_json_readable',
+    'measure_throughput',
+    'iter_json_files',
+    'FormatResult',
+    'iter_json_events',
+    'sort_json_events',
+    'write_json_events',
+)
+
+
+# Number of characters read from the source file at a time.
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Output formats, as arguments for `write_json_events`.
+MODES = {
+    'readable': {'indent': 4},
+    'compact': {'separators': (',', ':')},
+}
+
+# Compression used for files with these extensions.
+COMPRESSION_EXTENSIONS = {
+    '.gz': 'gzip',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+}
+
+# Extensions searched for when given a directory.
+JSON_EXTENSIONS = ('.json',) + tuple(
+    '.json' + extension for extension in COMPRESSION_EXTENSIONS
+)
+
+# Matches a single JSON token, skipping any leading whitespace.
+# Groups: punctuation, string, integer, fraction, exponent, literal.
+_TOKEN_RE = re.compile(
+    r'[ \t\n\r]*(?:'
+    r'([\[\]{},:])'
+    r'|("[^"\\]*(?:\\.[^"\\]*)*")'
+    r'|(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?'
+    r'|(true|false|null|NaN|Infinity|-Infinity)'
+    r')',
+    re.DOTALL,
+)
+
+_LITERALS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'NaN': float('nan'),
+    'Infinity': float('inf'),
+    '-Infinity': float('-inf'),
+}
+
+# Parser states.
+_VALUE, _KEY, _COLON, _AFTER, _DONE = range(5)
+
+
+def iter_json_events(
+        f: TextIO,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Incrementally parses JSON text from the given file.
+
+    Yields (event, value) pairs, where event is one of "start_map",
+    "end_map", "start_array", "end_array", "key" or "value". Values are
+    only given for "key" and "value" events, and are decoded the same way
+    `json.loads` would decode them. Duplicate keys are passed through as
+    they appear, whereas `json.loads` would only keep the last one.
+    :param f:
+        Text file to read JSON from.
+    :param chunk_size:
+        Number of characters to read at a time.
+    :return:
+        Iterator of parse events.
+    """
+
+    buf = ''
+    pos = 0
+    eof = False
+    stack = []
+    state = _VALUE
+    empty = False
+
+    while True:
+
+        # Reads more data if the token could be incomplete; i.e. it
+        # either doesn't match or runs too close to the end of the buffer
+        # to rule out a partially read fraction or exponent ("1.", "1e+").
+        m = _TOKEN_RE.match(buf, pos)
+        if not eof and (m is None or m.end() + 3 > len(buf)):
+            chunk = f.read(chunk_size)
+            if chunk:
+                buf = buf[pos:] + chunk
+                pos = 0
+            else:
+                eof = True
+            continue
+
+        if m is None:
+            if buf[pos:].strip(' \t\n\r'):
+                message = 'Extra data' if state == _DONE else 'Expecting value'
+                raise JSONDecodeError(message, buf, pos)
+            if state != _DONE:
+                raise JSONDecodeError('Expecting value', buf, len(buf))
+            return
+
+        punct, string, integer, frac, exp, literal = m.groups()
+        start = m.start(m.lastindex)
+        pos = m.end()
+        was_empty = empty
+        empty = False
+
+        if state == _DONE:
+            raise JSONDecodeError('Extra data', buf, start)
+
+        if state == _VALUE:
+            if punct == '[':
+                yield 'start_array', None
+                stack.append(']')
+                empty = True
+                continue
+            if punct == '{':
+                yield 'start_map', None
+                stack.append('}')
+                state = _KEY
+                empty = True
+                continue
+            if punct == ']' and was_empty:
+                yield 'end_array', None
+                stack.pop()
+            elif string is not None:
+                yield 'value', scanstring(string, 1, True)[0]
+            elif integer is not None:
+                if frac is None and exp is None:
+                    yield 'value', int(integer)
+                else:
+                    yield 'value', float(integer + (frac or '') + (exp or ''))
+            elif literal is not None:
+                yield 'value', _LITERALS[literal]
+            else:
+                raise JSONDecodeError('Expecting value', buf, start)
+
+        elif state == _KEY:
+            if string is not None:
+                yield 'key', scanstring(string, 1, True)[0]
+                state = _COLON
+                continue
+            if punct == '}' and was_empty:
+                yield 'end_map', None
+                stack.pop()
+            else:
+                raise JSONDecodeError(
+                    'Expecting property name enclosed in double quotes',
+                    buf, start,
+                )
+
+        elif state == _COLON:
+            if punct != ':':
+                raise JSONDecodeError("Expecting ':' delimiter", buf, start)
+            state = _VALUE
+            continue
+
+        else:
+            if punct == ',':
+                state = _VALUE if stack[-1] == ']' else _KEY
+                continue
+            if punct is None or punct != stack[-1]:
+                raise JSONDecodeError("Expecting ',' delimiter", buf, start)
+            yield 'end_array' if punct == ']' else 'end_map', None
+            stack.pop()
+
+        # A value, or container, has just been completed.
+        state = _AFTER if stack else _DONE
+
+
+def sort_json_events(
+        events: Iterable[Tuple[str, Any]],
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Reorders parse events so that the members of every map are sorted
+    by key, as with `json.dumps(sort_keys=True)`.
+
+    Each map has to be held in memory, along with everything nested in
+    it, until it ends. Memory use is therefore bounded by the size of
+    the largest map rather than nesting depth, and a document whose top
+    level is a map is held whole.
+    :param events:
+        Iterable of parse events.
+    :return:
+        Iterator of parse events with sorted maps.
+    """
+
+    # Each open map is a list of (key, events) pairs.
+    stack = []
+    for event in events:
+        kind = event[0]
+
+        if kind == 'start_map':
+            stack.append([])
+            continue
+        if kind == 'key':
+            stack[-1].append((event[1], []))
+            continue
+        if kind == 'end_map':
+            members = stack.pop()
+            members.sort(key=lambda member: member[0])
+            out = [('start_map', None)]
+            for key, member_events in members:
+                out.append(('key', key))
+                out.extend(member_events)
+            out.append(event)
+        else:
+            out = [event]
+
+        if stack:
+            stack[-1][-1][1].extend(out)
+        else:
+            yield from out
+
+
+def _floatstr(o: float) -> str:
+    """
+    Encodes a float the same way `json.dumps` does.
+    """
+    if o != o:
+        return 'NaN'
+    if o == float('inf'):
+        return 'Infinity'
+    if o == float('-inf'):
+        return '-Infinity'
+    return float.__repr__(o)
+
+
+def write_json_events(
+        events: Iterable[Tuple[str, Any]],
+        f: TextIO,
+        indent: Union[int, str, None] = None,
+        separators: Optional[Tuple[str, str]] = None,
+        ensure_ascii: bool = True,
+) -> NoReturn:
+    """
+    Writes parse events from `iter_json_events` out as JSON text.
+
+    Arguments follow the same meaning, and defaults, as `json.dumps`.
+    :param events:
+        Iterable of parse events.
+    :param f:
+        Text file to write JSON to.
+    :param indent:
+        Number of spaces, or string, used to indent each level.
+        None writes everything on a single line.
+    :param separators:
+        (item_separator, key_separator) tuple.
+    :param ensure_ascii:
+        Whether non-ASCII characters should be escaped.
+    """
+
+    if indent is not None and not isinstance(indent, str):
+        indent = ' ' * indent
+    if separators is not None:
+        item_separator, key_separator = separators
+    elif indent is not None:
+        item_separator, key_separator = ',', ': '
+    else:
+        item_separator, key_separator = ', ', ': '
+    encode_str = encode_basestring_ascii if ensure_ascii else encode_basestring
+
+    # Number of items written so far, for each open container.
+    counts = []
+    after_key = False
+    pieces = []
+
+    for event, value in events:
+
+        # Writes the separator ahead of a new item, unless the item is
+        # the value of a key that has just been written.
+        if after_key:
+            pieces.append(key_separator)
+            after_key = False
+        elif counts and event[:4] != 'end_':
+            if counts[-1]:
+                pieces.append(item_separator)
+            if indent is not None:
+                pieces.append('\n' + indent * len(counts))
+            counts[-1] += 1
+
+        if event == 'value':
+            if isinstance(value, str):
+                pieces.append(encode_str(value))
+            elif value is None:
+                pieces.append('null')
+            elif value is True:
+                pieces.append('true')
+            elif value is False:
+                pieces.append('false')
+            elif isinstance(value, int):
+                pieces.append(int.__repr__(value))
+            else:
+                pieces.append(_floatstr(value))
+        elif event == 'key':
+            pieces.append(encode_str(value))
+            after_key = True
+        elif event == 'start_array':
+            pieces.append('[')
+            counts.append(0)
+        elif event == 'start_map':
+            pieces.append('{')
+            counts.append(0)
+        else:
+            if counts.pop() and indent is not None:
+                pieces.append('\n' + indent * len(counts))
+            pieces.append(']' if event == 'end_array' else '}')
+
+        if len(pieces) > 1024:
+            f.write(''.join(pieces))
+            pieces.clear()
+
+    f.write(''.join(pieces))
+
+
+def _compression_for(filepath: AnyStr) -> Optional[str]:
+    """
+    Gets the compression implied by a file's extension.
+    """
+    _, extension = os.path.splitext(filepath)
+    return COMPRESSION_EXTENSIONS.get(extension.casefold())
+
+
+def _open_text(filepath: AnyStr, mode: str, compression: Optional[str]):
+    """
+    Opens a file in text mode, through the given compression.
+    :param mode:
+        Either "r" or "w".
+    :param compression:
+        "gzip", "lzma", or None for an uncompressed file.
+    """
+    import gzip
+    import lzma
+
+    if compression is None:
+        return open(filepath, mode)
+    if compression == 'gzip':
+        if mode == 'w':
+            return _GzipTextWriter(filepath)
+        return gzip.open(filepath, mode + 't')
+    if compression == 'lzma':
+        return lzma.open(filepath, mode + 't')
+    raise ValueError(f'Unknown compression: {compression!r}')
+
+
+class _GzipTextWriter(io.TextIOWrapper):
+    """
+    Text file written through gzip, with an empty file name and a zero
+    mtime in the gzip header.
+
+    `gzip.open` would record the name of the temp file being written
+    and the current time, so identical output never compared equal.
+    """
+
+    def __init__(self, filepath: AnyStr):
+        import gzip
+
+        self._raw = open(filepath, 'wb')
+        try:
+            super().__init__(gzip.GzipFile(
+                filename='', mode='wb', fileobj=self._raw, mtime=0
+            ))
+        except BaseException:
+            self._raw.close()
+            raise
+
+    def close(self) -> NoReturn:
+        # GzipFile doesn't close a file object it was given.
+        try:
+            super().close()
+        finally:
+            self._raw.close()
+
+
+class _ChangeWriter:
+    """
+    File-like object that atomically replaces a file with what is
+    written to it, but only if the written text differs.
+
+    Written text is compared against the existing file first; a temp
+    file next to the destination is only created at the first
+    difference, after which the matching prefix is copied across.
+    """
+
+    def __init__(
+            self,
+            filepath: AnyStr,
+            mode_filepath: AnyStr,
+            compression: Optional[str] = None,
+    ):
+        """
+        :param filepath:
+            File to replace.
+        :param mode_filepath:
+            File whose permissions are given to the replacement.
+        :param compression:
+            Compression the file is written with, see `_open_text`.
+        """
+        self.filepath = filepath
+        self.mode_filepath = mode_filepath
+        self.compression = compression
+        self._reference = (
+            _open_text(filepath, 'r', compression)
+            if os.path.isfile(filepath) else
+            None
+        )
+        self._matched = 0
+        self._out = None
+        self._temp_path = None
+
+    def write(self, s: str) -> NoReturn:
+        if self._out is None:
+            if self._reference is not None:
+                if self._reference.read(len(s)) == s:
+                    self._matched += len(s)
+                    return
+            self._open_temp()
+        self._out.write(s)
+
+    def _open_temp(self) -> NoReturn:
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(self.filepath))
+        fd, self._temp_path = tempfile.mkstemp('.tmp', '', directory)
+        os.close(fd)
+        self._out = _open_text(self._temp_path, 'w', self.compression)
+
+        # Copies across the prefix that matched the existing file.
+        if self._matched:
+            self._reference.seek(0)
+            remaining = self._matched
+            while remaining:
+                chunk = self._reference.read(
+                    min(remaining, DEFAULT_CHUNK_SIZE)
+                )
+                self._out.write(chunk)
+                remaining -= len(chunk)
+        self._close_reference()
+
+    def _close_reference(self) -> NoReturn:
+        if self._reference is not None:
+            self._reference.close()
+            self._reference = None
+
+    def commit(self) -> bool:
+        """
+        Replaces the file with the written text.
+        :return:
+            False if the file already matched and was left untouched.
+        """
+        import shutil
+
+        if self._out is None:
+            if self._reference is not None and not self._reference.read(1):
+                self._close_reference()
+                return False
+            self._open_temp()
+        self._out.close()
+        shutil.copymode(self.mode_filepath, self._temp_path)
+        os.replace(self._temp_path, self.filepath)
+        return True
+
+    def discard(self) -> NoReturn:
+        """
+        Abandons the write, leaving the file untouched.
+        """
+        self._close_reference()
+        if self._out is not None:
+            self._out.close()
+            os.remove(self._temp_path)
+
+
+def stream_json_readable(
+        filepath: AnyStr,
+        new_filepath: Optional[AnyStr] = None,
+        mode: str = 'readable',
+        sort_keys: bool = False,
+        compression: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> bool:
+    """
+    Reformats a JSON file without loading it whole.
+
+    Output is written to a temp file which then replaces the destination,
+    so a failure part way through never leaves a truncated file behind.
+    Destinations that are already formatted are left untouched.
+    :param filepath:
+        Path to the source JSON file.
+    :param new_filepath:
+        Path to write the reformatted JSON to.
+        Rewrites `filepath` in place if not given.
+    :param mode:
+        Output format; "readable" indents each level by four spaces,
+        "compact" removes all whitespace.
+    :param sort_keys:
+        Whether map members should be sorted by key, giving stable
+        output for diffs and hashing. Holds each map in memory until it
+        ends; see `sort_json_events`.
+    :param compression:
+        "gzip" or "lzma" to compress the output. Inferred from the
+        destination's extension if not given.
+    :param chunk_size:
+        Number of characters to read at a time.
+    :return:
+        True if the destination was written, False if it was skipped.
+    """
+    if mode not in MODES:
+        raise ValueError(f'Unknown mode: {mode!r}')
+    new_filepath = filepath if new_filepath is None else new_filepath
+    if compression is None:
+        compression = _compression_for(new_filepath)
+
+    writer = _ChangeWriter(new_filepath, filepath, compression)
+    try:
+        with _open_text(filepath, 'r', _compression_for(filepath)) as f:
+            events = iter_json_events(f, chunk_size)
+            if sort_keys:
+                events = sort_json_events(events)
+            write_json_events(events, writer, **MODES[mode])
+        return writer.commit()
+    except BaseException:
+        writer.discard()
+        raise
+
+
+def make_json_readable(filepath, new_filepath=None):
+    stream_json_readable(filepath, new_filepath)
+
+
+class FormatResult(NamedTuple):
+    """
+    Outcome of reformatting a single file in a batch.
+    """
+
+    filepath: AnyStr
+    changed: bool
+    seconds: float
+    error: Optional[str]
+
+
+def iter_json_files(
+        paths: Iterable[AnyStr],
+        extensions: Tuple[AnyStr, ...] = JSON_EXTENSIONS,
+) -> Iterator[AnyStr]:
+    """
+    Expands glob patterns and directories into unique file paths.
+    :param paths:
+        File paths, glob patterns (with "**" support) or directories.
+        Directories are searched recursively for files with `extensions`.
+    :param extensions:
+        File extensions to search directories for.
+    :return:
+        Iterator of file paths.
+    """
+    import glob
+
+    seen = set()
+    for path in paths:
+        for match in glob.iglob(path, recursive=True):
+            if os.path.isdir(match):
+                found = (
+                    os.path.join(dirpath, filename)
+                    for dirpath, _, filenames in os.walk(match)
+                    for filename in filenames
+                    if filename.casefold().endswith(extensions)
+                )
+            else:
+                found = [match]
+            for filepath in found:
+                if filepath not in seen:
+                    seen.add(filepath)
+                    yield filepath
+
+
+def _format_file(
+        filepath: AnyStr,
+        mode: str,
+        sort_keys: bool,
+) -> FormatResult:
+    """
+    Reformats one file in place, capturing errors and timing.
+    """
+    import lzma
+    import zlib
+
+    start = time.perf_counter()
+    try:
+        changed = stream_json_readable(filepath, None, mode, sort_keys)
+        error = None
+    # Truncated or corrupt compressed files raise EOFError, LZMAError or
+    # zlib.error rather than OSError.
+    except (OSError, ValueError, EOFError, lzma.LZMAError, zlib.error) as e:
+        changed = False
+        error = f'{e.__class__.__name__}: {e}'
+    return FormatResult(
+        filepath, changed, time.perf_counter() - start, error
+    )
+
+
+def make_json_readable_batch(
+        paths: Iterable[AnyStr],
+        mode: str = 'readable',
+        sort_keys: bool = False,
+        max_workers: Optional[int] = None,
+) -> Iterator[FormatResult]:
+    """
+    Reformats many JSON files in place, spread across a process pool.
+
+    Each file is rewritten atomically, and files that are already
+    formatted are skipped. A file that fails to parse is reported in its
+    result rather than stopping the batch.
+    :param paths:
+        File paths, glob patterns or directories; see `iter_json_files`.
+    :param mode:
+        Output format; see `stream_json_readable`.
+    :param sort_keys:
+        Whether map members should be sorted by key.
+    :param max_workers:
+        Number of worker processes. Defaults to the number of CPUs.
+    :return:
+        Iterator of results, in the order files finish.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        futures = [
+            executor.submit(_format_file, filepath, mode, sort_keys)
+            for filepath in iter_json_files(paths)
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def measure_throughput(
+        filepath: AnyStr,
+        repeat: int = 3,
+) -> List[Dict[str, Any]]:
+    """
+    Times every combination of mode, key sorting and compression on the
+    given file.
+    :param filepath:
+        JSON file to reformat; it is left untouched.
+    :param repeat:
+        Number of runs per combination; the fastest is kept.
+    :return:
+        One dict per combination, with the output size and the input
+        throughput in MB/s.
+    """
+    import tempfile
+
+    size = os.path.getsize(filepath)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in MODES:
+            for sort_keys in (False, True):
+                for compression in (None, 'gzip', 'lzma'):
+                    output = os.path.join(directory, 'output.json')
+                    seconds = float('inf')
+                    for _ in range(repeat):
+                        if os.path.exists(output):
+                            os.remove(output)
+                        start = time.perf_counter()
+                        stream_json_readable(
+                            filepath, output, mode, sort_keys, compression
+                        )
+                        seconds = min(seconds, time.perf_counter() - start)
+                    results.append({
+                        'mode': mode,
+                        'sort_keys': sort_keys,
+                        'compression': compression,
+                        'seconds': seconds,
+                        'mb_per_second': size / seconds / 1e6,
+                        'output_size': os.path.getsize(output),
+                    })
+    return results
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None) -> int:
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    :return:
+        Exit status; 1 if any file failed.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument(
+        'paths', nargs='+',
+        help='JSON files, glob patterns or directories to reformat.',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='Writes a single source file here instead of in place.',
+    )
+    parser.add_argument(
+        '-m', '--mode', choices=MODES, default='readable',
+        help='Output format.',
+    )
+    parser.add_argument(
+        '-s', '--sort-keys', action='store_true',
+        help='Sorts map members by key.',
+    )
+    parser.add_argument(
+        '-j', '--workers', type=int,
+        help='Number of worker processes. Defaults to the number of CPUs.',
+    )
+    args = parser.parse_args(argv)
+
+    if args.output is not None:
+        if len(args.paths) != 1:
+            parser.error('--output takes a single source file.')
+        stream_json_readable(
+            args.paths[0], args.output, args.mode, args.sort_keys
+        )
+        return 0
+
+    status = 0
+    for result in make_json_readable_batch(
+            args.paths, args.mode, args.sort_keys, args.workers
+    ):
+        if result.error is not None:
+            status = 1
+            print(f'{result.filepath}: {result.error}')
+        elif result.changed:
+            print(f'{result.filepath}: formatted')
+    return status
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,9 +1,12 @@
 
-from itertools import *
-from typing import *
+from functools import lru_cache
+from itertools import chain, product
+from typing import (
+    Any, Dict, Iterable, List, NoReturn, Optional, Set, Tuple, Union,
+)
 
 
-__all__ = 'Node', 'NodeContainer'
+__all__ = 'Node', 'NodeContainer', 'NodeExpression', 'DegreeIndex'
 
 
 class Node:
@@ -13,6 +16,8 @@ class Node:
 
     data: Any = None
     connections: Set['Node'] = None
+    # Indexes to notify when the node's connections change.
+    degree_indexes: Set['DegreeIndex'] = None
 
     def __init__(self, data: Any = None):
         """
@@ -37,6 +42,12 @@ class Node:
         """
         self.connections.add(other)
         other.connections.add(self)
+        if self.degree_indexes:
+            for index in self.degree_indexes:
+                index.update(self)
+        if other.degree_indexes:
+            for index in other.degree_indexes:
+                index.update(other)
 
     def __lshift__(self, other):
         self.connect(other)
@@ -54,12 +65,12 @@ class Node:
         """
 
         collector = {self}
-        new_nodes = [self]
+        new_nodes = {self}
         while new_nodes:
-            new_nodes[:] = (
+            new_nodes = {
                 c for n in new_nodes for c in n.connections
                 if c not in collector
-            )
+            }
             collector.update(new_nodes)
 
         return collector
@@ -161,6 +172,7 @@ class NodeContainer:
     """
 
     _nodes: Tuple[Node] = None
+    _degree_index: 'DegreeIndex' = None
 
     def __init__(self, others: Iterable[Any]):
         """
@@ -190,54 +202,78 @@ class NodeContainer:
         return 'Network(' + nodes + ')'
 
     def __sub__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_series([other])
         return self.combine([other])
 
     def __add__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_heads([other])
         return self.combine([other])
 
     def __mul__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_all([other])
         return self.combine([other])
 
     def __mod__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_endings([other])
         return self.combine([other])
 
     def __xor__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_parallel([other])
         return self.combine([other])
 
     def __or__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         return self.combine([other])
 
     def __isub__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_series([other])
         self.extend([other])
         return self
 
     def __iadd__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_heads([other])
         self.extend([other])
         return self
 
     def __imul__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_all([other])
         self.extend([other])
         return self
 
     def __imod__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_endings([other])
         self.extend([other])
         return self
 
     def __ixor__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.connect_parallel([other])
         self.extend([other])
         return self
 
     def __ior__(self, other: 'NodeContainer') -> 'NodeContainer':
+        if isinstance(other, NodeExpression):
+            return NotImplemented
         self.extend([other])
         return self
 
@@ -249,13 +285,15 @@ class NodeContainer:
             Networks from which nodes will be gathered from and then
             added to this network.
         """
-        nodes = (
+        nodes = tuple(
             n
             for t in others
             if isinstance(t, self.__class__)
             for n in t.nodes
         )
-        self._nodes += tuple(nodes)
+        self._nodes += nodes
+        if self._degree_index is not None:
+            self._degree_index.add(nodes)
 
     def combine(self, others: Iterable['NodeContainer']) -> 'NodeContainer':
         """
@@ -358,11 +396,38 @@ class NodeContainer:
             not required.
         """
         ts = list(chain([self], others))
-        tails = [[n for n in t.nodes if len(n.connections) < 2] for t in ts]
+        tails = [
+            t._degree_index.endings()
+            if t._degree_index is not None else
+            [n for n in t.nodes if len(n.connections) < 2]
+            for t in ts
+        ]
         for ta, tb in zip(tails[::2], tails[1::2]):
             for a, b in product(ta, tb):
                 a.connect(b)
 
+    def index_degrees(self) -> 'DegreeIndex':
+        """
+        Gets an index of this network's node degrees, creating it if
+        needed.
+
+        The index is kept up to date as nodes are connected, and as the
+        network is extended in place; `connect_endings` (%) then looks up
+        ending nodes in it rather than checking every node.
+        """
+        if self._degree_index is None:
+            self._degree_index = DegreeIndex(self._nodes)
+        return self._degree_index
+
+    def lazy(self) -> 'NodeExpression':
+        """
+        Gets a deferred version of this network.
+
+        Operators between deferred networks build an expression instead
+        of connecting nodes; see `NodeExpression`.
+        """
+        return NodeExpression(self)
+
     @property
     def nodes(self) -> Tuple[Node]:
         return self._nodes
@@ -372,6 +437,346 @@ class NodeContainer:
         return self._nodes and self._nodes[0] or None
 
 
+class NodeExpression:
+    """
+    Deferred network expression.
+
+    Supports the same operators as `NodeContainer`, but only records
+    them; nothing is connected, and no intermediate networks are built,
+    until `commit` computes every new connection in one batch and applies
+    it. The resulting connections are the same as if the expression had
+    been evaluated eagerly, including ending nodes (%) being chosen by
+    the connections made earlier in the expression.
+
+    In-place operators rebind the name to a new expression, rather than
+    extending the original network.
+    """
+
+    __slots__ = 'operator', 'left', 'right'
+
+    def __init__(
+            self,
+            left: Union[NodeContainer, 'NodeExpression'],
+            operator: Optional[str] = None,
+            right: Optional['NodeExpression'] = None,
+    ):
+        """
+        :param left:
+            Network to defer, or the left operand of `operator`.
+        :param operator:
+            One of "-", "+", "*", "%", "^" or "|"; None for a deferred
+            network.
+        :param right:
+            Right operand of `operator`.
+        """
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def __repr__(self) -> str:
+        if self.operator is None:
+            return f'NodeExpression({self.left!r})'
+        return f'({self.left!r} {self.operator} {self.right!r})'
+
+    def _combine(self, operator: str, other: Any) -> 'NodeExpression':
+        if isinstance(other, NodeContainer):
+            other = NodeExpression(other)
+        elif not isinstance(other, NodeExpression):
+            return NotImplemented
+        return NodeExpression(self, operator, other)
+
+    def _rcombine(self, operator: str, other: Any) -> 'NodeExpression':
+        if not isinstance(other, NodeContainer):
+            return NotImplemented
+        return NodeExpression(NodeExpression(other), operator, self)
+
+    def __sub__(self, other):
+        return self._combine('-', other)
+
+    def __add__(self, other):
+        return self._combine('+', other)
+
+    def __mul__(self, other):
+        return self._combine('*', other)
+
+    def __mod__(self, other):
+        return self._combine('%', other)
+
+    def __xor__(self, other):
+        return self._combine('^', other)
+
+    def __or__(self, other):
+        return self._combine('|', other)
+
+    def __rsub__(self, other):
+        return self._rcombine('-', other)
+
+    def __radd__(self, other):
+        return self._rcombine('+', other)
+
+    def __rmul__(self, other):
+        return self._rcombine('*', other)
+
+    def __rmod__(self, other):
+        return self._rcombine('%', other)
+
+    def __rxor__(self, other):
+        return self._rcombine('^', other)
+
+    def __ror__(self, other):
+        return self._rcombine('|', other)
+
+    def plan(self) -> Tuple[Tuple[Node], Dict[Node, Set[Node]]]:
+        """
+        Computes the expression without connecting anything.
+        :return:
+            Nodes of the resulting network, and the new connections of
+            each node; every connection is listed from both ends, and
+            connections that already exist are left out.
+        """
+        nodes = []
+        # Connections to add, from both ends.
+        pending = {}
+
+        def degree(n: Node) -> int:
+            added = pending.get(n)
+            return len(n.connections) + (len(added) if added else 0)
+
+        def connect(a: Node, b: Node):
+            if b in a.connections:
+                return
+            added = pending.get(a)
+            if added is None:
+                pending[a] = {b}
+            elif b in added:
+                return
+            else:
+                added.add(b)
+            pending.setdefault(b, set()).add(a)
+
+        # Walks the tree in post order, matching the order in which
+        # Python would have evaluated the operators eagerly. Leaves are
+        # laid out in order, so every sub expression's nodes are a
+        # contiguous (start, stop) span of `nodes`.
+        spans = []
+        stack = [(self, False)]
+        while stack:
+            expression, visited = stack.pop()
+            operator = expression.operator
+            if operator is None:
+                start = len(nodes)
+                nodes.extend(expression.left.nodes)
+                spans.append((start, len(nodes)))
+                continue
+            if not visited:
+                stack.append((expression, True))
+                stack.append((expression.right, False))
+                stack.append((expression.left, False))
+                continue
+
+            b_start, b_stop = spans.pop()
+            a_start, a_stop = spans.pop()
+            spans.append((a_start, b_stop))
+            if operator == '|' or a_start == a_stop or b_start == b_stop:
+                continue
+
+            if operator == '-':
+                connect(nodes[a_stop - 1], nodes[b_start])
+            elif operator == '+':
+                connect(nodes[a_start], nodes[b_start])
+            elif operator == '^':
+                connect(nodes[a_start], nodes[b_start])
+                connect(nodes[a_stop - 1], nodes[b_stop - 1])
+            else:
+                ta = nodes[a_start:a_stop]
+                tb = nodes[b_start:b_stop]
+                if operator == '%':
+                    ta = [n for n in ta if degree(n) < 2]
+                    tb = [n for n in tb if degree(n) < 2]
+                for a, b in product(ta, tb):
+                    connect(a, b)
+
+        return tuple(nodes), pending
+
+    def commit(self) -> NodeContainer:
+        """
+        Connects the nodes of the expression, in a single batch.
+        :return:
+            Network holding the nodes of the whole expression, as the
+            eager operators would have returned.
+        """
+        nodes, pending = self.plan()
+        for n, added in pending.items():
+            n.connections |= added
+            if n.degree_indexes:
+                for index in n.degree_indexes:
+                    index.update(n)
+        result = NodeContainer(())
+        result._nodes = nodes
+        return result
+
+
+class DegreeIndex:
+    """
+    Index of nodes by degree (number of connections).
+
+    Indexed nodes notify the index whenever `Node.connect` changes their
+    connections, so looking up nodes of a given degree, e.g. ending
+    nodes, never needs to scan every node. Connections changed by other
+    means must be reported with `update`.
+    """
+
+    def __init__(self, nodes: Iterable[Node] = ()):
+        """
+        :param nodes:
+            Nodes to index.
+        """
+        self._degrees = {}
+        # Sets of nodes by degree; empty sets are removed.
+        self._buckets = {}
+        self.add(nodes)
+
+    def __len__(self) -> int:
+        return len(self._degrees)
+
+    def __contains__(self, node: Node) -> bool:
+        return node in self._degrees
+
+    def _move(self, node: Node, old: Optional[int], new: Optional[int]):
+        buckets = self._buckets
+        if old is not None:
+            bucket = buckets[old]
+            bucket.discard(node)
+            if not bucket:
+                del buckets[old]
+        if new is not None:
+            bucket = buckets.get(new)
+            if bucket is None:
+                buckets[new] = {node}
+            else:
+                bucket.add(node)
+
+    def add(self, nodes: Iterable[Node]):
+        """
+        Starts indexing the given nodes.
+        """
+        degrees = self._degrees
+        for node in nodes:
+            if node in degrees:
+                continue
+            degree = degrees[node] = len(node.connections)
+            self._move(node, None, degree)
+            if node.degree_indexes is None:
+                node.degree_indexes = set()
+            node.degree_indexes.add(self)
+
+    def discard(self, nodes: Iterable[Node]):
+        """
+        Stops indexing the given nodes.
+        """
+        degrees = self._degrees
+        for node in nodes:
+            degree = degrees.pop(node, None)
+            if degree is None:
+                continue
+            self._move(node, degree, None)
+            node.degree_indexes.discard(self)
+
+    def clear(self):
+        """
+        Stops indexing every node.
+        """
+        self.discard(list(self._degrees))
+
+    def update(self, node: Node):
+        """
+        Re-indexes a node whose connections have changed.
+        """
+        old = self._degrees.get(node)
+        if old is None:
+            return
+        new = len(node.connections)
+        if new != old:
+            self._degrees[node] = new
+            self._move(node, old, new)
+
+    def degree(self, node: Node) -> int:
+        return self._degrees[node]
+
+    def nodes_with_degree(self, degree: int) -> Set[Node]:
+        """
+        Gets every indexed node with the given degree.
+        """
+        return set(self._buckets.get(degree, ()))
+
+    def endings(self) -> List[Node]:
+        """
+        Gets every indexed ending node; those with less than two
+        connections.
+        """
+        buckets = self._buckets
+        return [*buckets.get(0, ()), *buckets.get(1, ())]
+
+    def histogram(self) -> Dict[int, int]:
+        """
+        Gets the number of indexed nodes of each degree, by degree.
+        """
+        return {
+            degree: len(self._buckets[degree])
+            for degree in sorted(self._buckets)
+        }
+
+    def top(self, k: int) -> List[Node]:
+        """
+        Gets the `k` indexed nodes with the most connections, most first.
+        Only the buckets holding them are visited.
+        """
+        result = []
+        for degree in sorted(self._buckets, reverse=True):
+            result.extend(self._buckets[degree])
+            if len(result) >= k:
+                break
+        return result[:k]
+
+
+@lru_cache(maxsize=None)
+def _bench_grid(size: int = 32) -> Tuple[Node]:
+    """
+    Builds a size x size grid of connected nodes, once.
+    """
+    nodes = tuple(Node(i) for i in range(size * size))
+    for i, node in enumerate(nodes):
+        if i % size:
+            node.connect(nodes[i - 1])
+        if i >= size:
+            node.connect(nodes[i - size])
+    return nodes
+
+
+def bench_find_path():
+    nodes = _bench_grid()
+    nodes[0].find_path(nodes[-1])
+
+
+def bench_connection_island():
+    _bench_grid()[0].get_connection_island()
+
+
+def _bench_chain(containers):
+    result = containers[0]
+    for i, container in enumerate(containers[1:], 1):
+        result = result - container if i % 3 else result ^ container
+    return result
+
+
+def bench_eager_chain():
+    _bench_chain([NodeContainer([i]) for i in range(1000)])
+
+
+def bench_lazy_chain():
+    _bench_chain([NodeContainer([i]).lazy() for i in range(1000)]).commit()
+
+
 if __name__ == '__main__':
 
     from pprint import pprint
@@ -0,0 +1,220 @@
+"""
+Splits `Network2` networks into connection islands, and processes the
+islands in parallel.
+
+Islands are found in a single pass over every node, then serialised as
+compact, self contained subgraphs (node data plus compressed adjacency
+arrays) that are cheap to send to, and rebuild in, worker processes.
+"""
+
+
+from array import array
+from typing import *
+
+from .Network2 import Node, NodeContainer
+
+
+__all__ = (
+    'Island',
+    'IslandResult',
+    'partition',
+    'serialise_islands',
+    'iter_island_results',
+    'map_islands',
+)
+
+
+class Island(NamedTuple):
+    """
+    Self contained copy of a connection island.
+    """
+
+    # Position of the island within its partition.
+    index: int
+    # Data of each node.
+    data: Tuple[Any, ...]
+    # Connections of node i are the indices into `data` found at
+    # neighbours[offsets[i]:offsets[i + 1]].
+    offsets: array
+    neighbours: array
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of nodes plus connections; the cost of processing it.
+        """
+        return len(self.data) + len(self.neighbours) // 2
+
+    def to_network(self) -> NodeContainer:
+        """
+        Rebuilds the island as new, connected nodes.
+        """
+        nodes = list(map(Node, self.data))
+        lookup = nodes.__getitem__
+        offsets = self.offsets
+        neighbours = self.neighbours
+        for i, node in enumerate(nodes):
+            node.connections.update(
+                map(lookup, neighbours[offsets[i]:offsets[i + 1]])
+            )
+        return NodeContainer(nodes)
+
+
+class IslandResult(NamedTuple):
+    """
+    Result of processing a single island.
+    """
+
+    index: int
+    result: Any
+
+
+def partition(network: NodeContainer) -> List[List[Node]]:
+    """
+    Splits a network into its connection islands, in one pass.
+
+    As with `Node.get_connection_island`, connections are followed even
+    to nodes outside the network.
+    :param network:
+        Network to split.
+    :return:
+        Nodes of each island, in breadth first order. Islands are in the
+        order their first node appears in the network.
+    """
+    seen = set()
+    islands = []
+    for node in network.nodes:
+        if node in seen:
+            continue
+        seen.add(node)
+        island = [node]
+        # The island list doubles as the breadth first queue.
+        for n in island:
+            for c in n.connections:
+                if c not in seen:
+                    seen.add(c)
+                    island.append(c)
+        islands.append(island)
+    return islands
+
+
+def _serialise_island(
+        index: int,
+        nodes: List[Node],
+        positions: Dict[Node, int],
+) -> Island:
+    """
+    Serialises the nodes of an island.
+    :param positions:
+        Mapping the island's nodes are added to; may be shared between
+        islands, as islands don't overlap.
+    """
+    positions.update(zip(nodes, range(len(nodes))))
+    lookup = positions.__getitem__
+    offsets = array('I', [0])
+    neighbours = array('I')
+    for n in nodes:
+        neighbours.extend(map(lookup, n.connections))
+        offsets.append(len(neighbours))
+    return Island(index, tuple(n.data for n in nodes), offsets, neighbours)
+
+
+def serialise_islands(network: NodeContainer) -> List[Island]:
+    """
+    Splits a network into islands, as self contained subgraphs.
+    """
+    positions = {}
+    return [
+        _serialise_island(index, nodes, positions)
+        for index, nodes in enumerate(partition(network))
+    ]
+
+
+def _process_batch(
+        function: Callable[[NodeContainer], Any],
+        islands: List[Island],
+) -> List[IslandResult]:
+    return [
+        IslandResult(island.index, function(island.to_network()))
+        for island in islands
+    ]
+
+
+def iter_island_results(
+        function: Callable[[NodeContainer], Any],
+        network: NodeContainer,
+        max_workers: Optional[int] = None,
+        batch_size: int = 1024,
+) -> Iterator[IslandResult]:
+    """
+    Runs a function over every island of a network on a process pool.
+
+    Islands are scheduled largest first, so the longest tasks start
+    early rather than trailing at the end; small islands are batched
+    together to amortise the per task overhead.
+    :param function:
+        Picklable function taking an island, rebuilt as a network of new
+        nodes, and returning a picklable result.
+    :param network:
+        Network to split into islands.
+    :param max_workers:
+        Number of worker processes. Defaults to the number of CPUs.
+    :param batch_size:
+        Islands are batched until a batch holds this many nodes plus
+        connections.
+    :return:
+        Iterator of results, in the order they finish.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    islands = partition(network)
+    sizes = [
+        len(nodes) + sum(len(n.connections) for n in nodes) // 2
+        for nodes in islands
+    ]
+    order = sorted(range(len(islands)), key=sizes.__getitem__, reverse=True)
+
+    with ProcessPoolExecutor(max_workers) as executor:
+        # Each batch is serialised just before it is submitted, so that
+        # workers start on the largest islands while the rest are still
+        # being serialised.
+        futures = []
+        positions = {}
+        batch = []
+        total = 0
+        submit = executor.submit
+        for index in order:
+            batch.append(_serialise_island(index, islands[index], positions))
+            total += sizes[index]
+            if total >= batch_size:
+                futures.append(submit(_process_batch, function, batch))
+                batch = []
+                total = 0
+        if batch:
+            futures.append(submit(_process_batch, function, batch))
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def map_islands(
+        function: Callable[[NodeContainer], Any],
+        network: NodeContainer,
+        max_workers: Optional[int] = None,
+        batch_size: int = 1024,
+) -> List[Any]:
+    """
+    Runs a function over every island of a network on a process pool;
+    see `iter_island_results`.
+    :return:
+        Result of each island, in the order of `partition`.
+    """
+    results = {}
+    for index, result in iter_island_results(
+            function, network, max_workers, batch_size
+    ):
+        results[index] = result
+    return [results[i] for i in range(len(results))]
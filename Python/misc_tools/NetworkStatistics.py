@@ -0,0 +1,156 @@
+"""
+Degree statistics over `Network2` networks.
+
+Degrees count every connection of a node, as `connect_endings` does.
+k-cores only consider connections between nodes of the given network,
+and ignore connections from a node to itself.
+"""
+
+
+from collections import Counter
+from typing import *
+import heapq
+
+from .Network2 import Node, NodeContainer
+
+
+__all__ = (
+    'degree_histogram',
+    'top_hubs',
+    'core_numbers',
+    'k_core',
+    'degeneracy',
+)
+
+
+def _unique_nodes(network: NodeContainer) -> List[Node]:
+    """
+    Gets the nodes of a network, without duplicates, in order.
+    """
+    return list(dict.fromkeys(network.nodes))
+
+
+def degree_histogram(network: NodeContainer) -> Dict[int, int]:
+    """
+    Counts the nodes of each degree in a network.
+
+    Uses the network's degree index when it has one.
+    :param network:
+        Network to count the nodes of.
+    :return:
+        Number of nodes by degree, in ascending order of degree.
+    """
+    index = network._degree_index
+    if index is not None:
+        return index.histogram()
+    counts = Counter(len(n.connections) for n in _unique_nodes(network))
+    return {degree: counts[degree] for degree in sorted(counts)}
+
+
+def top_hubs(network: NodeContainer, k: int = 10) -> List[Tuple[Node, int]]:
+    """
+    Finds the nodes with the most connections.
+
+    Uses the network's degree index when it has one.
+    :param network:
+        Network to search.
+    :param k:
+        Number of hubs to find.
+    :return:
+        (node, degree) pairs, most connected first.
+    """
+    index = network._degree_index
+    if index is not None:
+        return [(n, index.degree(n)) for n in index.top(k)]
+    return heapq.nlargest(
+        k,
+        ((n, len(n.connections)) for n in _unique_nodes(network)),
+        key=lambda pair: pair[1],
+    )
+
+
+def core_numbers(network: NodeContainer) -> Dict[Node, int]:
+    """
+    Finds the core number of every node in a network; the largest k for
+    which the node belongs to the network's k-core.
+
+    Uses bucket queue peeling (Batagelj and Zaversnik), which is linear
+    in the number of nodes and connections: nodes are kept sorted by
+    degree in one array with the start of each degree's bucket tracked,
+    so removing the lowest degree node and decrementing each neighbour
+    is O(1) per connection.
+    :param network:
+        Network to decompose.
+    :return:
+        Core number of each node.
+    """
+    nodes = _unique_nodes(network)
+    positions = {n: i for i, n in enumerate(nodes)}
+    neighbours = [
+        [positions[c] for c in n.connections if c is not n and c in positions]
+        for n in nodes
+    ]
+    degrees = [len(ns) for ns in neighbours]
+    count = len(nodes)
+    if not count:
+        return {}
+
+    # Start index of each degree's bucket within `order`.
+    starts = [0] * (max(degrees) + 1)
+    for degree in degrees:
+        starts[degree] += 1
+    start = 0
+    for degree, size in enumerate(starts):
+        starts[degree] = start
+        start += size
+
+    # Nodes sorted by degree, and the position of each node in it.
+    order = [0] * count
+    position = [0] * count
+    for v, degree in enumerate(degrees):
+        position[v] = starts[degree]
+        order[position[v]] = v
+        starts[degree] += 1
+    for degree in range(len(starts) - 1, 0, -1):
+        starts[degree] = starts[degree - 1]
+    starts[0] = 0
+
+    for v in order:
+        degree_v = degrees[v]
+        for u in neighbours[v]:
+            degree_u = degrees[u]
+            if degree_u > degree_v:
+                # Swaps u with the first node of its bucket, then shrinks
+                # the bucket past it, moving u down one degree.
+                pu = position[u]
+                pw = starts[degree_u]
+                w = order[pw]
+                if u != w:
+                    position[u], position[w] = pw, pu
+                    order[pu], order[pw] = w, u
+                starts[degree_u] += 1
+                degrees[u] = degree_u - 1
+
+    return dict(zip(nodes, degrees))
+
+
+def k_core(network: NodeContainer, k: int) -> NodeContainer:
+    """
+    Gets the k-core of a network; the largest group of its nodes in
+    which every node connects to at least k others of the group.
+    :param network:
+        Network to search.
+    :param k:
+        Minimum number of connections within the core.
+    :return:
+        Network of the core's nodes, in their original order.
+    """
+    cores = core_numbers(network)
+    return NodeContainer(n for n, core in cores.items() if core >= k)
+
+
+def degeneracy(network: NodeContainer) -> int:
+    """
+    Gets the largest k for which a network has a non empty k-core.
+    """
+    return max(core_numbers(network).values(), default=0)
@@ -0,0 +1,315 @@
+"""
+Rotates 2D matrices by multiples of 90 degrees clockwise.
+
+Lists of rows can be rotated into new lists, or in place when square.
+Large 2D buffers can instead be viewed rotated without copying; NumPy
+arrays through NumPy's own strided views, and flat buffers (e.g. bytes,
+`array.array`) through `StridedView`.
+"""
+
+
+from typing import *
+import sys
+import time
+
+
+__all__ = (
+    'rotate_matrix',
+    'rotate',
+    'transpose',
+    'rotate_in_place',
+    'transpose_in_place',
+    'StridedView',
+    'strided_view',
+)
+
+
+def rotate_matrix(matrix):
+    return zip(*reversed(matrix))
+
+
+def _check_degrees(degrees: int) -> int:
+    """
+    Normalises a clockwise rotation to 0, 90, 180 or 270 degrees.
+    """
+    if degrees % 90:
+        raise ValueError('`degrees` must be a multiple of 90.')
+    return degrees % 360
+
+
+def rotate(matrix, degrees: int = 90):
+    """
+    Rotates a matrix clockwise.
+
+    NumPy arrays are returned as a rotated view of the same data.
+    :param matrix:
+        Sequence of rows, or a 2D NumPy array.
+    :param degrees:
+        Clockwise rotation; a multiple of 90.
+    :return:
+        Rotated matrix as a list of row tuples, or a NumPy view.
+    """
+    degrees = _check_degrees(degrees)
+    # An array can only have been made once NumPy was imported.
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(matrix, numpy.ndarray):
+        return numpy.rot90(matrix, -(degrees // 90))
+    if degrees == 90:
+        return list(zip(*reversed(matrix)))
+    if degrees == 180:
+        return [tuple(reversed(row)) for row in reversed(matrix)]
+    if degrees == 270:
+        return list(zip(*matrix))[::-1]
+    return [tuple(row) for row in matrix]
+
+
+def transpose(matrix):
+    """
+    Swaps the rows and columns of a matrix.
+
+    NumPy arrays are returned as a transposed view of the same data.
+    :param matrix:
+        Sequence of rows, or a 2D NumPy array.
+    :return:
+        Transposed matrix as a list of row tuples, or a NumPy view.
+    """
+    numpy = sys.modules.get('numpy')
+    if numpy is not None and isinstance(matrix, numpy.ndarray):
+        return matrix.T
+    return list(zip(*matrix))
+
+
+def rotate_in_place(matrix: List[List[Any]], degrees: int = 90):
+    """
+    Rotates a square matrix clockwise in place.
+
+    Quarter turns move elements one ring (layer) at a time, cycling four
+    elements per step, so no extra rows are allocated.
+    :param matrix:
+        Square list of row lists.
+    :param degrees:
+        Clockwise rotation; a multiple of 90.
+    :return:
+        The given matrix.
+    """
+    degrees = _check_degrees(degrees)
+    n = len(matrix)
+    if any(len(row) != n for row in matrix):
+        raise ValueError('Only square matrices can be rotated in place.')
+
+    if degrees == 180:
+        matrix.reverse()
+        for row in matrix:
+            row.reverse()
+        return matrix
+
+    for layer in range(n // 2):
+        first = layer
+        last = n - 1 - layer
+        for i in range(first, last):
+            offset = i - first
+            top = matrix[first][i]
+            if degrees == 90:
+                matrix[first][i] = matrix[last - offset][first]
+                matrix[last - offset][first] = matrix[last][last - offset]
+                matrix[last][last - offset] = matrix[i][last]
+                matrix[i][last] = top
+            elif degrees == 270:
+                matrix[first][i] = matrix[i][last]
+                matrix[i][last] = matrix[last][last - offset]
+                matrix[last][last - offset] = matrix[last - offset][first]
+                matrix[last - offset][first] = top
+    return matrix
+
+
+def transpose_in_place(matrix: List[List[Any]]):
+    """
+    Swaps the rows and columns of a square matrix in place.
+    :param matrix:
+        Square list of row lists.
+    :return:
+        The given matrix.
+    """
+    n = len(matrix)
+    if any(len(row) != n for row in matrix):
+        raise ValueError('Only square matrices can be transposed in place.')
+    for i in range(n):
+        row = matrix[i]
+        for j in range(i + 1, n):
+            row[j], matrix[j][i] = matrix[j][i], row[j]
+    return matrix
+
+
+class StridedView:
+    """
+    Zero copy 2D view over a flat, row major buffer.
+
+    Elements are addressed through an offset and a stride per axis, so
+    rotations and transposes only change those numbers. Rows are
+    returned as strided `memoryview` slices of the buffer.
+    """
+
+    __slots__ = 'buffer', 'shape', 'offset', 'strides'
+
+    def __init__(
+            self,
+            buffer,
+            shape: Tuple[int, int],
+            offset: int = 0,
+            strides: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        :param buffer:
+            One dimensional object supporting the buffer protocol, e.g.
+            bytes, bytearray or `array.array`.
+        :param shape:
+            (rows, columns) of the view.
+        :param offset:
+            Element index of the view's first element.
+        :param strides:
+            Element step between (rows, columns). Defaults to a row major
+            layout of `shape`.
+        """
+        self.buffer = memoryview(buffer)
+        if self.buffer.ndim != 1:
+            raise ValueError('`buffer` must be one dimensional.')
+        self.shape = shape
+        self.offset = offset
+        self.strides = (shape[1], 1) if strides is None else strides
+
+    def __repr__(self) -> str:
+        return f'StridedView(shape={self.shape}, strides={self.strides})'
+
+    def __getitem__(self, index: Tuple[int, int]):
+        i, j = index
+        row_stride, column_stride = self.strides
+        return self.buffer[self.offset + i * row_stride + j * column_stride]
+
+    def row(self, i: int) -> memoryview:
+        """
+        Gets a row of the view, as a strided slice of the buffer.
+        """
+        if not 0 <= i < self.shape[0]:
+            raise IndexError('Row index out of range.')
+        row_stride, column_stride = self.strides
+        start = self.offset + i * row_stride
+        stop = start + self.shape[1] * column_stride
+        return self.buffer[start:stop if stop >= 0 else None:column_stride]
+
+    def rows(self) -> Iterator[memoryview]:
+        return map(self.row, range(self.shape[0]))
+
+    def tolist(self) -> List[List[Any]]:
+        return [row.tolist() for row in self.rows()]
+
+    def rotate(self, degrees: int = 90) -> 'StridedView':
+        """
+        Gets a view of this view rotated clockwise.
+        :param degrees:
+            Clockwise rotation; a multiple of 90.
+        """
+        view = self
+        for _ in range(_check_degrees(degrees) // 90):
+            # out[i][j] = in[rows - 1 - j][i]
+            (rows, columns), (row_stride, column_stride) = (
+                view.shape, view.strides
+            )
+            view = StridedView(
+                view.buffer,
+                (columns, rows),
+                view.offset + (rows - 1) * row_stride,
+                (column_stride, -row_stride),
+            )
+        return view
+
+    def transpose(self) -> 'StridedView':
+        """
+        Gets a view of this view with rows and columns swapped.
+        """
+        return StridedView(
+            self.buffer, self.shape[::-1], self.offset, self.strides[::-1]
+        )
+
+
+def strided_view(
+        buffer,
+        shape: Tuple[int, int],
+        degrees: int = 90,
+) -> StridedView:
+    """
+    Views a flat, row major buffer as a clockwise rotated 2D matrix,
+    without copying it.
+    :param buffer:
+        Object supporting the buffer protocol.
+    :param shape:
+        (rows, columns) of the unrotated matrix.
+    :param degrees:
+        Clockwise rotation; a multiple of 90.
+    """
+    return StridedView(buffer, shape).rotate(degrees)
+
+
+def benchmark(size: int = 512, repeat: int = 3) -> Dict[str, float]:
+    """
+    Times a 90 degree rotation of a size x size matrix with each method.
+    :param size:
+        Number of rows and columns.
+    :param repeat:
+        Number of runs per method; the fastest is kept.
+    :return:
+        Seconds taken by each method.
+    """
+    from array import array
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+
+    matrix = [list(range(i * size, (i + 1) * size)) for i in range(size)]
+    flat = array('q', range(size * size))
+
+    methods = {
+        'rotate_matrix': lambda: list(rotate_matrix(matrix)),
+        'rotate': lambda: rotate(matrix),
+        'rotate_in_place': lambda: rotate_in_place(matrix),
+        'strided_view': lambda: strided_view(flat, (size, size)),
+        'strided_view.rows': lambda: list(
+            strided_view(flat, (size, size)).rows()
+        ),
+    }
+    if numpy is not None:
+        array_2d = numpy.arange(size * size).reshape(size, size)
+        methods['numpy view'] = lambda: rotate(array_2d)
+        methods['numpy copy'] = lambda: numpy.ascontiguousarray(
+            rotate(array_2d)
+        )
+
+    results = {}
+    for name, method in methods.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            method()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+if __name__ == '__main__':
+
+    from pprint import pprint
+
+    MATRIX = [
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9, 10, 11, 12],
+        [13, 14, 15, 16]
+    ]
+
+    pprint(
+        list(rotate_matrix(MATRIX)),
+        width=20
+    )
+
+    for name, seconds in benchmark().items():
+        print(f'{name:<20}{seconds * 1000:.3f}ms')
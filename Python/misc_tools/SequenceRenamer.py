@@ -0,0 +1,283 @@
+"""
+Renames numbered file sequences (e.g. image frames) using padding
+templates from `DynamicPadding`.
+
+Every rename is planned up front from a single directory listing. The
+plan is checked for collisions and ordered so that shifting a sequence
+onto itself (e.g. 0001..N by +1) never overwrites a frame; cycles are
+broken with a temporary name. Executing the plan costs one rename per
+file, and is recorded in a journal so that it can be undone.
+"""
+
+
+from typing import *
+import json
+import os
+
+from .DynamicPadding import PaddingTemplate
+
+
+__all__ = (
+    'RenameStep',
+    'match_sequence',
+    'plan_sequence_rename',
+    'execute_rename_plan',
+    'undo_rename_journal',
+    'rename_sequence',
+)
+
+
+class RenameStep(NamedTuple):
+    """
+    Single rename within a plan.
+    """
+
+    source: AnyStr
+    destination: AnyStr
+
+
+def match_sequence(
+        directory: AnyStr,
+        template: Union[str, PaddingTemplate],
+) -> List[Tuple[int, str]]:
+    """
+    Finds the files in a directory that belong to a sequence.
+    :param directory:
+        Directory to search.
+    :param template:
+        Padding template file names are matched against; e.g.
+        "beauty.####.exr".
+    :return:
+        (index, file name) pairs, sorted by index.
+    """
+    return _scan_sequence(directory, template)[0]
+
+
+def _scan_sequence(
+        directory: AnyStr,
+        template: Union[str, PaddingTemplate],
+) -> Tuple[List[Tuple[int, str]], Set[str]]:
+    """
+    Lists a directory once, picking out the files of a sequence.
+    :return:
+        (index, file name) pairs sorted by index, and the names of all
+        entries in the directory.
+    """
+    if not isinstance(template, PaddingTemplate):
+        template = PaddingTemplate(template)
+
+    result = []
+    names = set()
+    with os.scandir(directory) as it:
+        for entry in it:
+            names.add(entry.name)
+            index = template.match(entry.name)
+            if index is not None:
+                result.append((index, entry.name))
+    result.sort()
+    return result, names
+
+
+def _order_renames(
+        renames: Dict[str, str],
+        directory: AnyStr,
+        taken: Collection[str] = (),
+) -> List[RenameStep]:
+    """
+    Orders renames within a directory so that no step overwrites a file
+    that has yet to be moved.
+
+    Each file can only be moved once its destination has been vacated;
+    chains are therefore executed from their far end, and cycles are
+    broken by first moving one file to a temporary name.
+    :param renames:
+        Mapping of source file names to destination file names.
+    :param taken:
+        Names already present in the directory, which temporary names
+        must avoid.
+    :return:
+        Ordered rename steps, as full paths.
+    """
+    pending = dict(renames)
+    # Maps each destination back to the source that is waiting on it.
+    waiting = {
+        destination: source for source, destination in pending.items()
+    }
+    ready = [
+        source for source, destination in pending.items()
+        if destination not in pending
+    ]
+
+    # Temporary names must not collide with any file, present or planned.
+    used = set(taken).union(renames, renames.values())
+    steps = []
+    temp_count = 0
+    while pending:
+        if not ready:
+            # Only cycles remain; parks one file on a temporary name. The
+            # parked file is released once its destination is vacated.
+            source = next(iter(pending))
+            temp = source
+            while temp in used:
+                temp_count += 1
+                temp = f'.rename-{temp_count}-{source}'
+            used.add(temp)
+            steps.append((source, temp))
+            destination = pending.pop(source)
+            pending[temp] = destination
+            waiting[destination] = temp
+            freed = source
+        else:
+            source = ready.pop()
+            if source not in pending:
+                # Queued more than once; already moved.
+                continue
+            destination = pending.pop(source)
+            steps.append((source, destination))
+            freed = source
+            del waiting[destination]
+
+        # The move into the vacated name can now go ahead.
+        blocked = waiting.get(freed)
+        if blocked is not None and blocked in pending:
+            ready.append(blocked)
+
+    return [
+        RenameStep(
+            os.path.join(directory, source),
+            os.path.join(directory, destination),
+        )
+        for source, destination in steps
+    ]
+
+
+def plan_sequence_rename(
+        directory: AnyStr,
+        template: str,
+        new_template: Optional[str] = None,
+        offset: int = 0,
+        start: Optional[int] = None,
+) -> List[RenameStep]:
+    """
+    Plans renaming a file sequence, without touching any files.
+    :param directory:
+        Directory containing the sequence.
+    :param template:
+        Padding template of the existing file names.
+    :param new_template:
+        Padding template of the new file names. Uses `template` if not
+        given.
+    :param offset:
+        Amount added to each index.
+    :param start:
+        If given, renumbers the sequence contiguously from this index
+        (in index order) before `offset` is applied.
+    :return:
+        Ordered rename steps. Files that keep their name are left out.
+    :raises FileExistsError:
+        If a destination is already taken by a file outside of the
+        sequence, or two files would be renamed to the same name.
+    """
+    new_template = PaddingTemplate(
+        template if new_template is None else new_template
+    )
+    frames, names = _scan_sequence(directory, template)
+
+    renames = {}
+    for position, (index, name) in enumerate(frames):
+        if start is not None:
+            index = start + position
+        renames[name] = new_template.render(index + offset)
+
+    # Checks for collisions against each other, and the directory.
+    destinations = {}
+    for source, destination in renames.items():
+        other = destinations.setdefault(destination, source)
+        if other != source:
+            raise FileExistsError(
+                f'Both {other!r} and {source!r} would be renamed to '
+                f'{destination!r}.'
+            )
+    existing = names.difference(renames)
+    taken = existing.intersection(destinations)
+    if taken:
+        raise FileExistsError(
+            f'Destinations already exist: {", ".join(sorted(taken))}'
+        )
+
+    renames = {
+        source: destination
+        for source, destination in renames.items()
+        if source != destination
+    }
+    return _order_renames(renames, directory, names)
+
+
+def execute_rename_plan(
+        steps: Sequence[RenameStep],
+        journal_path: Optional[AnyStr] = None,
+):
+    """
+    Executes rename steps in order.
+    :param steps:
+        Ordered rename steps, as made by `plan_sequence_rename`.
+    :param journal_path:
+        File the plan is written to before anything is renamed, so that
+        it can later be reverted with `undo_rename_journal`.
+    """
+    if journal_path is not None:
+        with open(journal_path, 'w') as f:
+            json.dump([list(step) for step in steps], f)
+
+    rename = os.rename
+    for source, destination in steps:
+        rename(source, destination)
+
+
+def undo_rename_journal(journal_path: AnyStr) -> List[RenameStep]:
+    """
+    Reverts the renames recorded in a journal.
+
+    Steps are undone in reverse order. Steps that never ran (e.g. after
+    an interruption) are skipped.
+    :param journal_path:
+        Journal written by `execute_rename_plan`.
+    :return:
+        Rename steps that were performed to revert the plan.
+    """
+    with open(journal_path) as f:
+        steps = [RenameStep(*step) for step in json.load(f)]
+
+    undone = []
+    for source, destination in reversed(steps):
+        if os.path.lexists(destination) and not os.path.lexists(source):
+            os.rename(destination, source)
+            undone.append(RenameStep(destination, source))
+    return undone
+
+
+def rename_sequence(
+        directory: AnyStr,
+        template: str,
+        new_template: Optional[str] = None,
+        offset: int = 0,
+        start: Optional[int] = None,
+        dry_run: bool = False,
+        journal_path: Optional[AnyStr] = None,
+) -> List[RenameStep]:
+    """
+    Renames a file sequence; see `plan_sequence_rename` for arguments.
+    :param dry_run:
+        If True, only plans the renames.
+    :param journal_path:
+        File to record the renames in, for `undo_rename_journal`.
+    :return:
+        Ordered rename steps that were (or, for a dry run, would be)
+        performed.
+    """
+    steps = plan_sequence_rename(
+        directory, template, new_template, offset, start
+    )
+    if not dry_run:
+        execute_rename_plan(steps, journal_path)
+    return steps
@@ -0,0 +1,31 @@
+"""
+Tests the difference in compute time between comparing str and int
+"""
+
+
+from .Benchmark import measure
+
+
+def a():
+    return 'thing' == 'thing'
+
+def b():
+    return 1 == 1
+
+
+bench_str_comparison = a
+bench_int_comparison = b
+
+
+def main():
+    for name, function in (('str', a), ('int', b)):
+        result = measure(name, function)
+        print(
+            f'{name}: {result.median * 1e9:.2f}ns '
+            f'(IQR {result.iqr * 1e9:.2f}ns, '
+            f'{result.ops_per_second:,.0f} ops/s)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Assorted file, media and game server tools.
+
+Submodules are imported on first access (e.g. `misc_tools.FilePath`),
+so importing the package costs next to nothing. Optional dependencies
+(eyed3, numpy) are only imported by the functions that need them. The
+`misc` command line entry point lives in `misc_tools.cli`.
+"""
+
+
+import importlib
+
+
+__all__ = (
+    'Benchmark',
+    'ConvertToDiscordEmojis',
+    'CopyFilesByExtension',
+    'DynamicChaos',
+    'DynamicPadding',
+    'FilePath',
+    'FileSystemTools',
+    'FirstNonRecuring',
+    'KF2CustomEntries',
+    'KF2ServerManager',
+    'MakeJSONReadable',
+    'Network',
+    'Network2',
+    'NetworkPartition',
+    'NetworkStatistics',
+    'RotateMatrix',
+    'SequenceRenamer',
+    'cli',
+    'mp3Index',
+    'mp3Tools',
+)
+
+
+def __getattr__(name):
+    """
+    Imports submodules on first access.
+    """
+    if name in __all__:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
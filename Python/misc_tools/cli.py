@@ -0,0 +1,216 @@
+"""
+The `misc` command; a single command line entry point for the tools in
+this package.
+
+Each subcommand is implemented by the `main` function of one module,
+which is only imported once that subcommand runs; starting the command
+line costs little more than starting the interpreter.
+
+This module deliberately avoids importing `typing`, `argparse` and
+`subprocess` at the top level, as together they would cost more than
+the rest of its startup.
+"""
+
+
+import importlib
+import os
+import sys
+
+
+__all__ = (
+    'COMMANDS',
+    'STARTUP_BUDGETS',
+    'measure_import_time',
+    'check_startup',
+    'main',
+)
+
+
+# Subcommands, as (module within this package, description). The
+# module's `main` is given the remaining command line arguments.
+COMMANDS = {
+    'copy': (
+        'FileSystemTools',
+        'Copies a directory tree, optionally masked by extension.',
+    ),
+    'sync': (
+        'KF2ServerManager',
+        'Syncs the custom map entries of many KF2 servers.',
+    ),
+    'json-format': (
+        'MakeJSONReadable',
+        'Reformats JSON files, in place or to a new file.',
+    ),
+    'kf2-maps': (
+        'KF2CustomEntries',
+        'Rebuilds the custom map entries of a KFGame.ini file.',
+    ),
+    'tag': (
+        'mp3Tools',
+        'Tags .mp3 files in bulk (requires eyed3).',
+    ),
+    'pad': (
+        'DynamicPadding',
+        'Renders padded sequence names from a template.',
+    ),
+    'emoji': (
+        'ConvertToDiscordEmojis',
+        'Converts text to Discord emojis, and back.',
+    ),
+}
+
+# Largest allowed import time of each module, in milliseconds, as
+# measured by `measure_import_time`. Budgets leave roughly twice the
+# headroom of the times measured when they were set, so that they only
+# trip when a heavy import creeps back into a module's top level.
+STARTUP_BUDGETS = {
+    'misc_tools': 5,
+    'misc_tools.cli': 10,
+    'misc_tools.ConvertToDiscordEmojis': 30,
+    'misc_tools.DynamicChaos': 30,
+    'misc_tools.DynamicPadding': 25,
+    'misc_tools.FileSystemTools': 30,
+    'misc_tools.KF2CustomEntries': 25,
+    'misc_tools.KF2ServerManager': 35,
+    'misc_tools.MakeJSONReadable': 35,
+    'misc_tools.Network2': 25,
+    'misc_tools.NetworkPartition': 30,
+    'misc_tools.RotateMatrix': 25,
+    'misc_tools.mp3Tools': 35,
+}
+
+
+def measure_import_time(module: str, repeat: int = 5) -> float:
+    """
+    Measures the time taken to import a module in a fresh interpreter,
+    using `python -X importtime`.
+    :param module:
+        Full name of the module to import.
+    :param repeat:
+        Number of interpreters started; the fastest import is kept.
+    :return:
+        Cumulative import time of the module, in milliseconds.
+    """
+    import subprocess
+
+    # Runs from the directory holding this package, so that it imports
+    # the same copy of the package as this process.
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Lines read "import time: <self us> | <cumulative us> | <name>",
+    # with the name indented by its import depth.
+    target = ' ' + module
+    best = float('inf')
+    for _ in range(repeat):
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=directory, capture_output=True, text=True, check=True,
+        )
+        for line in process.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2] == target:
+                best = min(best, int(fields[1]) / 1000)
+                break
+        else:
+            raise ValueError(f'No import time was reported for {module!r}.')
+    return best
+
+
+def check_startup(budgets: dict = None, repeat: int = 5) -> list:
+    """
+    Measures the import time of each module with a startup budget.
+    :param budgets:
+        Budget of each module, in milliseconds. Uses `STARTUP_BUDGETS`
+        if not given.
+    :param repeat:
+        Number of measurements per module; see `measure_import_time`.
+    :return:
+        (module, milliseconds, budget) for each module, in the order of
+        `budgets`.
+    """
+    if budgets is None:
+        budgets = STARTUP_BUDGETS
+    return [
+        (module, measure_import_time(module, repeat), budget)
+        for module, budget in budgets.items()
+    ]
+
+
+def _startup_main(argv):
+    """
+    Entry point of the "startup" subcommand.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='misc startup',
+        description='Checks the import time of each tool module against '
+                    'its startup budget.',
+    )
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='Number of measurements per module; the fastest is kept.',
+    )
+    args = parser.parse_args(argv)
+
+    status = 0
+    for module, milliseconds, budget in check_startup(repeat=args.repeat):
+        over = milliseconds > budget
+        status |= over
+        print(
+            f'{module:<40}{milliseconds:>8.1f}ms / {budget}ms'
+            f'{"  OVER BUDGET" if over else ""}'
+        )
+    return status
+
+
+def _build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='misc',
+        description=__doc__.strip().split('\n\n')[0],
+        epilog='Run "misc <command> --help" for the options of a command.',
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    for name, (_, description) in COMMANDS.items():
+        subparsers.add_parser(name, help=description, add_help=False)
+    subparsers.add_parser(
+        'startup', add_help=False,
+        help='Checks module import times against their startup budgets.',
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    :return:
+        Exit status of the subcommand.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+        if argv:
+            # Names the subcommand in its usage messages.
+            sys.argv[0] = f'misc {argv[0]}'
+    argv = list(argv)
+
+    # Subcommands are dispatched without building the top level parser,
+    # so only the subcommand's own module is imported.
+    if argv and argv[0] in COMMANDS:
+        module = importlib.import_module(
+            f'.{COMMANDS[argv[0]][0]}', __package__
+        )
+        return module.main(argv[1:]) or 0
+    if argv and argv[0] == 'startup':
+        return _startup_main(argv[1:])
+
+    parser = _build_parser()
+    parser.parse_args(argv)
+    parser.print_help()
+    return 2 if argv else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,260 @@
+"""
+Persistent index of the tags in an .mp3 library.
+
+Parsed tag fields are kept in an sqlite database in the library root,
+keyed by path along with each file's size and mtime. Refreshing only
+re-parses files that were added or changed since the last refresh, so
+queries over large libraries don't need to open any audio files.
+"""
+
+
+from typing import *
+import os
+import sqlite3
+
+
+__all__ = (
+    'FIELDS',
+    'RefreshStats',
+    'read_tag_fields',
+    'Mp3Index',
+)
+
+
+# Default file name of the index database, created in the library root.
+INDEX_FILE_NAME = '.mp3index.sqlite'
+
+# Tag fields stored in the index.
+FIELDS = (
+    'title',
+    'artist',
+    'album',
+    'album_artist',
+    'genre',
+    'track_num',
+    'track_total',
+)
+
+# Number of changed files needed before parsing is spread across a
+# process pool; below this the pool's start up cost isn't worth it.
+_PARALLEL_THRESHOLD = 64
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tracks (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    title TEXT,
+    artist TEXT,
+    album TEXT,
+    album_artist TEXT,
+    genre TEXT,
+    track_num INTEGER,
+    track_total INTEGER,
+    error TEXT
+)
+'''
+
+
+class RefreshStats(NamedTuple):
+    """
+    Number of files in each state after an index refresh.
+    """
+
+    added: int
+    updated: int
+    removed: int
+    unchanged: int
+
+
+def read_tag_fields(file_path: AnyStr) -> Tuple[Optional[Any], ...]:
+    """
+    Parses the indexed tag fields from a file.
+    :param file_path:
+        Path to the .mp3 file.
+    :return:
+        Values for each of `FIELDS`, followed by an error message (None
+        if the file parsed).
+    """
+    import eyed3
+
+    try:
+        audio_file = eyed3.load(file_path)
+    except (OSError, ValueError, eyed3.Error) as e:
+        return (None,) * len(FIELDS) + (f'{e.__class__.__name__}: {e}',)
+    tag = audio_file and audio_file.tag
+    if tag is None:
+        return (None,) * len(FIELDS) + (None,)
+
+    track_num, track_total = tag.track_num or (None, None)
+    return (
+        tag.title,
+        tag.artist,
+        tag.album,
+        tag.album_artist,
+        tag.genre.name if tag.genre is not None else None,
+        track_num,
+        track_total,
+        None,
+    )
+
+
+def _iter_mp3_stats(root: AnyStr) -> Iterator[Tuple[AnyStr, int, int]]:
+    """
+    Recursively finds .mp3 files, along with their size and mtime.
+    """
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    pending.append(entry.path)
+                elif (
+                        entry.is_file()
+                        and entry.name.casefold().endswith('.mp3')
+                ):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime_ns
+
+
+class Mp3Index:
+    """
+    Tag index for the .mp3 files under a library root.
+    """
+
+    root: AnyStr = None
+    connection: sqlite3.Connection = None
+
+    def __init__(self, root: AnyStr, db_path: Optional[AnyStr] = None):
+        """
+        :param root:
+            Library root directory.
+        :param db_path:
+            Path to the index database. Defaults to a file in `root`.
+        """
+        self.root = root
+        if db_path is None:
+            db_path = os.path.join(root, INDEX_FILE_NAME)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'Mp3Index':
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def refresh(self, max_workers: Optional[int] = None) -> RefreshStats:
+        """
+        Brings the index up to date with the files on disk.
+
+        Only files whose size or mtime changed are parsed; removed files
+        are dropped from the index.
+        :param max_workers:
+            Number of worker processes used when many files changed.
+        :return:
+            Counts of added, updated, removed and unchanged files.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        known = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self.connection.execute(
+                'SELECT path, size, mtime_ns FROM tracks'
+            )
+        }
+
+        changed = []
+        added = 0
+        unchanged = 0
+        for path, size, mtime_ns in _iter_mp3_stats(self.root):
+            previous = known.pop(path, None)
+            if previous == (size, mtime_ns):
+                unchanged += 1
+                continue
+            if previous is None:
+                added += 1
+            changed.append((path, size, mtime_ns))
+
+        paths = [path for path, _, _ in changed]
+        if len(paths) < _PARALLEL_THRESHOLD:
+            rows = list(map(read_tag_fields, paths))
+        else:
+            with ProcessPoolExecutor(max_workers) as executor:
+                rows = list(executor.map(
+                    read_tag_fields, paths, chunksize=16
+                ))
+
+        columns = ('path', 'size', 'mtime_ns') + FIELDS + ('error',)
+        insert = (
+            f'INSERT OR REPLACE INTO tracks ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})'
+        )
+        with self.connection:
+            self.connection.executemany(insert, (
+                stat + row for stat, row in zip(changed, rows)
+            ))
+            self.connection.executemany(
+                'DELETE FROM tracks WHERE path = ?',
+                ((path,) for path in known),
+            )
+
+        return RefreshStats(
+            added, len(changed) - added, len(known), unchanged
+        )
+
+    def query(
+            self,
+            where: str = '1',
+            parameters: Sequence[Any] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Gets indexed tracks matching an SQL condition.
+        :param where:
+            SQL condition over the track columns, with "?" placeholders.
+        :param parameters:
+            Values for the placeholders in `where`.
+        :return:
+            Matching tracks as dicts of column values, ordered by path.
+        """
+        cursor = self.connection.execute(
+            f'SELECT * FROM tracks WHERE {where} ORDER BY path', parameters
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def find(self, **criteria: Any) -> List[AnyStr]:
+        """
+        Gets the paths of tracks whose fields equal the given values.
+
+        A value of None matches tracks missing that field.
+        :param criteria:
+            Field names and their values.
+        :return:
+            Matching paths, ordered by path.
+        """
+        unknown = set(criteria).difference(FIELDS)
+        if unknown:
+            raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+        conditions = [f'{field} IS ?' for field in criteria]
+        cursor = self.connection.execute(
+            'SELECT path FROM tracks WHERE '
+            + (' AND '.join(conditions) or '1')
+            + ' ORDER BY path',
+            tuple(criteria.values()),
+        )
+        return [path for path, in cursor]
+
+    def missing(self, field: str) -> List[AnyStr]:
+        """
+        Gets the paths of tracks without a value for the given field;
+        e.g. `missing('track_num')`.
+        :param field:
+            One of `FIELDS`.
+        :return:
+            Matching paths, ordered by path.
+        """
+        return self.find(**{field: None})
@@ -0,0 +1,440 @@
+
+import re
+import os
+import shutil
+import tempfile
+import time
+from typing import (
+    Any, AnyStr, Dict, Iterable, List, NamedTuple, Optional, Sequence,
+    TYPE_CHECKING, Tuple, Union,
+)
+
+# eyed3 is an optional dependency, only imported by the functions that
+# load audio files.
+if TYPE_CHECKING:
+    import eyed3
+
+
+__all__ = (
+    'add_track_number_to_file',
+    'add_title_from_file_name',
+    'SaveResult',
+    'save_tag',
+    'TagRules',
+    'TagResult',
+    'iter_mp3_files',
+    'plan_tag_edits',
+    'apply_tag_edits',
+    'tag_files',
+)
+
+
+def add_track_number_to_file(file_path: AnyStr, track_num: int = 0):
+    """
+    Adds track number metadata to the given file.
+    :param file_path:
+        Target directory.
+    :param track_num:
+        Track number to insert into the metadata.
+    """
+    import eyed3
+
+    mp3_file = eyed3.load(file_path)
+    mp3_file.tag.track_num = track_num
+    mp3_file.tag.save()
+
+
+def add_title_from_file_name(file_path: AnyStr, pattern: AnyStr):
+    """
+    Uses the .mp3's file name to set it's title tag.
+    :param file_path:
+        Path to the target .mp3 file.
+    :param pattern:
+        Regex pattern used to match the title of the track from the
+        file name.
+    """
+    import eyed3
+
+    _, file_name = os.path.split(file_path)
+    name, _ = os.path.splitext(file_name)
+    track = re.search(pattern, name).group(0)
+    audio_file = eyed3.load(file_path)
+    audio_file.tag.title = track
+    audio_file.tag.save()
+
+
+# Padding reserved after a tag whenever the whole file has to be
+# rewritten, so that later edits can be made in place.
+DEFAULT_RESERVE_PADDING = 8 * 1024
+
+
+class SaveResult(NamedTuple):
+    """
+    Outcome of saving a tag with `save_tag`.
+    """
+
+    file_path: AnyStr
+    bytes_written: int
+    in_place: bool
+
+
+def _read_syncsafe(data: bytes) -> int:
+    """
+    Decodes a 4 byte ID3v2 syncsafe integer.
+    """
+    return data[0] << 21 | data[1] << 14 | data[2] << 7 | data[3]
+
+
+def _write_syncsafe(value: int) -> bytes:
+    """
+    Encodes a 4 byte ID3v2 syncsafe integer.
+    """
+    return bytes((
+        value >> 21 & 0x7f, value >> 14 & 0x7f, value >> 7 & 0x7f, value & 0x7f
+    ))
+
+
+def _read_id3v2_size(file_path: AnyStr) -> int:
+    """
+    Gets the number of bytes the ID3v2 tag takes up at the start of the
+    given file, including its header, padding and footer.
+    :return:
+        Size of the tag region, or 0 if the file has no ID3v2 tag.
+    """
+    with open(file_path, 'rb') as f:
+        header = f.read(10)
+    if len(header) < 10 or header[:3] != b'ID3':
+        return 0
+    footer = 10 if header[5] & 0x10 else 0
+    return 10 + _read_syncsafe(header[6:10]) + footer
+
+
+def _add_padding(region: bytes, padding: int) -> bytes:
+    """
+    Appends padding to a rendered ID3v2 tag, updating its header size.
+
+    Tags with a footer can't have padding, so are returned unchanged.
+    """
+    if region[5] & 0x10 or not padding:
+        return region
+    size = _read_syncsafe(region[6:10]) + padding
+    return region[:6] + _write_syncsafe(size) + region[10:] + bytes(padding)
+
+
+def _write_at(file_path: AnyStr, offset: int, data: bytes):
+    """
+    Overwrites bytes of a file in place, without truncating it.
+    """
+    fd = os.open(file_path, os.O_WRONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        if hasattr(os, 'pwrite'):
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            with open(fd, 'wb', closefd=False) as f:
+                f.write(data)
+    finally:
+        os.close(fd)
+
+
+def save_tag(
+        audio_file: 'eyed3.core.AudioFile',
+        reserve_padding: int = DEFAULT_RESERVE_PADDING,
+) -> SaveResult:
+    """
+    Saves an audio file's ID3v2 tag, touching as little of the file as
+    possible.
+
+    The tag is rendered into a scratch copy of the file's current tag
+    region. If it still fits, only the bytes that changed are written
+    back in place. Otherwise the file is streamed into a temp file behind
+    the new tag, with `reserve_padding` bytes of padding so that later
+    edits fit, and the temp file replaces the original.
+
+    ID3v1 tags live at the end of the file, so are saved as normal.
+    :param audio_file:
+        Loaded audio file, as returned by `eyed3.load`.
+    :param reserve_padding:
+        Padding added to the tag when the file has to be rewritten.
+    :return:
+        Number of bytes written, and whether the tag was saved in place.
+    """
+    tag = audio_file.tag
+    file_path = audio_file.path
+    if not tag.isV2():
+        tag.save()
+        return SaveResult(file_path, 128, True)
+
+    old_size = _read_id3v2_size(file_path)
+    with open(file_path, 'rb') as f:
+        old_region = f.read(old_size)
+
+    # Renders the tag by having eyed3 save into a file holding only the
+    # current tag region; so the scratch file ends up holding exactly
+    # the new tag region.
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, scratch_path = tempfile.mkstemp('.id3', '', directory)
+    file_info = tag.file_info
+    try:
+        with open(fd, 'wb') as f:
+            f.write(old_region)
+        tag.save(scratch_path)
+        with open(scratch_path, 'rb') as f:
+            region = f.read()
+    finally:
+        tag.file_info = file_info
+        os.remove(scratch_path)
+
+    if len(region) == old_size:
+        # Narrows the write down to the span of bytes that changed.
+        start = 0
+        while start < old_size and region[start] == old_region[start]:
+            start += 1
+        end = old_size
+        while end > start and region[end - 1] == old_region[end - 1]:
+            end -= 1
+        if end > start:
+            _write_at(file_path, start, region[start:end])
+        return SaveResult(file_path, end - start, True)
+
+    region = _add_padding(region, reserve_padding)
+    fd, temp_path = tempfile.mkstemp('.tmp', '', directory)
+    try:
+        with open(fd, 'wb') as f1, open(file_path, 'rb') as f2:
+            f1.write(region)
+            f2.seek(old_size)
+            shutil.copyfileobj(f2, f1, 1024 * 1024)
+            written = f1.tell()
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return SaveResult(file_path, written, False)
+
+
+class TagRules(NamedTuple):
+    """
+    Tag edits to apply to a batch of files.
+
+    Fields left as None are not touched.
+    """
+
+    # Regex pattern used to match the title from each file name.
+    title_pattern: Optional[AnyStr] = None
+    # Whether tracks are numbered by their sort order, from `track_start`.
+    number_tracks: bool = False
+    track_start: int = 1
+    # Fixed values given to every file.
+    artist: Optional[str] = None
+    album: Optional[str] = None
+    album_artist: Optional[str] = None
+    genre: Optional[str] = None
+
+
+class TagResult(NamedTuple):
+    """
+    Outcome of tagging a single file in a batch.
+    """
+
+    file_path: AnyStr
+    fields: Tuple[str, ...]
+    seconds: float
+    error: Optional[str] = None
+    bytes_written: int = 0
+
+
+def iter_mp3_files(paths: Union[AnyStr, Iterable[AnyStr]]) -> List[AnyStr]:
+    """
+    Gathers .mp3 files from a directory, or a list of paths.
+    :param paths:
+        Directory to search (not recursively), or an iterable of file
+        paths and directories.
+    :return:
+        .mp3 file paths, sorted by name within each directory.
+    """
+    if isinstance(paths, (str, bytes)):
+        paths = [paths]
+
+    result = []
+    for path in paths:
+        if os.path.isdir(path):
+            result.extend(sorted(
+                entry.path
+                for entry in os.scandir(path)
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].casefold() == '.mp3'
+            ))
+        else:
+            result.append(path)
+    return result
+
+
+def plan_tag_edits(
+        file_paths: Sequence[AnyStr],
+        rules: TagRules,
+) -> List[Tuple[AnyStr, Dict[str, Any]]]:
+    """
+    Works out every tag edit for each file up front.
+
+    The title pattern is compiled once for the whole batch. Files whose
+    name does not match the pattern are left without a title edit.
+    :param file_paths:
+        Files to tag, in track order.
+    :param rules:
+        Tag edits to apply.
+    :return:
+        (file path, {tag attribute: value}) pairs.
+    """
+    re_title = (
+        re.compile(rules.title_pattern)
+        if rules.title_pattern is not None else
+        None
+    )
+    fixed = {
+        field: value
+        for field, value in (
+            ('artist', rules.artist),
+            ('album', rules.album),
+            ('album_artist', rules.album_artist),
+            ('genre', rules.genre),
+        )
+        if value is not None
+    }
+
+    plan = []
+    for index, file_path in enumerate(file_paths):
+        edits = dict(fixed)
+        if re_title is not None:
+            _, file_name = os.path.split(file_path)
+            name, _ = os.path.splitext(file_name)
+            match = re_title.search(name)
+            if match is not None:
+                edits['title'] = match.group(0)
+        if rules.number_tracks:
+            edits['track_num'] = rules.track_start + index
+        plan.append((file_path, edits))
+    return plan
+
+
+def apply_tag_edits(file_path: AnyStr, edits: Dict[str, Any]) -> TagResult:
+    """
+    Applies all the given tag edits with a single load and save.
+
+    The tag is saved with `save_tag`, so is edited in place when it fits.
+    :param file_path:
+        Path to the target .mp3 file.
+    :param edits:
+        Mapping of tag attribute names to their new values.
+    :return:
+        Edited fields, the time taken, and the number of bytes written.
+    """
+    import eyed3
+
+    start = time.perf_counter()
+    bytes_written = 0
+    try:
+        audio_file = eyed3.load(file_path)
+        if audio_file is None:
+            raise ValueError('Not a recognised audio file.')
+        if audio_file.tag is None:
+            audio_file.initTag()
+        for field, value in edits.items():
+            setattr(audio_file.tag, field, value)
+        bytes_written = save_tag(audio_file).bytes_written
+        error = None
+    except (OSError, ValueError, eyed3.Error) as e:
+        error = f'{e.__class__.__name__}: {e}'
+    return TagResult(
+        file_path, tuple(edits), time.perf_counter() - start, error,
+        bytes_written,
+    )
+
+
+def tag_files(
+        paths: Union[AnyStr, Iterable[AnyStr]],
+        rules: TagRules,
+        max_workers: Optional[int] = None,
+) -> List[TagResult]:
+    """
+    Tags a batch of files, spread across a process pool.
+
+    Edits are planned up front, so each file is loaded and saved exactly
+    once. A failure on one file is reported in its result rather than
+    stopping the batch.
+    :param paths:
+        Directory, or iterable of file paths and directories.
+    :param rules:
+        Tag edits to apply.
+    :param max_workers:
+        Number of worker processes. Defaults to the number of CPUs.
+    :return:
+        One result per file, in track order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    plan = plan_tag_edits(iter_mp3_files(paths), rules)
+    if not plan:
+        return []
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(plan) // (workers * 4))
+    with ProcessPoolExecutor(max_workers) as executor:
+        return list(executor.map(
+            apply_tag_edits, *zip(*plan), chunksize=chunksize
+        ))
+
+
+def main(argv: Optional[Sequence[AnyStr]] = None) -> int:
+    """
+    Command line entry point.
+    :param argv:
+        Command line arguments; uses `sys.argv` if not given.
+    :return:
+        Exit status; 1 if any file failed.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tags .mp3 files in bulk.')
+    parser.add_argument(
+        'paths', nargs='+', help='.mp3 files, or directories of them.',
+    )
+    parser.add_argument(
+        '-t', '--title-pattern',
+        help='Regex pattern matching the title from each file name.',
+    )
+    parser.add_argument(
+        '-n', '--number-tracks', action='store_true',
+        help='Numbers tracks in file name order.',
+    )
+    parser.add_argument(
+        '--track-start', type=int, default=1,
+        help='Track number given to the first file.',
+    )
+    for field in ('artist', 'album', 'album-artist', 'genre'):
+        parser.add_argument(f'--{field}')
+    parser.add_argument(
+        '-j', '--workers', type=int,
+        help='Number of worker processes. Defaults to the number of CPUs.',
+    )
+    args = parser.parse_args(argv)
+
+    rules = TagRules(
+        args.title_pattern, args.number_tracks, args.track_start,
+        args.artist, args.album, args.album_artist, args.genre,
+    )
+    status = 0
+    for result in tag_files(args.paths, rules, args.workers):
+        if result.error is not None:
+            status = 1
+            print(f'{result.file_path}: {result.error}')
+        else:
+            print(f'{result.file_path}: {", ".join(result.fields)}')
+    return status
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,141 @@
+"""
+Tests for `misc_tools.Benchmark`, with synthetic timings.
+"""
+
+
+import statistics
+
+import pytest
+
+from misc_tools import Benchmark
+from misc_tools.Benchmark import (
+    BenchmarkResult,
+    calibrate,
+    discover,
+    find_regressions,
+    load_results,
+    measure,
+    save_results,
+)
+
+
+def _result(name, median, iqr=0.0):
+    return BenchmarkResult(name, 1000, 7, median, iqr, 1.0 / median)
+
+
+def _baseline(*results):
+    return {result.name: result._asdict() for result in results}
+
+
+def test_find_regressions_threshold():
+    baseline = _baseline(_result('a', 1.0), _result('b', 1.0))
+    # Timings exact in binary, so the threshold comparison is too.
+    results = [_result('a', 1.125), _result('b', 1.25)]
+    # Exactly at the threshold isn't a regression.
+    assert [
+        (result.name, slowdown)
+        for result, slowdown in find_regressions(results, baseline, 0.125)
+    ] == [('b', 0.25)]
+    assert find_regressions(results, baseline, 0.25) == []
+    assert len(find_regressions(results, baseline, 0.0625)) == 2
+
+
+def test_find_regressions_iqr():
+    # 50% slower, but within the runs' combined spread.
+    baseline = _baseline(_result('a', 1.0, 0.25))
+    assert find_regressions([_result('a', 1.5, 0.5)], baseline) == []
+    # A gap equal to the spread isn't flagged either.
+    assert find_regressions([_result('a', 1.5, 0.25)], baseline) == []
+    # The same slowdown with tighter runs is flagged.
+    [(result, slowdown)] = find_regressions(
+        [_result('a', 1.5, 0.125)], baseline
+    )
+    assert result.name == 'a' and slowdown == pytest.approx(0.5)
+
+
+def test_find_regressions_ignores_unknown_and_faster():
+    baseline = _baseline(_result('a', 1.0), _result('zero', 1.0)._replace(
+        median=0.0
+    ))
+    results = [_result('a', 0.5), _result('new', 9.0), _result('zero', 1.0)]
+    assert find_regressions(results, baseline) == []
+
+
+def test_calibrate(monkeypatch):
+    calls = []
+
+    def time_loop(function, number):
+        calls.append(number)
+        return number * 0.001
+
+    monkeypatch.setattr(Benchmark, '_time_loop', time_loop)
+    # 1, 2, 5, 10, 20, 50 calls; 50ms is the first to reach 0.05s.
+    assert calibrate(lambda: None, 0.05) == 50
+    assert calls == [1, 2, 5, 10, 20, 50]
+    calls.clear()
+    assert calibrate(lambda: None, 0.0) == 1
+
+
+def test_measure_subtracts_overhead_and_resists_outliers(monkeypatch):
+    number = 100
+    # Per call costs of each sample; one outlier.
+    costs = [1.0, 1.1, 0.9, 1.0, 50.0, 1.05, 0.95]
+    overhead = 0.25
+    timings = iter(
+        [123.0]  # Warmup, discarded.
+        + [
+            value
+            for cost in costs
+            for value in ((cost + overhead) * number, overhead * number)
+        ]
+    )
+    monkeypatch.setattr(Benchmark, 'calibrate', lambda *_: number)
+    monkeypatch.setattr(
+        Benchmark, '_time_loop', lambda function, n: next(timings)
+    )
+
+    result = measure('x', lambda: None, repeat=len(costs))
+    assert result.number == number and result.repeat == len(costs)
+    assert result.median == pytest.approx(statistics.median(costs))
+    assert result.median == pytest.approx(1.0)
+    q1, _, q3 = statistics.quantiles(costs, n=4)
+    assert result.iqr == pytest.approx(q3 - q1)
+    # The outlier barely moves the spread.
+    assert result.iqr < 1.0
+    assert result.ops_per_second == pytest.approx(1.0)
+
+
+def test_save_and_load_results(tmp_path):
+    path = str(tmp_path / 'benchmarks.json')
+    assert load_results(path) == {}
+    save_results([_result('a', 1.0)], 'abc', path)
+    save_results([_result('b', 2.0)], 'def', path)
+    save_results([_result('a', 3.0)], 'abc', path)
+    stored = load_results(path)
+    assert set(stored) == {'abc', 'def'}
+    assert stored['abc'] == _baseline(_result('a', 3.0))
+    assert find_regressions([_result('a', 4.0)], stored['abc'])
+
+
+def test_discover():
+    benchmarks, skipped = discover('Network2.*')
+    assert 'Network2.bench_find_path' in benchmarks
+    assert all(name.startswith('Network2.bench_') for name in benchmarks)
+    assert not skipped
+
+    benchmarks, _ = discover()
+    assert not any(name.startswith('Benchmark.') for name in benchmarks)
+
+
+def test_main_exit_code(tmp_path, monkeypatch, capsys):
+    path = str(tmp_path / 'benchmarks.json')
+    save_results([_result('a', 1.0), _result('b', 1.0)], 'base', path)
+
+    monkeypatch.setattr(
+        Benchmark, 'run', lambda *_: [_result('a', 1.01), _result('b', 2.0)]
+    )
+    assert Benchmark.main(['--results', path, '--baseline', 'base']) == 1
+    assert 'REGRESSION b: +100.0%' in capsys.readouterr().out
+
+    monkeypatch.setattr(Benchmark, 'run', lambda *_: [_result('a', 1.0)])
+    assert Benchmark.main(['--results', path, '--baseline', 'base']) == 0
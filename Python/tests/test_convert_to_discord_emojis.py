@@ -0,0 +1,88 @@
+"""
+Tests for `misc_tools.ConvertToDiscordEmojis`.
+"""
+
+
+import io
+import random
+
+import pytest
+
+from misc_tools.ConvertToDiscordEmojis import (
+    convert_stream,
+    from_emojis,
+    iter_from_emojis,
+    iter_to_emojis,
+    reverse_table,
+    table,
+    to_emojis,
+)
+
+
+# Multi codepoint emoji: a ZWJ family, a flag, a variation selector and
+# a skin tone modifier; none may be split or altered.
+EMOJI = [
+    '\U0001f468‍\U0001f469‍\U0001f467',
+    '\U0001f1ec\U0001f1e7',
+    '❤️',
+    '\U0001f44d\U0001f3fd',
+]
+
+
+def _random_text(rng, length=200):
+    pieces = list('abcdefghijklmnopqrstuvwxyzABCZ :_-!é\n') + EMOJI
+    return ''.join(rng.choice(pieces) for _ in range(length))
+
+
+def _random_chunks(rng, text):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text), 8)))
+    return [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_every_shortcode():
+    shortcodes = ''.join(reverse_table)
+    assert from_emojis(shortcodes) == ''.join(reverse_table.values())
+    assert to_emojis(''.join(table)) == ''.join(table.values())
+    # Shared prefixes and suffixes resolve to the whole shortcode.
+    assert from_emojis(':heart::white_heart::black_heart:') == 'nml'
+    assert from_emojis(':black_large_square::black_circle:') == 'pq'
+    # Partial and unknown shortcodes are left alone.
+    assert from_emojis(':blue_ :pink_heart: :heart') == (
+        ':blue_ :pink_heart: :heart'
+    )
+
+
+def test_round_trip():
+    rng = random.Random(0)
+    for _ in range(200):
+        text = _random_text(rng)
+        emojis = to_emojis(text)
+        assert from_emojis(emojis) == text.lower()
+        for emoji in EMOJI:
+            assert emojis.count(emoji) == text.count(emoji)
+
+
+def test_round_trip_across_chunks():
+    rng = random.Random(1)
+    for _ in range(200):
+        text = _random_text(rng)
+        emojis = ''.join(iter_to_emojis(_random_chunks(rng, text)))
+        assert emojis == to_emojis(text)
+        assert ''.join(
+            iter_from_emojis(_random_chunks(rng, emojis))
+        ) == text.lower()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 13, 20, 64])
+def test_convert_stream(chunk_size):
+    text = 'Hello, World! ' + ''.join(EMOJI) + ' :heart: done\n'
+    emojis = io.StringIO()
+    count = convert_stream(io.StringIO(text), emojis, chunk_size=chunk_size)
+    assert emojis.getvalue() == to_emojis(text)
+    assert count == len(emojis.getvalue())
+
+    back = io.StringIO()
+    convert_stream(
+        io.StringIO(emojis.getvalue()), back, True, chunk_size
+    )
+    assert back.getvalue() == text.lower()
@@ -0,0 +1,185 @@
+"""
+Tests for `misc_tools.DynamicChaos`.
+"""
+
+
+from array import array
+import math
+
+import pytest
+
+from misc_tools import DynamicChaos
+from misc_tools.DynamicChaos import (
+    analyse_chaos,
+    iter_chaos_analysis,
+    iter_logistic_sweep,
+    logistic_sweep,
+    r_grid,
+    write_bifurcation,
+)
+
+
+@pytest.fixture(params=['python', 'numpy'])
+def backend(request, monkeypatch):
+    """
+    Runs a test with NumPy, and with the pure Python fallback.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(DynamicChaos, '_numpy', lambda: None)
+    return request.param
+
+
+def _iterate(r, x, count):
+    values = []
+    for _ in range(count):
+        x = r * x * (1.0 - x)
+        values.append(x)
+    return values
+
+
+def test_r_grid(backend):
+    grid = r_grid(2.5, 4.0, 7)
+    assert [float(r) for r in grid] == pytest.approx(
+        [2.5, 2.75, 3.0, 3.25, 3.5, 3.75, 4.0]
+    )
+    assert [float(r) for r in r_grid(3.0, 4.0, 1)] == [3.0]
+
+
+def test_logistic_sweep_matches_scalar_iteration(backend):
+    r_values = [float(r) for r in r_grid(2.5, 4.0, 31)]
+    rows = logistic_sweep(r_values, 0.3, 100, 20)
+    assert len(rows) == 20
+    for i, r in enumerate(r_values):
+        expected = _iterate(r, 0.3, 120)[100:]
+        assert [float(row[i]) for row in rows] == expected
+
+
+def test_logistic_sweep_attractors(backend):
+    rows = logistic_sweep([2.5, 3.2, 3.5], samples=8)
+    # A fixed point at 1 - 1/r, then cycles of 2 and 4 values.
+    assert [float(row[0]) for row in rows] == pytest.approx([0.6] * 8)
+    for i, period in ((1, 2), (2, 4)):
+        values = [float(row[i]) for row in rows]
+        assert len({round(x, 9) for x in values}) == period
+        assert values[period:] == pytest.approx(values[:-period])
+
+
+def test_iter_logistic_sweep_chunks(backend):
+    r_values = r_grid(2.5, 4.0, 25)
+    rows = logistic_sweep(r_values, transient=50, samples=5)
+    start = 0
+    for r_chunk, chunk_rows in iter_logistic_sweep(
+            r_values, transient=50, samples=5, chunk_size=7
+    ):
+        stop = start + len(r_chunk)
+        assert len(r_chunk) <= 7
+        assert [list(row) for row in chunk_rows] == [
+            list(row[start:stop]) for row in rows
+        ]
+        start = stop
+    assert start == len(r_values)
+
+
+def test_write_bifurcation_binary(backend, tmp_path):
+    r_values = r_grid(2.5, 4.0, 10)
+    path = tmp_path / 'points.bin'
+    count = write_bifurcation(
+        str(path), r_values, transient=50, samples=6, chunk_size=4
+    )
+    assert count == 60
+
+    points = array('f')
+    points.frombytes(path.read_bytes())
+    if array('f', [1.0]).tobytes() != b'\x00\x00\x80?':
+        points.byteswap()
+    assert len(points) == 120
+
+    expected = []
+    for start in range(0, 10, 4):
+        r_chunk = r_values[start:start + 4]
+        for row in logistic_sweep(r_chunk, transient=50, samples=6):
+            for r, x in zip(r_chunk, row):
+                expected += [float(r), float(x)]
+    assert list(points) == pytest.approx(expected, rel=1e-6)
+
+
+def test_write_bifurcation_csv(backend, tmp_path):
+    r_values = r_grid(3.0, 4.0, 5)
+    path = tmp_path / 'points.csv'
+    assert write_bifurcation(
+        str(path), r_values, transient=50, samples=3, binary=False
+    ) == 15
+
+    lines = path.read_text().splitlines()
+    assert lines[0] == 'r,x'
+    rows = logistic_sweep(r_values, transient=50, samples=3)
+    assert lines[1:] == [
+        f'{float(r):.7g},{float(x):.7g}'
+        for row in rows
+        for r, x in zip(r_values, row)
+    ]
+
+
+def test_backends_write_identical_files(tmp_path, monkeypatch):
+    pytest.importorskip('numpy')
+    outputs = []
+    for use_numpy in (True, False):
+        if not use_numpy:
+            monkeypatch.setattr(DynamicChaos, '_numpy', lambda: None)
+        for binary in (True, False):
+            path = tmp_path / f'{use_numpy}-{binary}'
+            write_bifurcation(
+                str(path), r_grid(2.8, 4.0, 50), transient=100,
+                samples=20, binary=binary, chunk_size=16,
+            )
+            outputs.append(path.read_bytes())
+    assert outputs[:2] == outputs[2:]
+
+
+def test_analyse_chaos_known_values(backend):
+    r_values = [2.5, 3.2, 3.5, 3.56, 3.83, 4.0]
+    result = analyse_chaos(r_values, start=3)
+    assert result.start == 3
+    assert [float(r) for r in result.r] == r_values
+    assert [int(p) for p in result.period] == [1, 2, 4, 8, 3, 0]
+
+    lyapunov = [float(x) for x in result.lyapunov]
+    # Fixed point: ln|f'(1 - 1/r)| = ln|2 - r|.
+    assert lyapunov[0] == pytest.approx(math.log(0.5), abs=1e-6)
+    # 2-cycle: half the log of |f'(x1) f'(x2)| = |4 + 2r - r^2|.
+    assert lyapunov[1] == pytest.approx(
+        math.log(abs(4 + 2 * 3.2 - 3.2 ** 2)) / 2, abs=1e-3
+    )
+    assert all(x < 0 for x in lyapunov[:5])
+    # Fully chaotic at r = 4, where the exponent is ln 2.
+    assert lyapunov[5] == pytest.approx(math.log(2), abs=0.05)
+
+
+def test_analyse_chaos_max_period(backend):
+    result = analyse_chaos([3.2, 3.5, 3.56], max_period=4, iterations=6)
+    # Period 8 is longer than the search.
+    assert [int(p) for p in result.period] == [2, 4, 0]
+    with pytest.raises(ValueError):
+        analyse_chaos([3.2], max_period=4, iterations=5)
+
+
+def test_iter_chaos_analysis_matches_single_chunk():
+    r_values = r_grid(2.8, 4.0, 100)
+    expected = analyse_chaos(r_values, transient=200, iterations=200)
+
+    results = list(iter_chaos_analysis(
+        r_values, transient=200, iterations=200, chunk_size=16,
+        max_workers=2,
+    ))
+    assert len(results) == 7
+    lyapunov = [None] * len(r_values)
+    period = [None] * len(r_values)
+    for result in results:
+        stop = result.start + len(result.r)
+        assert list(result.r) == list(r_values[result.start:stop])
+        lyapunov[result.start:stop] = [float(x) for x in result.lyapunov]
+        period[result.start:stop] = [int(p) for p in result.period]
+    assert lyapunov == [float(x) for x in expected.lyapunov]
+    assert period == [int(p) for p in expected.period]
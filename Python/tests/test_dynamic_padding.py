@@ -0,0 +1,77 @@
+"""
+Tests for `misc_tools.DynamicPadding`.
+"""
+
+
+import pytest
+
+from misc_tools.DynamicPadding import PaddingTemplate, dynamic_padding3
+
+
+TEMPLATES = [
+    'render/shot_010/beauty.####.exr',
+    'frame_#.png',
+    '##_{name}_##.txt',
+    'a#b##c###',
+    'no_padding.txt',
+    '#',
+]
+
+
+@pytest.mark.parametrize('template', [
+    template for template in TEMPLATES if '{' not in template
+])
+def test_render_matches_dynamic_padding3(template):
+    compiled = PaddingTemplate(template)
+    for index in [0, 1, 7, 42, 999, 12345, -3]:
+        assert compiled.render(index) == dynamic_padding3(template, index)
+        assert compiled(index) == compiled.render(index)
+
+
+def test_render_keeps_braces():
+    # dynamic_padding3 would treat these as format fields.
+    compiled = PaddingTemplate('##_{name}_##.txt')
+    assert compiled.render(7) == '07_{name}_07.txt'
+    assert compiled.match('07_{name}_07.txt') == 7
+
+
+@pytest.mark.parametrize('template', TEMPLATES)
+def test_render_range(template):
+    compiled = PaddingTemplate(template)
+    assert list(compiled.render_range(5)) == [
+        compiled.render(i) for i in range(5)
+    ]
+    assert list(compiled.render_range(3, 30, 7)) == [
+        compiled.render(i) for i in range(3, 30, 7)
+    ]
+    assert list(compiled.render_range(5, 0, -2)) == [
+        compiled.render(i) for i in (5, 3, 1)
+    ]
+
+
+@pytest.mark.parametrize('template', TEMPLATES[:-2])
+def test_match_round_trips(template):
+    compiled = PaddingTemplate(template)
+    for index in [0, 1, 42, 999, 12345, -3]:
+        assert compiled.match(compiled.render(index)) == index
+
+
+def test_match_rejects():
+    compiled = PaddingTemplate('beauty.####.exr')
+    # Not padded to the field's width.
+    assert compiled.match('beauty.12.exr') is None
+    assert compiled.match('beauty.00012.exr') is None
+    # Wrong literal parts.
+    assert compiled.match('beauty.0012.png') is None
+    assert compiled.match('xbeauty.0012.exr') is None
+    # Fields rendered from different indices.
+    assert PaddingTemplate('##_##').match('01_02') is None
+    # Templates without padding fields never match.
+    assert PaddingTemplate('plain.txt').match('plain.txt') is None
+
+
+def test_custom_trigger_pattern():
+    compiled = PaddingTemplate('shot.%%%%.exr', r'%+')
+    assert compiled.render(12) == 'shot.0012.exr'
+    assert compiled.match('shot.0012.exr') == 12
+    assert compiled.widths == (4,)
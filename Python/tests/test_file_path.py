@@ -0,0 +1,137 @@
+"""
+Tests for `misc_tools.FilePath` and `misc_tools.CopyFilesByExtension`.
+"""
+
+
+import os
+import pickle
+import random
+
+import pytest
+
+from misc_tools.CopyFilesByExtension import iter_copy_plan
+from misc_tools.FilePath import FilePath, PathMapper
+
+
+SEP = os.sep
+
+
+def _random_path(rng):
+    names = [
+        rng.choice(['a', 'src', 'src2', 'file.txt', '.hidden', 'x.tar.gz'])
+        for _ in range(rng.randrange(1, 5))
+    ]
+    path = ''.join(
+        name + SEP * rng.choice([1, 1, 1, 2]) for name in names[:-1]
+    ) + names[-1]
+    return SEP + path if rng.random() < 0.5 else path
+
+
+def test_lazy_parse_matches_os_path():
+    rng = random.Random(0)
+    for _ in range(500):
+        string = _random_path(rng)
+        path = FilePath(string)
+        assert path == string and hash(path) == hash(string)
+
+        assert path.name == os.path.basename(string)
+        assert path.parent == os.path.dirname(string)
+        root, extension = os.path.splitext(path.name)
+        assert path.suffix == extension
+        assert path.stem == root
+        assert SEP.join(path.parts) == SEP.join(
+            name for name in string.split(SEP) if name
+        )
+
+        other = _random_path(rng)
+        assert path / other == os.path.join(string, other)
+        assert path / 'name' == os.path.join(string, 'name')
+        assert other / path == os.path.join(other, string)
+
+
+def test_derived_paths_are_parsed_once():
+    path = FilePath(SEP.join(['', 'a', 'b', 'c.txt']))
+    assert path.parts == ('a', 'b', 'c.txt')
+    # Derived paths carry their components over from the parent.
+    child = path.parent / 'd'
+    assert child == SEP.join(['', 'a', 'b', 'd'])
+    assert child.parts == ('a', 'b', 'd') and child.anchor == SEP
+    assert path.relative_to(SEP + 'a').parts == ('b', 'c.txt')
+    with pytest.raises(ValueError):
+        path.relative_to(SEP + 'b')
+
+
+@pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+def test_pickle(protocol):
+    string = SEP.join(['', 'a', 'b', 'c.txt'])
+    unparsed = FilePath(string)
+    parsed = FilePath(string)
+    parsed.parts
+    for path in (unparsed, parsed):
+        copy = pickle.loads(pickle.dumps(path, protocol))
+        assert type(copy) is FilePath
+        assert copy == string
+        assert copy.anchor == SEP and copy.parts == ('a', 'b', 'c.txt')
+
+    mapper = pickle.loads(pickle.dumps(PathMapper('src', 'dst')))
+    assert mapper.map(os.path.join('src', 'a')) == os.path.join('dst', 'a')
+
+
+def test_mapper_rejects_sibling_prefix():
+    mapper = PathMapper('src', 'dst')
+    assert mapper.map(os.path.join('src', 'a', 'src', 'b')) == os.path.join(
+        'dst', 'a', 'src', 'b'
+    )
+    assert mapper.map('src') == 'dst'
+    assert mapper.map('src' + SEP * 2 + 'a') == os.path.join('dst', 'a')
+    for path in ('src2', os.path.join('src2', 'a'), 'sr'):
+        with pytest.raises(ValueError):
+            mapper.map(path)
+
+    # A trailing separator on the source is only a separator.
+    mapper = PathMapper('src' + SEP, 'dst')
+    assert mapper.map(os.path.join('src', 'a')) == os.path.join('dst', 'a')
+    with pytest.raises(ValueError):
+        mapper.map(os.path.join('src2', 'a'))
+
+
+def test_mapper_empty_source():
+    mapper = PathMapper('', 'dst')
+    assert mapper.map(os.path.join('a', 'b')) == os.path.join('dst', 'a', 'b')
+    assert mapper.map('a') == os.path.join('dst', 'a')
+    assert mapper.map_files('', ['a', 'b']) == [
+        os.path.join('dst', 'a'), os.path.join('dst', 'b'),
+    ]
+    with pytest.raises(ValueError):
+        mapper.map(SEP + 'a')
+
+
+def test_iter_copy_plan(tmp_path):
+    files = [
+        ('src', 'a.mp3'),
+        ('src', 'b.txt'),
+        ('src', 'x', 'src', 'c.mp3'),
+        ('src', 'y', 'd.txt'),
+        ('src2', 'e.mp3'),
+    ]
+    for parts in files:
+        path = tmp_path.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+
+    source = str(tmp_path / 'src')
+    destination = str(tmp_path / 'dst')
+    plan = {
+        directory: sorted(pairs)
+        for directory, pairs in iter_copy_plan(source, destination, ['.mp3'])
+    }
+    assert plan == {
+        destination: [(
+            os.path.join(source, 'a.mp3'),
+            os.path.join(destination, 'a.mp3'),
+        )],
+        os.path.join(destination, 'x', 'src'): [(
+            os.path.join(source, 'x', 'src', 'c.mp3'),
+            os.path.join(destination, 'x', 'src', 'c.mp3'),
+        )],
+    }
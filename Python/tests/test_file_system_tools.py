@@ -0,0 +1,73 @@
+"""
+Tests for `misc_tools.FileSystemTools`.
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
+
+import pytest
+
+from misc_tools import FileSystemTools
+
+
+def _make_files(directory, count, size):
+    os.mkdir(directory)
+    for i in range(count):
+        with open(os.path.join(directory, f'{i:02}.bin'), 'wb') as f:
+            f.write(os.urandom(size))
+
+
+def test_copy_directory_async(tmp_path):
+    source = str(tmp_path / 'source')
+    destination = str(tmp_path / 'destination')
+    _make_files(source, 5, 10000)
+
+    async def copy():
+        return [
+            event async for event in FileSystemTools.copy_directory_async(
+                source, destination, chunk_size=4096
+            )
+        ]
+
+    events = asyncio.run(copy())
+    assert sum(event.file_done for event in events) == 5
+    assert events[-1].bytes_copied == events[-1].total_bytes == 50000
+    for name in os.listdir(source):
+        with open(os.path.join(source, name), 'rb') as f1, \
+                open(os.path.join(destination, name), 'rb') as f2:
+            assert f1.read() == f2.read()
+
+
+def test_copy_directory_async_stops_on_error(tmp_path, monkeypatch):
+    source = str(tmp_path / 'source')
+    destination = str(tmp_path / 'destination')
+    _make_files(source, 24, 1024 * 1024)
+
+    copy_file_chunked = FileSystemTools._copy_file_chunked
+
+    def failing(src, *args):
+        if src.endswith('02.bin'):
+            raise OSError('failed')
+        return copy_file_chunked(src, *args)
+
+    monkeypatch.setattr(FileSystemTools, '_copy_file_chunked', failing)
+
+    async def copy():
+        with pytest.raises(OSError, match='failed'):
+            async for _ in FileSystemTools.copy_directory_async(
+                    source, destination, chunk_size=4096, executor=executor
+            ):
+                pass
+        copied = sorted(os.listdir(destination))
+        # Gives any copy that is still running time to write.
+        await asyncio.sleep(0.3)
+        return copied, sorted(os.listdir(destination))
+
+    # A separate executor, as `asyncio.run` would otherwise wait for the
+    # default executor's threads before returning.
+    with ThreadPoolExecutor(4) as executor:
+        before, after = asyncio.run(copy())
+    assert before == after
+    assert len(after) < 24
@@ -0,0 +1,93 @@
+"""
+Tests for `misc_tools.FirstNonRecuring`.
+"""
+
+
+import io
+import random
+
+import pytest
+
+from misc_tools.FirstNonRecuring import (
+    NonRecurringTracker,
+    WindowedNonRecurring,
+    first_non_recurring,
+    iter_file_chars,
+)
+
+
+def _brute_force(items):
+    return [item for item in dict.fromkeys(items) if items.count(item) == 1]
+
+
+def _random_stream(rng, length=300):
+    alphabet = 'abcdefghijklmnopqrstuvwxyz'[:rng.randrange(2, 27)]
+    return [rng.choice(alphabet) for _ in range(length)]
+
+
+def test_first_non_recurring():
+    assert first_non_recurring('aadeefgg') == ['d', 'f']
+    assert first_non_recurring('') == []
+    rng = random.Random(0)
+    for _ in range(50):
+        stream = _random_stream(rng)
+        assert first_non_recurring(stream) == _brute_force(stream)
+
+
+def test_iter_file_chars():
+    text = 'abcdefghij' * 10
+    assert ''.join(iter_file_chars(io.StringIO(text), 7)) == text
+    assert first_non_recurring(iter_file_chars(io.StringIO('abcab'), 2)) == [
+        'c'
+    ]
+
+
+def test_tracker_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(20):
+        stream = _random_stream(rng)
+        tracker = NonRecurringTracker()
+        for i, item in enumerate(stream, 1):
+            tracker.add(item)
+            expected = _brute_force(stream[:i])
+            assert list(tracker) == expected
+            assert len(tracker) == len(expected)
+            assert tracker.first() == (expected[0] if expected else None)
+            k = rng.randrange(5)
+            assert tracker.first_k(k) == expected[:k]
+        assert list(NonRecurringTracker(stream)) == _brute_force(stream)
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 17, 1000])
+def test_window_matches_brute_force(size):
+    rng = random.Random(size)
+    for _ in range(10):
+        stream = _random_stream(rng)
+        window = WindowedNonRecurring(size)
+        for i, item in enumerate(stream, 1):
+            window.add(item)
+            expected = _brute_force(stream[max(0, i - size):i])
+            # Asked for only now and then, so that stale candidates
+            # build up and get evicted between calls.
+            if rng.random() < 0.3:
+                assert window.first('-') == (expected[0] if expected else '-')
+            if rng.random() < 0.3:
+                k = rng.randrange(1, 6)
+                assert window.first_k(k) == expected[:k]
+        assert window.first_k(len(stream)) == _brute_force(stream[-size:])
+
+
+def test_window_eviction():
+    window = WindowedNonRecurring(3)
+    window.update('aba')
+    # "a" recurs, "b" doesn't.
+    assert window.first_k(3) == ['b']
+    window.add('c')
+    # Window is "bac"; the first "a" was evicted, so "a" no longer recurs.
+    assert window.first_k(3) == ['b', 'a', 'c']
+    window.add('b')
+    # Window is "acb".
+    assert window.first() == 'a'
+    assert window.first_k(2) == ['a', 'c']
+    with pytest.raises(ValueError):
+        WindowedNonRecurring(0)
@@ -0,0 +1,60 @@
+"""
+Tests for `misc_tools.KF2CustomEntries`.
+"""
+
+
+import os
+
+import pytest
+
+from misc_tools.KF2CustomEntries import (
+    get_entry_map_names,
+    rewrite_custom_map_names,
+    rewrite_custom_maps,
+)
+
+
+_INI = (
+    '[Engine.GameInfo]\n'
+    'MaxPlayers=6\n'
+    '\n'
+    '[KF-Old KFMapSummary]\n'
+    'MapName=KF-Old\n'
+    '\n'
+    '[KF-BurningParis KFMapSummary]\n'
+    'MapName=KF-BurningParis\n'
+    'ScreenshotPathName=UI_MapPreview_TEX.UI_MapPreview_Paris\n'
+    '\n'
+)
+
+
+def test_rewrite_custom_maps(tmp_path):
+    ini_path = tmp_path / 'PCServer-KFGame.ini'
+    ini_path.write_text(_INI)
+    custom = tmp_path / 'Custom'
+    custom.mkdir()
+    for name in ('KF-New.kfm', 'KF-Other.KFM', 'readme.txt'):
+        (custom / name).write_text('')
+
+    rewrite_custom_maps(str(ini_path), str(custom))
+    text = ini_path.read_text()
+    assert sorted(get_entry_map_names(text.splitlines(True))) == [
+        'KF-New', 'KF-Other',
+    ]
+    # Vanilla blocks, including map summaries with extra lines, are kept.
+    assert text.startswith(_INI.replace(
+        '[KF-Old KFMapSummary]\nMapName=KF-Old\n\n', ''
+    ))
+    assert sorted(os.listdir(tmp_path)) == ['Custom', 'PCServer-KFGame.ini']
+
+
+@pytest.mark.skipif(
+    not os.path.isdir('/proc/self/fd'), reason='needs /proc/self/fd',
+)
+def test_rewrite_failure_closes_temp_file(tmp_path):
+    ini_path = tmp_path / 'missing.ini'
+    open_fds = len(os.listdir('/proc/self/fd'))
+    with pytest.raises(FileNotFoundError):
+        rewrite_custom_map_names(str(ini_path), ['KF-New'])
+    assert len(os.listdir('/proc/self/fd')) == open_fds
+    assert os.listdir(tmp_path) == []
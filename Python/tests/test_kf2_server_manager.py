@@ -0,0 +1,72 @@
+"""
+Tests for `misc_tools.KF2ServerManager`.
+"""
+
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from misc_tools import KF2ServerManager
+from misc_tools.KF2ServerManager import MapListingCache, sync_servers
+
+
+def _make_server(tmp_path, name, maps):
+    custom = tmp_path / f'{name}-Custom'
+    custom.mkdir()
+    for map_name in maps:
+        (custom / f'{map_name}.kfm').write_text('')
+    ini_path = tmp_path / f'{name}.ini'
+    ini_path.write_text(
+        '[Engine.GameInfo]\n\n[KF-Old KFMapSummary]\nMapName=KF-Old\n\n'
+    )
+    return str(ini_path), str(custom)
+
+
+def test_sync_servers(tmp_path):
+    configs = [
+        _make_server(tmp_path, 'a', ['KF-One']),
+        _make_server(tmp_path, 'b', []),
+    ]
+    cache_path = str(tmp_path / 'cache.json')
+
+    first = sync_servers(configs, cache_path)
+    assert [(r.added, r.removed, r.rewritten) for r in first] == [
+        (('KF-One',), ('KF-Old',), True),
+        ((), ('KF-Old',), True),
+    ]
+    second = sync_servers(configs, cache_path)
+    assert [r.rewritten for r in second] == [False, False]
+
+
+def test_slow_scan_only_blocks_its_directory(tmp_path, monkeypatch):
+    slow = tmp_path / 'slow'
+    fast = tmp_path / 'fast'
+    slow.mkdir()
+    fast.mkdir()
+    (fast / 'KF-Fast.kfm').write_text('')
+
+    scanning = threading.Event()
+    release = threading.Event()
+    scans = []
+    iter_custom_map_names = KF2ServerManager.iter_custom_map_names
+
+    def scan(directory):
+        scans.append(directory)
+        if directory == str(slow):
+            scanning.set()
+            assert release.wait(5)
+        return iter_custom_map_names(directory)
+
+    monkeypatch.setattr(KF2ServerManager, 'iter_custom_map_names', scan)
+    cache = MapListingCache()
+    with ThreadPoolExecutor(4) as executor:
+        slow_lookups = [executor.submit(cache.get, str(slow)) for _ in '12']
+        assert scanning.wait(5)
+        # Completes whilst the slow directory is still being scanned.
+        assert executor.submit(cache.get, str(fast)).result(5) == [
+            'KF-Fast'
+        ]
+        release.set()
+        assert [f.result(5) for f in slow_lookups] == [[], []]
+    # Concurrent lookups of one directory share a single scan.
+    assert sorted(scans) == [str(fast), str(slow)]
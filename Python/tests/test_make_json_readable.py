@@ -0,0 +1,187 @@
+"""
+Tests for `misc_tools.MakeJSONReadable`.
+"""
+
+
+from json import JSONDecodeError
+import gzip
+import io
+import json
+import lzma
+import os
+import random
+
+import pytest
+
+from misc_tools.MakeJSONReadable import (
+    iter_json_events,
+    make_json_readable_batch,
+    stream_json_readable,
+    write_json_events,
+)
+
+
+def _random_value(rng, depth=0):
+    kind = rng.randrange(9 if depth < 4 else 6)
+    if kind == 0:
+        return rng.choice([None, True, False])
+    if kind == 1:
+        return rng.randint(-10 ** 20, 10 ** 20)
+    if kind == 2:
+        return rng.uniform(-1e6, 1e6) * 10 ** rng.randint(-30, 30)
+    if kind == 3:
+        return rng.choice([0, -0.0, 1.5, 1e-7, 1e22, 123456789012345678])
+    if kind in (4, 5):
+        return ''.join(
+            rng.choice('ab "\\/\n\té中\U0001f600')
+            for _ in range(rng.randrange(8))
+        )
+    if kind in (6, 7):
+        return {
+            str(rng.randrange(100)): _random_value(rng, depth + 1)
+            for _ in range(rng.randrange(5))
+        }
+    return [_random_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+
+
+def _reformat(text, chunk_size, **kwargs):
+    out = io.StringIO()
+    write_json_events(
+        iter_json_events(io.StringIO(text), chunk_size), out, **kwargs
+    )
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 65536])
+def test_matches_json_dumps(chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(200):
+        value = _random_value(rng)
+        # Compact input, so numbers and literals often straddle chunks.
+        text = json.dumps(value, separators=(',', ':'))
+        assert _reformat(text, chunk_size, indent=4) == json.dumps(
+            value, indent=4
+        )
+        assert _reformat(
+            text, chunk_size, separators=(',', ':'), ensure_ascii=False
+        ) == json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+@pytest.mark.parametrize('text', [
+    '1.5e+10', '-0', '-0.0', '1E-5', '123456789012345678901234567890',
+    'NaN', '-Infinity', '"\\ud83d\\ude00"', '  [ ]  ', '{ }', '[[[]]]',
+])
+def test_scalars_and_edges(text):
+    for chunk_size in (1, 3, 64):
+        assert _reformat(text, chunk_size, indent=4) == json.dumps(
+            json.loads(text), indent=4
+        )
+
+
+def test_events():
+    events = list(iter_json_events(io.StringIO('{"a": [1, {"b": null}]}')))
+    assert events == [
+        ('start_map', None),
+        ('key', 'a'),
+        ('start_array', None),
+        ('value', 1),
+        ('start_map', None),
+        ('key', 'b'),
+        ('value', None),
+        ('end_map', None),
+        ('end_array', None),
+        ('end_map', None),
+    ]
+
+
+@pytest.mark.parametrize('text', [
+    '', '[', '[1,]', '{"a"}', '{"a":1,}', '{1:2}', '[1 2]', '1 2', 'nul',
+    '"unterminated', ']', '{"a":1]',
+])
+def test_invalid(text):
+    with pytest.raises(JSONDecodeError):
+        json.loads(text)
+    for chunk_size in (1, 64):
+        with pytest.raises(JSONDecodeError):
+            list(iter_json_events(io.StringIO(text), chunk_size))
+
+
+def test_stream_json_readable(tmp_path):
+    value = _random_value(random.Random(0))
+    source = tmp_path / 'source.json'
+    destination = tmp_path / 'destination.json'
+    source.write_text(json.dumps(value))
+
+    assert stream_json_readable(str(source), str(destination))
+    assert destination.read_text() == json.dumps(value, indent=4)
+    # Already formatted, so the destination is left untouched.
+    assert not stream_json_readable(str(source), str(destination))
+
+
+@pytest.mark.parametrize('mode, kwargs', [
+    ('readable', {'indent': 4}),
+    ('compact', {'separators': (',', ':')}),
+])
+def test_stream_json_readable_sort_keys(tmp_path, mode, kwargs):
+    value = _random_value(random.Random(1))
+    source = tmp_path / 'source.json'
+    destination = tmp_path / 'destination.json'
+    source.write_text(json.dumps(value))
+
+    stream_json_readable(str(source), str(destination), mode, True)
+    assert destination.read_text() == json.dumps(
+        value, sort_keys=True, **kwargs
+    )
+
+
+@pytest.mark.parametrize('extension', ['.gz', '.xz'])
+def test_compressed_output_is_reproducible(tmp_path, extension):
+    source = tmp_path / 'source.json'
+    source.write_text(json.dumps({'b': [1, 2], 'a': 'é'}))
+
+    outputs = []
+    for name in ('first', 'second'):
+        destination = tmp_path / f'{name}.json{extension}'
+        stream_json_readable(str(source), str(destination))
+        outputs.append(destination.read_bytes())
+    assert outputs[0] == outputs[1]
+
+    if extension == '.gz':
+        # No file name flag, and a zero mtime.
+        assert outputs[0][3] == 0
+        assert outputs[0][4:8] == bytes(4)
+        assert gzip.decompress(outputs[0]).decode() == json.dumps(
+            {'b': [1, 2], 'a': 'é'}, indent=4
+        )
+
+
+def test_batch_reports_corrupt_compressed_files(tmp_path):
+    value = {'a': list(range(2000))}
+    data = json.dumps(value).encode()
+    gz = gzip.compress(data)
+    xz = lzma.compress(data)
+    files = {
+        'truncated.json.gz': gz[:len(gz) // 2],
+        'corrupt.json.gz': gz[:20] + bytes(50) + gz[70:],
+        'truncated.json.xz': xz[:len(xz) // 2],
+        'corrupt.json.xz': xz[:30] + bytes(40) + xz[70:],
+        'valid.json': data,
+    }
+    for name, content in files.items():
+        (tmp_path / name).write_bytes(content)
+
+    results = {
+        os.path.basename(result.filepath): result
+        for result in make_json_readable_batch([str(tmp_path)], max_workers=1)
+    }
+    assert results.keys() == files.keys()
+    for name, content in files.items():
+        result = results[name]
+        if name == 'valid.json':
+            assert result.error is None and result.changed
+        else:
+            assert result.error and not result.changed
+            # Left as it was, with no temporary files behind.
+            assert (tmp_path / name).read_bytes() == content
+    assert sorted(os.listdir(tmp_path)) == sorted(files)
+    assert (tmp_path / 'valid.json').read_text() == json.dumps(value, indent=4)
@@ -0,0 +1,128 @@
+"""
+Tests for `misc_tools.mp3Index`.
+"""
+
+
+import os
+
+import pytest
+
+from misc_tools import mp3Index
+from misc_tools.mp3Index import Mp3Index, RefreshStats
+
+eyed3 = pytest.importorskip('eyed3')
+
+
+# MPEG-1 layer III frames (128kbps, 44.1kHz) with silent payloads.
+_AUDIO = (b'\xff\xfb\x90\x64' + bytes(413)) * 50
+
+
+def _write(path, title=None, artist=None, track_num=None):
+    """
+    Writes a short .mp3 file, tagged if any field is given.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(_AUDIO)
+    if title or artist or track_num:
+        audio_file = eyed3.load(path)
+        audio_file.initTag()
+        audio_file.tag.title = title
+        audio_file.tag.artist = artist
+        if track_num:
+            audio_file.tag.track_num = track_num
+        audio_file.tag.save()
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / 'library'
+    _write(str(root / 'a.mp3'), 'A', 'Artist 1', (1, 2))
+    _write(str(root / 'b.mp3'), 'B', 'Artist 1', (2, 2))
+    _write(str(root / 'nested' / 'c.MP3'), 'C', 'Artist 2')
+    _write(str(root / 'nested' / 'untagged.mp3'))
+    (root / 'notes.txt').write_text('not audio')
+    return root
+
+
+@pytest.fixture
+def parse_count(monkeypatch):
+    """
+    Counts the files `refresh` parses.
+    """
+    parsed = []
+    read_tag_fields = mp3Index.read_tag_fields
+
+    def counting(path):
+        parsed.append(path)
+        return read_tag_fields(path)
+
+    monkeypatch.setattr(mp3Index, 'read_tag_fields', counting)
+    return parsed
+
+
+def test_refresh_only_rescans_changes(library, tmp_path, parse_count):
+    with Mp3Index(str(library), str(tmp_path / 'index.sqlite')) as index:
+        assert index.refresh() == RefreshStats(4, 0, 0, 0)
+        assert len(parse_count) == 4
+
+        parse_count.clear()
+        assert index.refresh() == RefreshStats(0, 0, 0, 4)
+        assert parse_count == []
+
+        # One retagged, one new, one removed.
+        _write(str(library / 'a.mp3'), 'A2', 'Artist 1', (1, 2))
+        stat = os.stat(library / 'a.mp3')
+        os.utime(
+            library / 'a.mp3',
+            ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9),
+        )
+        _write(str(library / 'nested' / 'd.mp3'), 'D', 'Artist 2', (3, 3))
+        os.remove(library / 'b.mp3')
+
+        assert index.refresh() == RefreshStats(1, 1, 1, 2)
+        assert sorted(map(os.path.basename, parse_count)) == [
+            'a.mp3', 'd.mp3'
+        ]
+        assert index.find(title='A2') == [str(library / 'a.mp3')]
+        assert index.find(title='B') == []
+
+
+def test_queries(library):
+    with Mp3Index(str(library)) as index:
+        index.refresh()
+        assert os.path.isfile(library / mp3Index.INDEX_FILE_NAME)
+
+        assert index.find(artist='Artist 1') == [
+            str(library / 'a.mp3'), str(library / 'b.mp3')
+        ]
+        assert index.find(artist='Artist 2', title='C') == [
+            str(library / 'nested' / 'c.MP3')
+        ]
+        assert index.missing('track_num') == [
+            str(library / 'nested' / 'c.MP3'),
+            str(library / 'nested' / 'untagged.mp3'),
+        ]
+        assert [
+            (row['title'], row['track_num'], row['track_total'])
+            for row in index.query('track_num >= ?', (1,))
+        ] == [('A', 1, 2), ('B', 2, 2)]
+        assert all(row['error'] is None for row in index.query())
+        with pytest.raises(ValueError):
+            index.find(year=2000)
+
+    # The index persists between instances.
+    with Mp3Index(str(library)) as index:
+        assert index.refresh() == RefreshStats(0, 0, 0, 4)
+        assert len(index.query()) == 4
+
+
+def test_refresh_on_process_pool(library, tmp_path, monkeypatch):
+    with Mp3Index(str(library), str(tmp_path / 'serial.sqlite')) as index:
+        index.refresh()
+        expected = index.query()
+
+    monkeypatch.setattr(mp3Index, '_PARALLEL_THRESHOLD', 1)
+    with Mp3Index(str(library), str(tmp_path / 'pool.sqlite')) as index:
+        assert index.refresh(max_workers=2) == RefreshStats(4, 0, 0, 0)
+        assert index.query() == expected
@@ -0,0 +1,97 @@
+"""
+Tests for `misc_tools.mp3Tools`.
+"""
+
+
+import os
+
+import pytest
+
+from misc_tools.mp3Tools import (
+    DEFAULT_RESERVE_PADDING,
+    _read_id3v2_size,
+    save_tag,
+)
+
+eyed3 = pytest.importorskip('eyed3')
+
+
+# MPEG-1 layer III frames (128kbps, 44.1kHz) with silent payloads.
+_AUDIO = (b'\xff\xfb\x90\x64' + bytes(413)) * 50
+
+
+@pytest.fixture
+def mp3_path(tmp_path):
+    path = tmp_path / 'track.mp3'
+    path.write_bytes(_AUDIO)
+    return str(path)
+
+
+def _load(path):
+    audio_file = eyed3.load(path)
+    if audio_file.tag is None:
+        audio_file.initTag()
+    return audio_file
+
+
+def _audio(path):
+    with open(path, 'rb') as f:
+        return f.read()[_read_id3v2_size(path):]
+
+
+def test_first_save_reserves_padding(mp3_path):
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'First'
+
+    result = save_tag(audio_file)
+    assert not result.in_place
+    assert result.bytes_written == os.path.getsize(mp3_path)
+    assert _read_id3v2_size(mp3_path) > DEFAULT_RESERVE_PADDING
+    assert _audio(mp3_path) == _AUDIO
+    assert eyed3.load(mp3_path).tag.title == 'First'
+
+
+def test_edit_that_fits_is_written_in_place(mp3_path):
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'First'
+    save_tag(audio_file)
+    size = os.path.getsize(mp3_path)
+    inode = os.stat(mp3_path).st_ino
+
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'A longer second title'
+    audio_file.tag.artist = 'Artist'
+    result = save_tag(audio_file)
+    assert result.in_place
+    assert 0 < result.bytes_written < _read_id3v2_size(mp3_path)
+    # Same file, same size; only the tag region changed.
+    assert os.stat(mp3_path).st_ino == inode
+    assert os.path.getsize(mp3_path) == size
+    assert _audio(mp3_path) == _AUDIO
+    tag = eyed3.load(mp3_path).tag
+    assert (tag.title, tag.artist) == ('A longer second title', 'Artist')
+
+
+def test_unchanged_tag_writes_nothing(mp3_path):
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'Same'
+    save_tag(audio_file)
+
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'Same'
+    assert save_tag(audio_file).bytes_written == 0
+
+
+def test_edit_larger_than_padding_rewrites(mp3_path):
+    audio_file = _load(mp3_path)
+    audio_file.tag.title = 'First'
+    save_tag(audio_file)
+    tag_size = _read_id3v2_size(mp3_path)
+
+    audio_file = _load(mp3_path)
+    audio_file.tag.comments.set('x' * (2 * DEFAULT_RESERVE_PADDING))
+    result = save_tag(audio_file)
+    assert not result.in_place
+    assert _read_id3v2_size(mp3_path) > tag_size + DEFAULT_RESERVE_PADDING
+    assert _audio(mp3_path) == _AUDIO
+    assert sorted(os.listdir(os.path.dirname(mp3_path))) == ['track.mp3']
@@ -0,0 +1,120 @@
+"""
+Tests for `misc_tools.Network2`.
+"""
+
+
+import operator
+import random
+
+import pytest
+
+from misc_tools.Network2 import Node, NodeContainer, NodeExpression
+from misc_tools.NetworkPartition import partition
+
+
+OPERATORS = {
+    '-': operator.sub,
+    '+': operator.add,
+    '*': operator.mul,
+    '%': operator.mod,
+    '^': operator.xor,
+    '|': operator.or_,
+}
+IN_PLACE = {
+    '-': operator.isub,
+    '+': operator.iadd,
+    '*': operator.imul,
+    '%': operator.imod,
+    '^': operator.ixor,
+    '|': operator.ior,
+}
+
+
+def _grid(size):
+    nodes = [Node(i) for i in range(size * size)]
+    for i, node in enumerate(nodes):
+        if i % size:
+            node.connect(nodes[i - 1])
+        if i >= size:
+            node.connect(nodes[i - size])
+    return nodes
+
+
+def test_connection_island_on_grid():
+    # Diamonds used to multiply the frontier, so this never finished.
+    nodes = _grid(32)
+    assert nodes[0].get_connection_island() == set(nodes)
+
+
+def test_connection_island_matches_partition():
+    grid = _grid(6)
+    chain = [Node(i) for i in range(5)]
+    for a, b in zip(chain, chain[1:]):
+        a.connect(b)
+    single = Node()
+    network = NodeContainer(grid + chain + [single])
+
+    islands = partition(network)
+    assert len(islands) == 3
+    for island in islands:
+        for node in island:
+            assert node.get_connection_island() == set(island)
+
+
+def _random_tree(rng, leaves):
+    """
+    Random expression tree over leaf sizes; nested tuples of
+    (operator, left, right), with ints for leaves.
+    """
+    if leaves == 1:
+        return rng.randrange(4)
+    split = rng.randrange(1, leaves)
+    return (
+        rng.choice(list(OPERATORS)),
+        _random_tree(rng, split),
+        _random_tree(rng, leaves - split),
+    )
+
+
+def _evaluate(tree, counter, lazy):
+    if isinstance(tree, int):
+        network = NodeContainer(next(counter) for _ in range(tree))
+        return network.lazy() if lazy else network
+    symbol, left, right = tree
+    left = _evaluate(left, counter, lazy)
+    return OPERATORS[symbol](left, _evaluate(right, counter, lazy))
+
+
+def _snapshot(network):
+    return (
+        [n.data for n in network.nodes],
+        {n.data: {c.data for c in n.connections} for n in network.nodes},
+    )
+
+
+def test_lazy_matches_eager():
+    rng = random.Random(0)
+    for _ in range(300):
+        tree = _random_tree(rng, rng.randrange(1, 9))
+        eager = _evaluate(tree, iter(range(1000)), False)
+        lazy = _evaluate(tree, iter(range(1000)), True)
+        if isinstance(lazy, NodeExpression):
+            lazy = lazy.commit()
+        assert _snapshot(lazy) == _snapshot(eager)
+
+
+@pytest.mark.parametrize('symbol', list(IN_PLACE))
+def test_in_place_with_expression(symbol):
+    def networks():
+        return NodeContainer(range(3)), NodeContainer(range(3, 6))
+
+    a, b = networks()
+    a_nodes = a.nodes
+    a = IN_PLACE[symbol](a, b.lazy())
+    # Rebinds to an expression; the original network is left untouched.
+    assert isinstance(a, NodeExpression)
+    assert not any(n.connections for n in a_nodes)
+
+    eager_a, eager_b = networks()
+    eager = OPERATORS[symbol](eager_a, eager_b)
+    assert _snapshot(a.commit()) == _snapshot(eager)
@@ -0,0 +1,77 @@
+"""
+Tests for `misc_tools.NetworkPartition`.
+"""
+
+
+import pickle
+import random
+
+from misc_tools.Network2 import Node, NodeContainer
+from misc_tools.NetworkPartition import (
+    iter_island_results,
+    map_islands,
+    partition,
+    serialise_islands,
+)
+
+
+def _random_network(rng, count=200):
+    """
+    Sparse random network, so that it splits into many islands; includes
+    self connections.
+    """
+    nodes = [Node(i) for i in range(count)]
+    for _ in range(count * 3 // 4):
+        rng.choice(nodes).connect(rng.choice(nodes))
+    return NodeContainer(nodes)
+
+
+def _connections(nodes):
+    return {n.data: {c.data for c in n.connections} for n in nodes}
+
+
+def _summarise(network):
+    """
+    Picklable island function; the island's data and connections.
+    """
+    return sorted(_connections(network.nodes).items())
+
+
+def test_island_round_trip():
+    network = _random_network(random.Random(0))
+    islands = serialise_islands(network)
+    assert [island.index for island in islands] == list(range(len(islands)))
+
+    for island, nodes in zip(islands, partition(network)):
+        island = pickle.loads(pickle.dumps(island))
+        assert len(island) == len(nodes)
+        rebuilt = island.to_network()
+        assert [n.data for n in rebuilt.nodes] == [n.data for n in nodes]
+        assert _connections(rebuilt.nodes) == _connections(nodes)
+        # Rebuilt from new nodes, not the originals.
+        assert not set(rebuilt.nodes) & set(nodes)
+
+
+def test_map_islands_matches_in_process_map():
+    network = _random_network(random.Random(1))
+    expected = [
+        _summarise(NodeContainer(nodes)) for nodes in partition(network)
+    ]
+    assert len(expected) > 10
+
+    assert map_islands(_summarise, network, 2) == expected
+    # Small batches, so that islands are spread across many tasks.
+    assert map_islands(_summarise, network, 2, batch_size=8) == expected
+
+
+def test_iter_island_results_covers_every_island():
+    network = _random_network(random.Random(2))
+    expected = [
+        _summarise(NodeContainer(nodes)) for nodes in partition(network)
+    ]
+    results = list(iter_island_results(_summarise, network, 2, 16))
+    assert sorted(index for index, _ in results) == list(
+        range(len(expected))
+    )
+    for index, result in results:
+        assert result == expected[index]
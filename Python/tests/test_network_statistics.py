@@ -0,0 +1,101 @@
+"""
+Tests for `misc_tools.NetworkStatistics`.
+"""
+
+
+from collections import Counter
+import random
+
+import pytest
+
+from misc_tools.Network2 import Node, NodeContainer
+from misc_tools.NetworkStatistics import (
+    core_numbers,
+    degeneracy,
+    degree_histogram,
+    k_core,
+    top_hubs,
+)
+
+
+def _random_network(rng):
+    """
+    Random network, with self connections, connections to nodes outside
+    of it, and nodes listed more than once.
+    """
+    nodes = [Node(i) for i in range(rng.randrange(1, 25))]
+    outside = [Node(-i) for i in range(1, 4)]
+    p = rng.random()
+    for i, a in enumerate(nodes):
+        for b in nodes[i + 1:]:
+            if rng.random() < p:
+                a.connect(b)
+        if rng.random() < 0.1:
+            a.connect(a)
+        if rng.random() < 0.2:
+            a.connect(rng.choice(outside))
+    listed = nodes + rng.sample(nodes, min(len(nodes), rng.randrange(3)))
+    return NodeContainer(listed), nodes
+
+
+def _brute_force_core(nodes, k):
+    """
+    Repeatedly removes nodes with fewer than k neighbours in the core.
+    """
+    core = set(nodes)
+    while True:
+        removed = {
+            n for n in core
+            if sum(1 for c in n.connections if c is not n and c in core) < k
+        }
+        if not removed:
+            return core
+        core -= removed
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_core_numbers_match_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(10):
+        network, nodes = _random_network(rng)
+        cores = core_numbers(network)
+        assert list(cores) == nodes
+
+        k = 0
+        while True:
+            expected = _brute_force_core(nodes, k)
+            assert {n for n, core in cores.items() if core >= k} == expected
+            assert set(k_core(network, k).nodes) == expected
+            if not expected:
+                break
+            k += 1
+        assert degeneracy(network) == k - 1
+
+
+def test_empty_network():
+    network = NodeContainer(())
+    assert core_numbers(network) == {}
+    assert degeneracy(network) == 0
+    assert degree_histogram(network) == {}
+    assert top_hubs(network) == []
+
+
+@pytest.mark.parametrize('indexed', [False, True])
+def test_degree_histogram_and_top_hubs(indexed):
+    rng = random.Random(1)
+    for _ in range(50):
+        network, nodes = _random_network(rng)
+        if indexed:
+            network.index_degrees()
+        degrees = {n: len(n.connections) for n in nodes}
+
+        histogram = degree_histogram(network)
+        assert histogram == dict(sorted(Counter(degrees.values()).items()))
+
+        k = rng.randrange(1, 8)
+        hubs = top_hubs(network, k)
+        assert len(hubs) == min(k, len(nodes))
+        assert all(degrees[n] == degree for n, degree in hubs)
+        assert [degree for _, degree in hubs] == sorted(
+            degrees.values(), reverse=True
+        )[:k]
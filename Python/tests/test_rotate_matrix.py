@@ -0,0 +1,112 @@
+"""
+Tests for `misc_tools.RotateMatrix`.
+"""
+
+
+from array import array
+
+import pytest
+
+from misc_tools.RotateMatrix import (
+    StridedView,
+    rotate,
+    rotate_in_place,
+    rotate_matrix,
+    strided_view,
+    transpose,
+    transpose_in_place,
+)
+
+
+SHAPES = [(1, 1), (1, 5), (5, 1), (3, 4), (4, 3), (4, 4), (5, 5)]
+DEGREES = [0, 90, 180, 270, 360, -90, 450]
+
+
+def _matrix(shape):
+    rows, columns = shape
+    return [[i * columns + j for j in range(columns)] for i in range(rows)]
+
+
+def _naive_rotate(matrix, degrees):
+    for _ in range(degrees % 360 // 90):
+        rows, columns = len(matrix), len(matrix[0])
+        matrix = [
+            [matrix[rows - 1 - j][i] for j in range(rows)]
+            for i in range(columns)
+        ]
+    return [list(row) for row in matrix]
+
+
+def _lists(matrix):
+    return [list(row) for row in matrix]
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('degrees', DEGREES)
+def test_rotate(shape, degrees):
+    matrix = _matrix(shape)
+    expected = _naive_rotate(matrix, degrees)
+    assert _lists(rotate(matrix, degrees)) == expected
+    # Left untouched.
+    assert matrix == _matrix(shape)
+
+    if shape[0] == shape[1]:
+        assert rotate_in_place(matrix, degrees) is matrix
+        assert matrix == expected
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('degrees', DEGREES)
+def test_strided_view(shape, degrees):
+    expected = _naive_rotate(_matrix(shape), degrees)
+    flat = array('q', range(shape[0] * shape[1]))
+    for buffer in (flat, bytes(range(len(flat)))):
+        view = strided_view(buffer, shape, degrees)
+        assert view.shape == (len(expected), len(expected[0]))
+        assert view.tolist() == expected
+        assert all(isinstance(row, memoryview) for row in view.rows())
+        assert [
+            [view[i, j] for j in range(view.shape[1])]
+            for i in range(view.shape[0])
+        ] == expected
+
+    # Rotating a rotated view, and transposing it, compose as expected.
+    view = StridedView(flat, shape).rotate(degrees)
+    assert view.rotate(90).tolist() == _naive_rotate(expected, 90)
+    assert view.transpose().tolist() == _lists(zip(*expected))
+
+
+def test_transpose():
+    for shape in SHAPES:
+        matrix = _matrix(shape)
+        expected = _lists(zip(*matrix))
+        assert _lists(transpose(matrix)) == expected
+        assert _lists(rotate_matrix(matrix)) == _naive_rotate(matrix, 90)
+        if shape[0] == shape[1]:
+            assert transpose_in_place(matrix) == expected
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        rotate(_matrix((2, 2)), 45)
+    with pytest.raises(ValueError):
+        rotate_in_place(_matrix((2, 3)))
+    with pytest.raises(ValueError):
+        transpose_in_place(_matrix((3, 2)))
+    with pytest.raises(ValueError):
+        StridedView(memoryview(bytes(4)).cast('B', (2, 2)), (2, 2))
+    with pytest.raises(IndexError):
+        StridedView(bytes(4), (2, 2)).row(2)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('degrees', DEGREES)
+def test_numpy(shape, degrees):
+    numpy = pytest.importorskip('numpy')
+    matrix = _matrix(shape)
+    array_2d = numpy.array(matrix)
+    rotated = rotate(array_2d, degrees)
+    assert rotated.tolist() == _naive_rotate(matrix, degrees)
+    # A view of the same data, not a copy.
+    assert numpy.shares_memory(rotated, array_2d)
+    assert transpose(array_2d).tolist() == _lists(zip(*matrix))
@@ -0,0 +1,108 @@
+"""
+Tests for `misc_tools.SequenceRenamer`.
+"""
+
+
+import os
+import random
+
+import pytest
+
+from misc_tools.SequenceRenamer import (
+    _order_renames,
+    plan_sequence_rename,
+    rename_sequence,
+    undo_rename_journal,
+)
+
+
+def _apply(steps, files):
+    """
+    Runs rename steps against a {name: content} mapping, refusing to
+    overwrite anything.
+    """
+    files = dict(files)
+    for source, destination in steps:
+        source = os.path.basename(source)
+        destination = os.path.basename(destination)
+        assert source in files
+        assert destination not in files
+        files[destination] = files.pop(source)
+    return files
+
+
+def _check(renames, others=()):
+    files = {name: name for name in list(renames) + list(others)}
+    steps = _order_renames(renames, 'd', others)
+    result = _apply(steps, files)
+    expected = {name: name for name in others}
+    expected.update(
+        (destination, source) for source, destination in renames.items()
+    )
+    assert result == expected
+    return steps
+
+
+def test_disjoint_cycles():
+    steps = _check({'A': 'B', 'B': 'A', 'C': 'D', 'D': 'C'})
+    assert len(steps) == 6
+
+
+def test_chain_and_cycle():
+    _check({'1': '2', '2': '3', '3': '4', 'x': 'y', 'y': 'z', 'z': 'x'})
+
+
+def test_temp_names_avoid_existing_files():
+    steps = _check(
+        {'A': 'B', 'B': 'A'}, others=['.rename-1-A', '.rename-2-A']
+    )
+    assert os.path.basename(steps[0].destination) == '.rename-3-A'
+
+
+def test_random_permutations():
+    rng = random.Random(0)
+    for _ in range(300):
+        names = [str(i) for i in range(rng.randrange(1, 12))]
+        sources = rng.sample(names, rng.randrange(1, len(names) + 1))
+        destinations = rng.sample(names, len(sources))
+        renames = {
+            source: destination
+            for source, destination in zip(sources, destinations)
+            if source != destination
+        }
+        # Any destination that isn't moved away must not exist yet.
+        others = [
+            name for name in names
+            if name not in renames and name not in renames.values()
+        ]
+        _check(renames, others)
+
+
+def _make_frames(directory, indices):
+    for index in indices:
+        (directory / f'frame.{index:04d}.exr').write_text(str(index))
+
+
+def test_rename_sequence_shift(tmp_path):
+    _make_frames(tmp_path, range(1, 6))
+    journal = tmp_path.parent / f'{tmp_path.name}.journal'
+
+    rename_sequence(str(tmp_path), 'frame.####.exr', offset=1,
+                    journal_path=str(journal))
+    assert {
+        path.name: path.read_text() for path in tmp_path.iterdir()
+    } == {f'frame.{index + 1:04d}.exr': str(index) for index in range(1, 6)}
+
+    undo_rename_journal(str(journal))
+    assert {
+        path.name: path.read_text() for path in tmp_path.iterdir()
+    } == {f'frame.{index:04d}.exr': str(index) for index in range(1, 6)}
+
+
+def test_plan_rejects_existing_destination(tmp_path):
+    _make_frames(tmp_path, range(1, 4))
+    (tmp_path / 'beauty.0002.exr').write_text('')
+    with pytest.raises(FileExistsError):
+        plan_sequence_rename(
+            str(tmp_path), 'frame.####.exr', 'beauty.####.exr'
+        )
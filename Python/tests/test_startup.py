@@ -0,0 +1,58 @@
+"""
+Startup budget of the `misc` command and the tool modules.
+"""
+
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import misc_tools
+from misc_tools.cli import COMMANDS, STARTUP_BUDGETS, check_startup
+
+
+# Directory holding the misc_tools package.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_startup_within_budget():
+    over = [
+        f'{module}: {milliseconds:.1f}ms > {budget}ms'
+        for module, milliseconds, budget in check_startup()
+        if milliseconds > budget
+    ]
+    assert not over
+
+
+# Imports kept out of every module's top level; optional dependencies,
+# and standard modules that are slow to import.
+DEFERRED_IMPORTS = {'eyed3', 'numpy', 'sqlite3', 'concurrent.futures'}
+# Imports a module needs at load time, as its core depends on them.
+REQUIRED_IMPORTS = {
+    'misc_tools.mp3Index': {'sqlite3'},
+}
+
+
+@pytest.mark.parametrize('module', ['misc_tools'] + [
+    f'misc_tools.{name}' for name in misc_tools.__all__
+])
+def test_no_optional_dependencies_imported(module):
+    # Runs in a fresh interpreter, as this one has already imported
+    # whatever the other tests needed.
+    deferred = DEFERRED_IMPORTS - REQUIRED_IMPORTS.get(module, set())
+    code = (
+        f'import sys, {module}\n'
+        f'print(sorted({sorted(deferred)!r} & sys.modules.keys()))'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT,
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert output.strip() == '[]'
+
+
+def test_budgets_cover_every_command():
+    for module, _ in COMMANDS.values():
+        assert f'misc_tools.{module}' in STARTUP_BUDGETS